@@ -1,5 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
+import hashlib
 import sys
 import time
 import streamlit as st
@@ -7,21 +8,21 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 from datetime import datetime
-import json
 
 PROJ_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJ_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJ_ROOT))
 
 try:
-    from src.parsing.ml.skill_matcher_db import analyze_resume
+    from src.parsing import configure_logging
+    from src.parsing.ml.skill_matcher_db import load_role_catalog, parse_resume_for_scoring, score_resume, warm_role_catalog
     from src.database import AuthService, ResumeRepository, SkillRepository, init_supabase
 except ImportError as e:
     st.error(f"Import error: {e}")
     st.stop()
 
-UPLOADS_DIR = PROJ_ROOT / "app" / "uploads"
-UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+# Levels per module from RESUME_LOG_LEVELS (no-op on Streamlit reruns)
+configure_logging()
 
 st.set_page_config(
     page_title="AI Resume Analyzer Pro",
@@ -369,10 +370,12 @@ def init_session_state():
         st.session_state.page = 'auth'
     if 'auth_service' not in st.session_state:
         try:
-            init_supabase()
-            st.session_state.auth_service = AuthService()
-            st.session_state.resume_repo = ResumeRepository()
-            st.session_state.skill_repo = SkillRepository()
+            # One client per session: signing in sets its Authorization header
+            client = init_supabase()
+            st.session_state.auth_service = AuthService(client)
+            st.session_state.resume_repo = ResumeRepository(client)
+            st.session_state.skill_repo = SkillRepository(client)
+            warm_role_catalog()
         except Exception as e:
             st.error(f"Database connection error: {e}")
             st.stop()
@@ -480,7 +483,8 @@ def show_dashboard():
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Statistics Cards
-    stats = st.session_state.resume_repo.get_resume_statistics(st.session_state.user.id)
+    # One RPC serves both the cards and the Analytics tab
+    stats = st.session_state.resume_repo.get_dashboard(st.session_state.user.id)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -528,7 +532,7 @@ def show_dashboard():
         show_my_resumes()
     
     with tab3:
-        show_analytics()
+        show_analytics(stats)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -544,32 +548,55 @@ def show_upload_section():
     )
     
     if uploaded:
-        ts = time.strftime("%Y%m%d-%H%M%S")
-        safe_name = uploaded.name.replace(" ", "_")
-        saved_path = UPLOADS_DIR / f"{ts}__{safe_name}"
+        # Parsed straight from memory: no copy of the upload is written to disk
+        file_bytes = uploaded.getvalue()
         
-        with saved_path.open("wb") as f:
-            f.write(uploaded.getbuffer())
+        # Parsed once per upload; reruns (e.g. picking another role) only re-score
+        upload_key = hashlib.sha256(file_bytes).hexdigest()
+        # Process-wide snapshot: no database round-trip on this path
+        catalog = load_role_catalog()
+        roles_map = catalog.roles
         
-        st.markdown('<div class="success-box">Resume uploaded successfully! Analyzing now...</div>', unsafe_allow_html=True)
-        
-        with st.spinner("Analyzing your resume with AI..."):
-            progress = st.progress(0)
-            for i in range(100):
-                time.sleep(0.01)
-                progress.progress(i + 1)
+        cached = st.session_state.get('parsed_upload')
+        if cached is None or cached['key'] != upload_key:
+            st.markdown('<div class="success-box">Resume uploaded successfully! Analyzing now...</div>', unsafe_allow_html=True)
             
-            roles_map = st.session_state.skill_repo.get_all_job_roles()
-            result = analyze_resume(str(saved_path))
+            with st.spinner("Analyzing your resume with AI..."):
+                progress = st.progress(0)
+                for i in range(100):
+                    time.sleep(0.01)
+                    progress.progress(i + 1)
             
-            resume_record = st.session_state.resume_repo.save_resume(
-                user_id=st.session_state.user.id,
-                filename=uploaded.name,
-                file_type=uploaded.type.split('/')[-1],
-                raw_text="",
-                parsed_data=result["parsed"],
-                file_size=uploaded.size
-            )
+                parsed = parse_resume_for_scoring(file_bytes)
+                best = score_resume(parsed, catalog)
+                
+                # The resume and its best-match analysis in one queued call
+                saved = st.session_state.resume_repo.save_resume_with_analysis(
+                    user_id=st.session_state.user.id,
+                    filename=uploaded.name,
+                    file_type=uploaded.type.split('/')[-1],
+                    raw_text="",
+                    parsed_data=parsed.as_dict(),
+                    file_size=uploaded.size,
+                    analyses=[{
+                        'target_role': best['chosen_role'],
+                        'matched_skills': best['gap'].get('matched', []),
+                        'missing_skills': best['gap'].get('missing', []),
+                        'match_score': best['match_score']
+                    }],
+                    background=True
+                )
+                st.session_state.pop('resume_listing', None)
+            cached = {
+                'key': upload_key,
+                'parsed': parsed,
+                'resume_id': saved['resume_id'] if saved else None,
+                'saved_roles': {best['chosen_role']} if saved else set()
+            }
+            st.session_state.parsed_upload = cached
+        
+        resume_id = cached['resume_id']
+        result = score_resume(cached['parsed'], catalog)
         
         st.markdown('<div class="spacing-lg"></div>', unsafe_allow_html=True)
         
@@ -631,8 +658,7 @@ def show_upload_section():
             )
             
             if chosen != result["chosen_role"]:
-                with st.spinner("Recalculating..."):
-                    result = analyze_resume(str(saved_path), chosen_role=chosen)
+                result = score_resume(cached['parsed'], catalog, chosen)
             
             matched = result["gap"].get("matched", [])
             missing = result["gap"].get("missing", [])
@@ -641,15 +667,18 @@ def show_upload_section():
             st.markdown(f'<div class="spacing-md"></div><div style="font-size: 1.1rem; font-weight: 600; color: #111827;">Match Score: {match_score:.1f}%</div>', unsafe_allow_html=True)
             st.progress(match_score / 100)
             
-            if resume_record:
+            # Once per upload and role: widget reruns must not insert duplicates
+            if resume_id and chosen not in cached['saved_roles']:
                 st.session_state.resume_repo.save_skill_gap_analysis(
                     user_id=st.session_state.user.id,
-                    resume_id=resume_record['id'],
+                    resume_id=resume_id,
                     target_role=chosen,
                     matched_skills=matched,
                     missing_skills=missing,
-                    match_score=match_score
+                    match_score=match_score,
+                    background=True
                 )
+                cached['saved_roles'].add(chosen)
         
         st.markdown('<div class="spacing-lg"></div>', unsafe_allow_html=True)
         st.markdown("---")
@@ -674,14 +703,23 @@ def show_upload_section():
             else:
                 st.markdown('<div class="success-box">Perfect match! No skills missing!</div>', unsafe_allow_html=True)
         
-        if saved_path.exists():
-            saved_path.unlink()
+
+RESUMES_PAGE_SIZE = 10
 
 def show_my_resumes():
     """Show user's uploaded resumes"""
     st.markdown('<div class="section-header">Your Resume History</div>', unsafe_allow_html=True)
     
-    resumes = st.session_state.resume_repo.get_user_resumes(st.session_state.user.id)
+    user_id = st.session_state.user.id
+    listing = st.session_state.get('resume_listing')
+    if listing is None or listing['user_id'] != user_id:
+        # First page only; later pages are fetched on "Load more". Wait for
+        # queued uploads so a just-uploaded resume is listed.
+        st.session_state.resume_repo.flush_writes(timeout=5)
+        page = st.session_state.resume_repo.get_user_resumes_page(user_id, limit=RESUMES_PAGE_SIZE)
+        listing = {'user_id': user_id, 'items': page.items, 'cursor': page.next_cursor}
+        st.session_state.resume_listing = listing
+    resumes = listing['items']
     
     if not resumes:
         st.markdown('<div class="info-box">No resumes yet. Upload your first resume in the "Upload & Analyze" tab!</div>', unsafe_allow_html=True)
@@ -695,13 +733,13 @@ def show_my_resumes():
                 st.metric("File Size", f"{resume['file_size'] / 1024:.1f} KB")
             
             with col2:
-                skills_count = len(json.loads(resume['parsed_skills'])) if isinstance(resume['parsed_skills'], str) else len(resume['parsed_skills'])
+                skills_count = len(resume['parsed_skills'] or [])
                 st.metric("Skills", skills_count)
             
             with col3:
                 st.metric("Type", resume['file_type'].upper())
             
-            skills = json.loads(resume['parsed_skills']) if isinstance(resume['parsed_skills'], str) else resume['parsed_skills']
+            skills = resume['parsed_skills'] or []
             if skills:
                 st.markdown('<div class="spacing-sm"></div>', unsafe_allow_html=True)
                 st.markdown("**Skills:**")
@@ -711,31 +749,41 @@ def show_my_resumes():
             st.markdown('<div class="spacing-sm"></div>', unsafe_allow_html=True)
             if st.button(f"Delete Resume", key=f"del_{resume['id']}", use_container_width=True):
                 st.session_state.resume_repo.delete_resume(resume['id'], st.session_state.user.id)
+                st.session_state.pop('resume_listing', None)
                 st.success("Resume deleted!")
                 st.rerun()
+    
+    if listing['cursor'] is not None:
+        if st.button("Load more", key="resumes_load_more", use_container_width=True):
+            page = st.session_state.resume_repo.get_user_resumes_page(
+                user_id, limit=RESUMES_PAGE_SIZE, after=listing['cursor']
+            )
+            listing['items'] = listing['items'] + page.items
+            listing['cursor'] = page.next_cursor
+            st.rerun()
 
-def show_analytics():
+def show_analytics(dashboard):
     """Show analytics and visualizations"""
     st.markdown('<div class="section-header">Analytics Dashboard</div>', unsafe_allow_html=True)
     
-    analyses = st.session_state.resume_repo.get_user_analyses(st.session_state.user.id, limit=50)
-    
-    if not analyses:
+    if not dashboard['total_analyses']:
         st.markdown('<div class="info-box">No analyses yet. Complete your first resume analysis to see insights!</div>', unsafe_allow_html=True)
         return
     
-    df = pd.DataFrame(analyses)
-    df['analysis_date'] = pd.to_datetime(df['analysis_date'])
+    # Pre-aggregated by the database: one row per day / per role
+    series = pd.DataFrame(dashboard['score_series'], columns=['bucket', 'analyses', 'average_match_score'])
+    series['bucket'] = pd.to_datetime(series['bucket'])
+    roles = pd.DataFrame(dashboard['role_frequencies'], columns=['target_role', 'analyses', 'average_match_score'])
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("**Match Score Progress**")
         fig = px.line(
-            df,
-            x='analysis_date',
-            y='match_score',
-            labels={'match_score': 'Match Score (%)', 'analysis_date': 'Date'}
+            series,
+            x='bucket',
+            y='average_match_score',
+            labels={'average_match_score': 'Avg Match Score (%)', 'bucket': 'Date'}
         )
         fig.update_traces(line_color='#667eea', line_width=3)
         fig.update_layout(
@@ -748,10 +796,9 @@ def show_analytics():
     
     with col2:
         st.markdown("**Roles Analyzed**")
-        role_counts = df['target_role'].value_counts()
         fig = px.pie(
-            values=role_counts.values,
-            names=role_counts.index,
+            values=roles['analyses'],
+            names=roles['target_role'],
         )
         fig.update_traces(marker=dict(colors=['#667eea', '#764ba2', '#9f7aea', '#d6bcfa']))
         fig.update_layout(
@@ -763,8 +810,8 @@ def show_analytics():
     
     st.markdown('<div class="spacing-md"></div>', unsafe_allow_html=True)
     st.markdown("**Top Performing Analyses**")
-    top_analyses = df.nlargest(5, 'match_score')[['target_role', 'match_score', 'analysis_date']]
-    top_analyses['analysis_date'] = top_analyses['analysis_date'].dt.strftime('%Y-%m-%d')
+    top_analyses = pd.DataFrame(dashboard['top_analyses'], columns=['target_role', 'match_score', 'analysis_date'])
+    top_analyses['analysis_date'] = top_analyses['analysis_date'].str[:10]
     top_analyses.columns = ['Role', 'Match Score (%)', 'Date']
     st.dataframe(top_analyses, use_container_width=True, hide_index=True)
 
@@ -814,6 +861,12 @@ def main():
     """Main application logic"""
     init_session_state()
 
+    # Verified locally; the session ends only when its token can no longer be refreshed
+    if st.session_state.authenticated and st.session_state.auth_service.get_current_user() is None:
+        st.session_state.authenticated = False
+        st.session_state.user = None
+        st.session_state.page = 'auth'
+
     if not st.session_state.authenticated:
         show_auth_page()
     else:
@@ -0,0 +1,70 @@
+# benchmarks/bench_keyword_scanner.py
+"""
+Whole-text skill scanning: the old one-regex-per-keyword loop vs the
+Aho-Corasick KeywordScanner, for the built-in list and a ~20k-entry taxonomy.
+
+    python benchmarks/bench_keyword_scanner.py [--repeat 5]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.enhanced_parser import TECHNICAL_SKILLS
+from src.parsing.keyword_scanner import KeywordScanner
+
+def legacy(text: str, keywords) -> set:
+    skills_found = set()
+    text_lower = text.lower()
+    for skill in keywords:
+        if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
+            skills_found.add(skill)
+    return skills_found
+
+def make_taxonomy(size: int) -> list:
+    """Distinct one- to three-word skill names built from a fixed vocabulary"""
+    rng = random.Random(7)
+    words = [f"{a}{b}" for a in ("data", "cloud", "web", "ml", "sec", "net", "dev", "ops", "ui", "db")
+             for b in ("flow", "kit", "base", "hub", "lab", "grid", "core", "works", "stack", "forge")]
+    taxonomy = set(TECHNICAL_SKILLS)
+    while len(taxonomy) < size:
+        taxonomy.add(" ".join(rng.sample(words, rng.randint(1, 3))))
+    return sorted(taxonomy)
+
+def make_cv(paragraphs: int) -> str:
+    rng = random.Random(11)
+    vocabulary = ("built", "pipelines", "with", "python", "sql", "and", "tableau", "for", "the", "team",
+                  "machine", "learning", "models", "on", "aws", "using", "docker", "kubernetes", "c++", "go")
+    return "\n".join(" ".join(rng.choice(vocabulary) for _ in range(60)) for _ in range(paragraphs))
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'keywords':>9} {'chars':>7} {'build ms':>9} {'legacy ms':>10} {'scanner ms':>11} {'speedup':>8}")
+    for keywords in (TECHNICAL_SKILLS, make_taxonomy(20_000)):
+        start = time.perf_counter()
+        scanner = KeywordScanner(keywords)
+        build = (time.perf_counter() - start) * 1000
+        for paragraphs in (10, 100):
+            text = make_cv(paragraphs)
+            old = best_of(lambda: legacy(text, keywords), args.repeat)
+            new = best_of(lambda: scanner.skills(text), args.repeat)
+            print(f"{len(keywords):>9} {len(text):>7} {build:>9.1f} {old:>10.2f} {new:>11.2f} {old / new:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
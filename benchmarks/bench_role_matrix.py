@@ -0,0 +1,61 @@
+# benchmarks/bench_role_matrix.py
+"""
+All-roles scoring: the per-role compute_skill_gap loop vs RoleMatrix.
+
+    python benchmarks/bench_role_matrix.py [--repeat 5]
+
+Catalogs are synthetic, O*NET-sized: roles of 8-20 skills drawn from a
+shared vocabulary. Build time (once per catalog load) is reported apart
+from the per-resume scoring time.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.ml.skill_matcher_db import SKILL_SYNONYMS, ParsedResume, RoleCatalog, compute_skill_gap, score_resume
+
+def make_catalog(n_roles: int, vocabulary_size: int = 3000, seed: int = 0):
+    rng = random.Random(seed)
+    vocabulary = [f"skill {i}" for i in range(vocabulary_size)] + list(SKILL_SYNONYMS)
+    roles = {f"Role {i}": rng.sample(vocabulary, rng.randint(8, 20)) for i in range(n_roles)}
+    return roles, rng.sample(vocabulary, 30)
+
+def legacy(skills, roles_map):
+    predictions = []
+    for role, required_skills in roles_map.items():
+        gap = compute_skill_gap(skills, required_skills, SKILL_SYNONYMS)
+        predictions.append((role, (len(gap["matched"]) / len(required_skills)) * 100 if required_skills else 0))
+    predictions.sort(key=lambda x: x[1], reverse=True)
+    return predictions[:3]
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'roles':>7} {'loop ms':>9} {'build ms':>9} {'matrix ms':>10} {'speedup':>8}")
+    for n_roles in (20, 1000, 10000):
+        roles, skills = make_catalog(n_roles)
+        parsed = ParsedResume(skills=tuple(skills))
+        old = best_of(lambda: legacy(skills, roles), args.repeat)
+        build = best_of(lambda: RoleCatalog(roles, SKILL_SYNONYMS).matrix, 1)
+        catalog = RoleCatalog(roles, SKILL_SYNONYMS)
+        catalog.matrix
+        new = best_of(lambda: score_resume(parsed, catalog), args.repeat)
+        print(f"{n_roles:>7} {old:>9.2f} {build:>9.2f} {new:>10.3f} {old / new:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_section_segmenter.py
+"""
+Section segmentation on long CVs: the old per-section regex scans vs the
+single-pass segmenter.
+
+    python benchmarks/bench_section_segmenter.py [--repeat 20]
+
+The old patterns are reproduced with their inline (?i) flags hoisted to
+re.IGNORECASE, since Python 3.11 rejects them mid-pattern.
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.section_segmenter import segment_sections
+
+LEGACY_PATTERNS = {
+    "skills": [
+        r"(?:skills?/core\s+competencies|skills?|technical\s+skills?|technologies|expertise|competencies|core\s+competencies|proficiencies)[:\-\s]*(.*?)(?=education|experience|work|projects|certifications|career|$)",
+        r"skills?/core\s+competencies\s*(.*?)(?=education|experience|work|projects|certifications|career|$)",
+    ],
+    "education": [
+        r"(?:education|academic\s+background|qualifications|academics|degrees?)[:\-\s]*(.*?)(?=experience|skills|work|projects|certifications|career|$)",
+        r"education\s*(.*?)(?=experience|skills|work|projects|certifications|career|$)",
+    ],
+    "experience": [
+        r"(?:experience|work\s+history|employment|professional|career\s+history|work\s+experience|career\s+history)[:\-\s]*(.*?)(?=education|skills|projects|certifications|teaching|trainings|$)",
+        r"career\s+history\s*(.*?)(?=education|skills|projects|certifications|teaching|trainings|$)",
+    ],
+    "certifications": [
+        r"(?:certifications?|certificates?|qualifications|licenses?)[:\-\s]*(.*?)(?=education|experience|skills|basic\s+information|$)",
+        r"certifications\s*(.*?)(?=education|experience|skills|basic\s+information|$)",
+    ],
+}
+
+FALLBACK_PATTERNS = {
+    "skills": [r"Technical Skills?\s*(.*?)(?=Education|Experience|Work|$)", r"Skills?\s*(.*?)(?=Education|Experience|Work|$)"],
+    "education": [r"Education\s*(.*?)(?=Skills|Experience|Work|$)", r"Qualifications?\s*(.*?)(?=Skills|Experience|Work|$)"],
+    "experience": [r"Work Experience\s*(.*?)(?=Education|Skills|$)", r"Employment\s*(.*?)(?=Education|Skills|$)"],
+}
+
+FILLER = "Delivered analytics for clients across retail and finance using Python and SQL.\n"
+
+def make_cv(jobs: int) -> str:
+    """A long CV: headers first, a very long history, certifications last"""
+    parts = ["Jane Doe\nSummary\nData analyst.\nSkills\nPython, SQL, Tableau, Excel\n",
+             "Work Experience\n"]
+    for i in range(jobs):
+        parts.append(f"Analyst {i} at Company {i} (2010-2012)\n" + FILLER * 5)
+    parts.append("Education\nBSc Statistics\nCertifications\nAWS Certified\n")
+    return "".join(parts)
+
+def legacy(text: str) -> dict:
+    found = {}
+    for section, patterns in LEGACY_PATTERNS.items():
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+            if match:
+                found[section] = match.group(1)
+                break
+    for section, patterns in FALLBACK_PATTERNS.items():
+        if section not in found:
+            for pattern in patterns:
+                match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+                if match:
+                    found[section] = match.group(1)
+                    break
+    return found
+
+def best_of(func, text: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'chars':>9} {'legacy ms':>10} {'segmenter ms':>13} {'speedup':>8}")
+    for jobs in (10, 100, 1000):
+        text = make_cv(jobs)
+        old = best_of(legacy, text, args.repeat)
+        new = best_of(segment_sections, text, args.repeat)
+        print(f"{len(text):>9} {old:>10.2f} {new:>13.2f} {old / new:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
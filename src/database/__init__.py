@@ -1,4 +1,6 @@
-from .supabase_client import get_supabase_client, init_supabase
+from .supabase_client import get_supabase_client, get_http_pool_stats, init_supabase
+from .query_cache import QueryCache, catalog_cache
+from .write_queue import WriteBehindQueue, write_queue
 from .resume_repository import ResumeRepository
 from .skill_repository import SkillRepository
 from .auth_service import AuthService
@@ -6,6 +8,11 @@ from .auth_service import AuthService
 __all__ = [
     'get_supabase_client',
     'init_supabase',
+    'get_http_pool_stats',
+    'QueryCache',
+    'catalog_cache',
+    'WriteBehindQueue',
+    'write_queue',
     'ResumeRepository',
     'SkillRepository',
     'AuthService'
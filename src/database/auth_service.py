@@ -1,14 +1,45 @@
-from typing import Optional, Dict, Any
-from supabase import Client
-from .supabase_client import get_supabase_client
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Optional, Dict, Any, TYPE_CHECKING
+from .supabase_client import init_supabase
+
+if TYPE_CHECKING:
+    from supabase import Client
+    from .token_verifier import TokenVerifier
+
+# Refresh the access token once it is this close to expiring
+REFRESH_MARGIN_SECONDS = float(os.getenv("AUTH_REFRESH_MARGIN_SECONDS", "60"))
+# Wait before retrying a failed early refresh (an expired token retries at once)
+REFRESH_RETRY_SECONDS = 15.0
 
 class AuthService:
     """
-    Handles user authentication and profile management
+    Handles user authentication and profile management.
+
+    After sign-in the session is kept here: get_current_user() checks the
+    access token locally (see token_verifier) instead of calling the auth
+    server, and refreshes it when it is about to expire. Refreshing only
+    on use means an abandoned session stops renewing its token.
     """
 
-    def __init__(self, client: Optional[Client] = None):
-        self.client = client or get_supabase_client()
+    def __init__(self, client: Optional[Client] = None, verifier: Optional[TokenVerifier] = None):
+        # Its own client: signing in sets that client's Authorization header
+        self.client = client or init_supabase()
+        self._verifier = verifier
+        self._user = None
+        self._session = None
+        self._server_checked: Optional[tuple] = None  # (access token, exp) confirmed by the auth server
+        self._retry_refresh_at = 0.0
+        self._lock = threading.Lock()  # one refresh at a time: refresh tokens are single-use
+
+    @property
+    def verifier(self) -> TokenVerifier:
+        if self._verifier is None:
+            from .token_verifier import get_token_verifier
+            self._verifier = get_token_verifier()
+        return self._verifier
 
     def sign_up(self, email: str, password: str, full_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -60,6 +91,7 @@ class AuthService:
                 self.client.table("users").update({
                     "last_login": "now()"
                 }).eq("id", response.user.id).execute()
+                self._remember(response.session, response.user)
 
                 return {
                     "success": True,
@@ -84,6 +116,7 @@ class AuthService:
         Sign out current user
         """
         try:
+            self._remember(None, None)
             self.client.auth.sign_out()
             return {
                 "success": True,
@@ -95,10 +128,76 @@ class AuthService:
                 "message": f"Error: {str(e)}"
             }
 
+    def _remember(self, session: Optional[Any], user: Optional[Any]) -> None:
+        with self._lock:
+            self._session, self._user = session, user
+            self._retry_refresh_at = 0.0
+
+    def _refresh_due(self, session: Any) -> bool:
+        return (bool(session.refresh_token) and time.time() >= self._retry_refresh_at
+                and (session.expires_at or 0) - time.time() <= REFRESH_MARGIN_SECONDS)
+
+    def _refresh(self, session: Any) -> bool:
+        """Exchange `session`'s refresh token for a new session; False if that failed"""
+        with self._lock:
+            if self._session is not session:
+                # Refreshed by a concurrent call, or signed out, while waiting
+                return self._session is not None
+            try:
+                response = self.client.auth.refresh_session(session.refresh_token)
+            except Exception as e:
+                print(f"Error refreshing session: {e}")
+                self._retry_refresh_at = time.time() + REFRESH_RETRY_SECONDS
+                return False
+            if not response.session:
+                return False
+            self._session, self._user = response.session, response.user or self._user
+            self._retry_refresh_at = 0.0
+            return True
+
     def get_current_user(self) -> Optional[Dict[str, Any]]:
         """
-        Get currently authenticated user
+        Get currently authenticated user. With a session from sign_in() the
+        token is verified locally; no auth-server call in steady state.
         """
+        session = self._session
+        if session is None:
+            return self._fetch_user()
+        if self._refresh_due(session) and self._refresh(session):
+            session = self._session
+        # A failed early refresh keeps the still-valid token; retried after REFRESH_RETRY_SECONDS
+
+        import jwt  # PyJWT takes ~0.1 s to import; only signed-in renders need it
+
+        try:
+            self.verifier.verify(session.access_token)
+            return self._user
+        except jwt.ExpiredSignatureError:
+            # Idle past expiry (or the early refresh failed): one attempt now
+            return self._user if self._refresh(session) else None
+        except (jwt.InvalidKeyError, jwt.InvalidAlgorithmError, jwt.PyJWKClientError):
+            # No key to verify with locally: ask the auth server once per token
+            return self._server_checked_user(session)
+        except jwt.InvalidTokenError:
+            return None
+
+    def _server_checked_user(self, session: Any) -> Optional[Any]:
+        import jwt
+
+        checked = self._server_checked
+        if checked is not None and checked[0] == session.access_token:
+            if checked[1] > time.time():
+                return self._user
+            return self._user if self._refresh(session) else None
+
+        user = self._fetch_user()
+        if user is None:
+            return None
+        claims = jwt.decode(session.access_token, options={"verify_signature": False})
+        self._server_checked = (session.access_token, claims.get("exp", 0))
+        return self._user or user
+
+    def _fetch_user(self) -> Optional[Any]:
         try:
             user = self.client.auth.get_user()
             if user:
@@ -111,6 +210,8 @@ class AuthService:
         """
         Get current session
         """
+        if self._session is not None:
+            return self._session
         try:
             session = self.client.auth.get_session()
             return session
@@ -0,0 +1,107 @@
+"""
+Pooled HTTP client shared by every Supabase sub-client in the process.
+
+PostgREST and auth requests from all Streamlit sessions go through one
+httpx.Client: a bounded connection pool with HTTP/2 and keep-alive, so
+requests reuse warm TLS connections instead of opening new ones, and a
+burst of sessions queues for a connection instead of exhausting sockets.
+Pool size and timeouts come from the environment; pool_stats() reports
+utilization.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("SUPABASE_HTTP_MAX_CONNECTIONS", "20"))
+DEFAULT_MAX_KEEPALIVE = int(os.getenv("SUPABASE_HTTP_MAX_KEEPALIVE", "10"))
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("SUPABASE_HTTP_KEEPALIVE_SECONDS", "60"))
+DEFAULT_CONNECT_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_HTTP_CONNECT_TIMEOUT", "5"))
+DEFAULT_READ_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_HTTP_READ_TIMEOUT", "30"))
+# Longest a request waits for a free connection when the pool is full
+DEFAULT_POOL_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_HTTP_POOL_TIMEOUT", "10"))
+
+class MeteredTransport(httpx.HTTPTransport):
+    """HTTPTransport that counts requests in flight, errors and latency"""
+
+    def __init__(self, limits: httpx.Limits, **kwargs: Any):
+        super().__init__(limits=limits, **kwargs)
+        self.limits = limits
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0,
+                       "latency_ms_total": 0.0, "latency_ms_max": 0.0}
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["in_flight"] += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+        start = time.perf_counter()
+        try:
+            return super().handle_request(request)
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._stats["in_flight"] -= 1
+                self._stats["latency_ms_total"] += elapsed_ms
+                self._stats["latency_ms_max"] = max(self._stats["latency_ms_max"], elapsed_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        # Connection states come from httpcore's pool
+        connections = list(getattr(self._pool, "connections", ()))
+        active = sum(1 for connection in connections if not connection.is_idle())
+        max_connections = self.limits.max_connections
+        stats.update({
+            "max_connections": max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "connections": len(connections),
+            "active_connections": active,
+            "idle_connections": len(connections) - active,
+            "utilization": active / max_connections if max_connections else 0.0,
+        })
+        stats["latency_ms_avg"] = stats["latency_ms_total"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+def create_http_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+    read_timeout: float = DEFAULT_READ_TIMEOUT_SECONDS,
+    pool_timeout: float = DEFAULT_POOL_TIMEOUT_SECONDS,
+) -> httpx.Client:
+    """httpx.Client with a bounded HTTP/2 keep-alive pool and metered transport"""
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive,
+                          keepalive_expiry=keepalive_expiry)
+    timeout = httpx.Timeout(connect=connect_timeout, read=read_timeout, write=read_timeout, pool=pool_timeout)
+    # Same redirect behaviour as the clients supabase-py builds itself
+    return httpx.Client(transport=MeteredTransport(limits, http2=True), timeout=timeout,
+                        follow_redirects=True, http2=True)
+
+_http_client: Optional[httpx.Client] = None
+_lock = threading.Lock()
+
+def get_http_client() -> httpx.Client:
+    """The process-wide pooled client (created on first use, thread-safe)"""
+    global _http_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                _http_client = create_http_client()
+    return _http_client
+
+def pool_stats() -> Dict[str, Any]:
+    """Utilization of the shared pool; empty before the first Supabase client exists"""
+    client = _http_client
+    if client is None:
+        return {}
+    return client._transport.stats()
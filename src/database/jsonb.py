@@ -0,0 +1,20 @@
+"""
+jsonb columns come back from PostgREST already decoded, and lists are
+written as native JSON arrays. Rows stored by older versions hold the list
+JSON-encoded inside a jsonb string; decode_jsonb() decodes only those.
+"""
+import json
+from typing import Any, Dict, List
+
+def decode_jsonb(row: Dict[str, Any], *columns: str) -> Dict[str, Any]:
+    """Decode legacy string values of `columns` in place; native values are left alone"""
+    for column in columns:
+        value = row.get(column)
+        if isinstance(value, str):
+            row[column] = json.loads(value)
+    return row
+
+def decode_jsonb_rows(rows: List[Dict[str, Any]], *columns: str) -> List[Dict[str, Any]]:
+    for row in rows:
+        decode_jsonb(row, *columns)
+    return rows
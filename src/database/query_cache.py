@@ -0,0 +1,111 @@
+"""
+Process-wide read-through cache for catalog queries.
+
+Entries live for a TTL. Concurrent misses on the same key are coalesced
+(single flight): one caller runs the query, the others wait for its
+result instead of sending their own. Failed loads are never cached, and
+with cache_empty=False neither are empty results: under RLS an empty
+catalog usually means the caller could not see the rows, and caching it
+would hand that empty result to every later caller until the TTL ends.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sized
+
+# job_roles / skills_database change about weekly; an hour keeps them fresh enough
+DEFAULT_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "3600"))
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, Sized) and len(value) == 0)
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+class QueryCache:
+    """
+    cache.get_or_load("job_roles:all", fetch_roles) -> cached value, or the
+    result of one shared fetch_roles() call. Values are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, cache_empty: bool = True):
+        self.ttl = ttl
+        self.cache_empty = cache_empty
+        self._entries: Dict[str, tuple] = {}  # key -> (value, expires_at)
+        self._inflight: Dict[str, _Flight] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0,
+                       "refreshes": 0, "refresh_ms_total": 0.0, "refresh_ms_max": 0.0, "refresh_ms_last": 0.0}
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._stats["hits"] += 1
+                return entry[0]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                generation = self._generation
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        start = time.perf_counter()
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                # An invalidate() during the load means the result may already be stale
+                if (flight.error is None and generation == self._generation
+                        and (self.cache_empty or not _is_empty(flight.value))):
+                    self._entries[key] = (flight.value, time.monotonic() + (self.ttl if ttl is None else ttl))
+                if flight.error is None:
+                    self._stats["refreshes"] += 1
+                    self._stats["refresh_ms_total"] += elapsed_ms
+                    self._stats["refresh_ms_last"] = elapsed_ms
+                    self._stats["refresh_ms_max"] = max(self._stats["refresh_ms_max"], elapsed_ms)
+                del self._inflight[key]
+            flight.done.set()
+        return flight.value
+
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop every entry whose key starts with `prefix` (all entries by default)"""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus derived hit ratio and mean refresh latency"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_ratio"] = (stats["hits"] + stats["coalesced"]) / lookups if lookups else 0.0
+        stats["refresh_ms_avg"] = stats["refresh_ms_total"] / stats["refreshes"] if stats["refreshes"] else 0.0
+        return stats
+
+# Shared by every SkillRepository in the process; the catalogs are never legitimately empty
+catalog_cache = QueryCache(cache_empty=False)
@@ -1,16 +1,74 @@
-from typing import Optional, Dict, Any, List
-from datetime import datetime
-from supabase import Client
+from __future__ import annotations
+from typing import Optional, Dict, Any, List, NamedTuple, TYPE_CHECKING
+from datetime import datetime, timezone
 from .supabase_client import get_supabase_client
-import json
+from .write_queue import WriteBehindQueue, write_queue
+from .jsonb import decode_jsonb
+import uuid
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Columns the list views render; raw_text and the bulky jsonb columns are
+# only read when a single resume is opened
+RESUME_LIST_COLUMNS = "id, filename, file_type, file_size, upload_date, parsed_skills"
+RESUME_DETAIL_COLUMNS = (
+    "id, user_id, filename, file_type, file_size, upload_date, "
+    "parsed_skills, parsed_education, parsed_experience"
+)
+ANALYSIS_LIST_COLUMNS = "id, resume_id, target_role, match_score, analysis_date"
+
+DEFAULT_PAGE_SIZE = 20
+
+# Days of daily match score averages in the dashboard trend
+DASHBOARD_DAYS = 180
+
+STATISTICS_KEYS = ("total_resumes", "total_analyses", "average_match_score", "unique_skills", "most_recent_upload")
+EMPTY_DASHBOARD: Dict[str, Any] = {
+    "total_resumes": 0,
+    "total_analyses": 0,
+    "average_match_score": 0,
+    "unique_skills": 0,
+    "most_recent_upload": None,
+    "score_series": [],
+    "role_frequencies": [],
+    "top_analyses": [],
+}
+
+class PageCursor(NamedTuple):
+    """Position after the last row of a page: (sort timestamp, id) of that row"""
+    timestamp: str
+    id: str
+
+class Page(NamedTuple):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[PageCursor]  # None on the last page
+
+def _quote(value: str) -> str:
+    # PostgREST filter values containing '.', ':' or ',' must be double-quoted
+    return '"' + value.replace('"', '\\"') + '"'
 
 class ResumeRepository:
     """
     Handles all database operations for resumes
     """
 
-    def __init__(self, client: Optional[Client] = None):
+    def __init__(self, client: Optional[Client] = None, writer: Optional[WriteBehindQueue] = None):
         self.client = client or get_supabase_client()
+        self.writer = writer or write_queue
+
+    def _write_behind(self, table: str, row: Dict[str, Any], timestamp_column: str) -> Dict[str, Any]:
+        """
+        Queue `row` for a background insert and return it as it will be
+        stored: id and timestamp are set here so callers can use them at once
+        """
+        row = {"id": str(uuid.uuid4()), timestamp_column: datetime.now(timezone.utc).isoformat(), **row}
+        self.writer.submit(self.client, table, row)
+        return row
+
+    def flush_writes(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued background inserts (read-your-writes before a list query)"""
+        return self.writer.flush(timeout)
 
     def save_resume(
         self,
@@ -19,10 +77,12 @@ class ResumeRepository:
         file_type: str,
         raw_text: str,
         parsed_data: Dict[str, Any],
-        file_size: int
+        file_size: int,
+        background: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
-        Save a parsed resume to the database
+        Save a parsed resume to the database. With `background`, the insert
+        is queued and the row is returned without waiting for it.
         """
         try:
             resume_data = {
@@ -30,12 +90,15 @@ class ResumeRepository:
                 "filename": filename,
                 "file_type": file_type,
                 "raw_text": raw_text,
-                "parsed_skills": json.dumps(parsed_data.get("skills", [])),
-                "parsed_education": json.dumps(parsed_data.get("education", [])),
-                "parsed_experience": json.dumps(parsed_data.get("experience", [])),
+                "parsed_skills": list(parsed_data.get("skills", [])),
+                "parsed_education": list(parsed_data.get("education", [])),
+                "parsed_experience": list(parsed_data.get("experience", [])),
                 "file_size": file_size
             }
 
+            if background:
+                return self._write_behind("resumes", resume_data, "upload_date")
+
             response = self.client.table("resumes").insert(resume_data).execute()
 
             if response.data:
@@ -48,48 +111,83 @@ class ResumeRepository:
 
     def get_user_resumes(self, user_id: str) -> List[Dict[str, Any]]:
         """
-        Get all resumes for a specific user
+        Get all resumes for a specific user (list columns only, newest first)
         """
         try:
-            response = self.client.table("resumes").select("*").eq(
+            response = self.client.table("resumes").select(RESUME_LIST_COLUMNS).eq(
                 "user_id", user_id
-            ).order("upload_date", desc=True).execute()
+            ).order("upload_date", desc=True).order("id", desc=True).execute()
 
-            if response.data:
-                for resume in response.data:
-                    if isinstance(resume.get("parsed_skills"), str):
-                        resume["parsed_skills"] = json.loads(resume["parsed_skills"])
-                    if isinstance(resume.get("parsed_education"), str):
-                        resume["parsed_education"] = json.loads(resume["parsed_education"])
-                    if isinstance(resume.get("parsed_experience"), str):
-                        resume["parsed_experience"] = json.loads(resume["parsed_experience"])
-
-                return response.data
-            return []
+            return [decode_jsonb(resume, "parsed_skills") for resume in response.data or []]
 
         except Exception as e:
             print(f"Error fetching resumes: {e}")
             return []
 
-    def get_resume_by_id(self, resume_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    def get_user_resumes_page(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[PageCursor] = None
+    ) -> Page:
         """
-        Get a specific resume by ID
+        One page of a user's resumes, newest first, starting after `after`
         """
         try:
-            response = self.client.table("resumes").select("*").eq(
+            rows = self._keyset_page("resumes", RESUME_LIST_COLUMNS, "upload_date", user_id, limit, after)
+            return self._page([decode_jsonb(row, "parsed_skills") for row in rows], "upload_date", limit)
+
+        except Exception as e:
+            print(f"Error fetching resumes: {e}")
+            return Page([], None)
+
+    def _keyset_page(
+        self,
+        table: str,
+        columns: str,
+        sort_column: str,
+        user_id: str,
+        limit: int,
+        after: Optional[PageCursor]
+    ) -> List[Dict[str, Any]]:
+        """
+        Keyset pagination on (sort_column DESC, id DESC): served from the
+        (user_id, sort_column DESC, id DESC) index without OFFSET scans.
+        One extra row is fetched to know whether another page exists.
+        """
+        query = self.client.table(table).select(columns).eq("user_id", user_id)
+        if after is not None:
+            timestamp, row_id = _quote(after.timestamp), _quote(after.id)
+            query = query.or_(
+                f"{sort_column}.lt.{timestamp},and({sort_column}.eq.{timestamp},id.lt.{row_id})"
+            )
+        response = query.order(sort_column, desc=True).order("id", desc=True).limit(limit + 1).execute()
+        return response.data or []
+
+    @staticmethod
+    def _page(rows: List[Dict[str, Any]], sort_column: str, limit: int) -> Page:
+        if len(rows) <= limit:
+            return Page(rows, None)
+        items = rows[:limit]
+        return Page(items, PageCursor(items[-1][sort_column], items[-1]["id"]))
+
+    def get_resume_by_id(
+        self,
+        resume_id: str,
+        user_id: str,
+        include_raw_text: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific resume by ID (raw_text only when asked for)
+        """
+        try:
+            columns = RESUME_DETAIL_COLUMNS + (", raw_text" if include_raw_text else "")
+            response = self.client.table("resumes").select(columns).eq(
                 "id", resume_id
-            ).eq("user_id", user_id).maybeSingle().execute()
+            ).eq("user_id", user_id).maybe_single().execute()
 
-            if response.data:
-                resume = response.data
-                if isinstance(resume.get("parsed_skills"), str):
-                    resume["parsed_skills"] = json.loads(resume["parsed_skills"])
-                if isinstance(resume.get("parsed_education"), str):
-                    resume["parsed_education"] = json.loads(resume["parsed_education"])
-                if isinstance(resume.get("parsed_experience"), str):
-                    resume["parsed_experience"] = json.loads(resume["parsed_experience"])
-
-                return resume
+            if response and response.data:
+                return decode_jsonb(response.data, "parsed_skills", "parsed_education", "parsed_experience")
             return None
 
         except Exception as e:
@@ -118,21 +216,25 @@ class ResumeRepository:
         target_role: str,
         matched_skills: List[str],
         missing_skills: List[str],
-        match_score: float
+        match_score: float,
+        background: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
-        Save skill gap analysis results
+        Save skill gap analysis results (queued, like save_resume, with `background`)
         """
         try:
             analysis_data = {
                 "user_id": user_id,
                 "resume_id": resume_id,
                 "target_role": target_role,
-                "matched_skills": json.dumps(matched_skills),
-                "missing_skills": json.dumps(missing_skills),
+                "matched_skills": list(matched_skills),
+                "missing_skills": list(missing_skills),
                 "match_score": match_score
             }
 
+            if background:
+                return self._write_behind("skill_gaps", analysis_data, "analysis_date")
+
             response = self.client.table("skill_gaps").insert(analysis_data).execute()
 
             if response.data:
@@ -143,61 +245,128 @@ class ResumeRepository:
             print(f"Error saving skill gap analysis: {e}")
             return None
 
-    def get_user_analyses(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def save_resume_with_analysis(
+        self,
+        user_id: str,
+        filename: str,
+        file_type: str,
+        raw_text: str,
+        parsed_data: Dict[str, Any],
+        file_size: int,
+        analyses: List[Dict[str, Any]],
+        background: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Save a parsed resume and its skill gap analyses (dicts with
+        target_role, matched_skills, missing_skills, match_score) in one
+        round-trip and one transaction.
+
+        Returns {"resume_id": ..., "analysis_ids": [...]}. Ids are generated
+        here, so with `background` they are returned before the call runs.
+        """
+        try:
+            now = datetime.now(timezone.utc).isoformat()
+            resume_data = {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "filename": filename,
+                "file_type": file_type,
+                "raw_text": raw_text,
+                "parsed_skills": list(parsed_data.get("skills", [])),
+                "parsed_education": list(parsed_data.get("education", [])),
+                "parsed_experience": list(parsed_data.get("experience", [])),
+                "file_size": file_size,
+                "upload_date": now
+            }
+            analysis_data = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "target_role": analysis["target_role"],
+                    "matched_skills": list(analysis.get("matched_skills", [])),
+                    "missing_skills": list(analysis.get("missing_skills", [])),
+                    "match_score": analysis.get("match_score", 0),
+                    "analysis_date": now
+                }
+                for analysis in analyses
+            ]
+            params = {"p_resume": resume_data, "p_analyses": analysis_data}
+
+            if background:
+                self.writer.submit_call(self.client, "save_resume_with_analysis", params)
+                return {"resume_id": resume_data["id"], "analysis_ids": [a["id"] for a in analysis_data]}
+
+            response = self.client.rpc("save_resume_with_analysis", params).execute()
+            return response.data or None
+
+        except Exception as e:
+            print(f"Error saving resume with analysis: {e}")
+            return None
+
+    def get_user_analyses(
+        self,
+        user_id: str,
+        limit: int = 10,
+        columns: str = ANALYSIS_LIST_COLUMNS
+    ) -> List[Dict[str, Any]]:
         """
-        Get recent skill gap analyses for a user
+        Get recent skill gap analyses for a user. The default columns are
+        what the analytics view plots; pass "*" for matched/missing skills.
         """
         try:
-            response = self.client.table("skill_gaps").select("*").eq(
+            response = self.client.table("skill_gaps").select(columns).eq(
                 "user_id", user_id
-            ).order("analysis_date", desc=True).limit(limit).execute()
+            ).order("analysis_date", desc=True).order("id", desc=True).limit(limit).execute()
 
-            if response.data:
-                for analysis in response.data:
-                    if isinstance(analysis.get("matched_skills"), str):
-                        analysis["matched_skills"] = json.loads(analysis["matched_skills"])
-                    if isinstance(analysis.get("missing_skills"), str):
-                        analysis["missing_skills"] = json.loads(analysis["missing_skills"])
+            return [decode_jsonb(analysis, "matched_skills", "missing_skills")
+                    for analysis in response.data or []]
 
-                return response.data
+        except Exception as e:
+            print(f"Error fetching analyses: {e}")
             return []
 
+    def get_user_analyses_page(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[PageCursor] = None,
+        columns: str = ANALYSIS_LIST_COLUMNS
+    ) -> Page:
+        """
+        One page of a user's analyses, newest first, starting after `after`
+        """
+        try:
+            rows = self._keyset_page("skill_gaps", columns, "analysis_date", user_id, limit, after)
+            rows = [decode_jsonb(row, "matched_skills", "missing_skills") for row in rows]
+            return self._page(rows, "analysis_date", limit)
+
         except Exception as e:
             print(f"Error fetching analyses: {e}")
-            return []
+            return Page([], None)
 
-    def get_resume_statistics(self, user_id: str) -> Dict[str, Any]:
+    def get_dashboard(self, user_id: str, days: int = DASHBOARD_DAYS, top: int = 5) -> Dict[str, Any]:
         """
-        Get statistics about user's resumes
+        Everything the dashboard shows, from one RPC over the per-user
+        summary tables the database keeps up to date: the statistics of
+        get_resume_statistics() plus score_series (daily averages for the
+        last `days` days), role_frequencies and top_analyses.
         """
         try:
-            resumes = self.get_user_resumes(user_id)
-            analyses = self.get_user_analyses(user_id, limit=100)
-
-            total_resumes = len(resumes)
-            total_analyses = len(analyses)
-            avg_match_score = sum(a.get("match_score", 0) for a in analyses) / total_analyses if total_analyses > 0 else 0
-
-            all_skills = set()
-            for resume in resumes:
-                skills = resume.get("parsed_skills", [])
-                if isinstance(skills, list):
-                    all_skills.update(skills)
-
-            return {
-                "total_resumes": total_resumes,
-                "total_analyses": total_analyses,
-                "average_match_score": round(avg_match_score, 2),
-                "unique_skills": len(all_skills),
-                "most_recent_upload": resumes[0].get("upload_date") if resumes else None
-            }
+            response = self.client.rpc(
+                "get_user_dashboard",
+                {"p_user_id": user_id, "p_days": days, "p_top": top}
+            ).execute()
+
+            dashboard = {**EMPTY_DASHBOARD, **(response.data or {})}
+            dashboard["average_match_score"] = float(dashboard["average_match_score"] or 0)
+            return dashboard
 
         except Exception as e:
-            print(f"Error fetching statistics: {e}")
-            return {
-                "total_resumes": 0,
-                "total_analyses": 0,
-                "average_match_score": 0,
-                "unique_skills": 0,
-                "most_recent_upload": None
-            }
+            print(f"Error fetching dashboard: {e}")
+            return dict(EMPTY_DASHBOARD)
+
+    def get_resume_statistics(self, user_id: str) -> Dict[str, Any]:
+        """
+        Get statistics about user's resumes
+        """
+        dashboard = self.get_dashboard(user_id)
+        return {key: dashboard[key] for key in STATISTICS_KEYS}
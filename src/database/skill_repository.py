@@ -1,15 +1,29 @@
-from typing import Optional, Dict, Any, List
-from supabase import Client
+from __future__ import annotations
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from .supabase_client import get_supabase_client
-import json
+from .query_cache import QueryCache, catalog_cache
+from .jsonb import decode_jsonb, decode_jsonb_rows
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 class SkillRepository:
     """
-    Handles all database operations for skills and job roles
+    Handles all database operations for skills and job roles.
+    Whole-catalog reads go through a process-wide cache (see query_cache);
+    their results are shared and must not be mutated.
     """
 
-    def __init__(self, client: Optional[Client] = None):
+    def __init__(self, client: Optional[Client] = None, cache: Optional[QueryCache] = None):
         self.client = client or get_supabase_client()
+        self.cache = cache or catalog_cache
+
+    def invalidate_cache(self, prefix: str = "") -> None:
+        """Forget cached catalog reads ("job_roles:", "skills:" or everything)"""
+        self.cache.invalidate(prefix)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
 
     def get_all_job_roles(self) -> Dict[str, List[str]]:
         """
@@ -17,26 +31,53 @@ class SkillRepository:
         Returns a dict mapping role names to skill lists
         """
         try:
-            response = self.client.table("job_roles").select("*").execute()
-
-            if response.data:
-                roles_map = {}
-                for role in response.data:
-                    role_name = role.get("role_name")
-                    required_skills = role.get("required_skills", [])
-
-                    if isinstance(required_skills, str):
-                        required_skills = json.loads(required_skills)
-
-                    roles_map[role_name] = required_skills
-
-                return roles_map
-            return {}
+            return self.cache.get_or_load("job_roles:all", self._fetch_all_job_roles)
 
         except Exception as e:
             print(f"Error fetching job roles: {e}")
             return {}
 
+    def _fetch_all_job_roles(self) -> Dict[str, List[str]]:
+        rows = self.cache.get_or_load("job_roles:rows", self._fetch_job_role_rows)
+        return {role.get("role_name"): role.get("required_skills", []) for role in rows}
+
+    def _fetch_job_role_rows(self) -> List[Dict[str, Any]]:
+        response = self.client.table("job_roles").select("*").execute()
+        return decode_jsonb_rows(response.data or [], "required_skills")
+
+    # Catalog sync: full reads and rows changed after a watermark. These
+    # raise on failure so the caller can keep its current catalog, and
+    # bypass the cache: the catalog snapshot has its own refresh interval.
+
+    def fetch_all_job_role_rows(self) -> List[Dict[str, Any]]:
+        """All job_roles rows (with updated_at), required_skills decoded"""
+        return self._fetch_job_role_rows()
+
+    def fetch_all_skill_rows(self) -> List[Dict[str, Any]]:
+        """All skills_database rows (with last_updated), synonyms decoded"""
+        return self._fetch_all_skills()
+
+    def get_job_roles_changed_since(self, since: str) -> List[Dict[str, Any]]:
+        """job_roles rows with updated_at > `since` (ISO timestamp), oldest first"""
+        response = self.client.table("job_roles").select(
+            "role_name, required_skills, updated_at"
+        ).gt("updated_at", since).order("updated_at").execute()
+        return decode_jsonb_rows(response.data or [], "required_skills")
+
+    def get_skills_changed_since(self, since: str) -> List[Dict[str, Any]]:
+        """skills_database rows with last_updated > `since`, oldest first"""
+        response = self.client.table("skills_database").select(
+            "skill_name, synonyms, last_updated"
+        ).gt("last_updated", since).order("last_updated").execute()
+        return decode_jsonb_rows(response.data or [], "synonyms")
+
+    def get_catalog_deletions_since(self, since: str) -> List[Dict[str, Any]]:
+        """Tombstones (table_name, row_name, deleted_at) for job_roles / skills_database rows deleted after `since`"""
+        response = self.client.table("catalog_deletions").select(
+            "table_name, row_name, deleted_at"
+        ).gt("deleted_at", since).order("deleted_at").execute()
+        return response.data or []
+
     def get_job_role_details(self, role_name: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed information about a specific job role
@@ -47,10 +88,7 @@ class SkillRepository:
             ).maybeSingle().execute()
 
             if response.data:
-                role = response.data
-                if isinstance(role.get("required_skills"), str):
-                    role["required_skills"] = json.loads(role["required_skills"])
-                return role
+                return decode_jsonb(response.data, "required_skills")
             return None
 
         except Exception as e:
@@ -66,12 +104,7 @@ class SkillRepository:
                 "category", category
             ).execute()
 
-            if response.data:
-                for role in response.data:
-                    if isinstance(role.get("required_skills"), str):
-                        role["required_skills"] = json.loads(role["required_skills"])
-                return response.data
-            return []
+            return decode_jsonb_rows(response.data or [], "required_skills")
 
         except Exception as e:
             print(f"Error fetching roles by category: {e}")
@@ -86,12 +119,7 @@ class SkillRepository:
                 "experience_level", experience_level
             ).execute()
 
-            if response.data:
-                for role in response.data:
-                    if isinstance(role.get("required_skills"), str):
-                        role["required_skills"] = json.loads(role["required_skills"])
-                return response.data
-            return []
+            return decode_jsonb_rows(response.data or [], "required_skills")
 
         except Exception as e:
             print(f"Error fetching roles by experience: {e}")
@@ -102,21 +130,18 @@ class SkillRepository:
         Get all skills from the skills database
         """
         try:
-            response = self.client.table("skills_database").select("*").order(
-                "popularity_score", desc=True
-            ).execute()
-
-            if response.data:
-                for skill in response.data:
-                    if isinstance(skill.get("synonyms"), str):
-                        skill["synonyms"] = json.loads(skill["synonyms"])
-                return response.data
-            return []
+            return self.cache.get_or_load("skills:all", self._fetch_all_skills)
 
         except Exception as e:
             print(f"Error fetching skills: {e}")
             return []
 
+    def _fetch_all_skills(self) -> List[Dict[str, Any]]:
+        response = self.client.table("skills_database").select("*").order(
+            "popularity_score", desc=True
+        ).execute()
+        return decode_jsonb_rows(response.data or [], "synonyms")
+
     def get_skills_by_category(self, category: str) -> List[Dict[str, Any]]:
         """
         Get all skills in a specific category
@@ -126,12 +151,7 @@ class SkillRepository:
                 "category", category
             ).order("popularity_score", desc=True).execute()
 
-            if response.data:
-                for skill in response.data:
-                    if isinstance(skill.get("synonyms"), str):
-                        skill["synonyms"] = json.loads(skill["synonyms"])
-                return response.data
-            return []
+            return decode_jsonb_rows(response.data or [], "synonyms")
 
         except Exception as e:
             print(f"Error fetching skills by category: {e}")
@@ -146,12 +166,7 @@ class SkillRepository:
                 "skill_name", f"%{query}%"
             ).execute()
 
-            if response.data:
-                for skill in response.data:
-                    if isinstance(skill.get("synonyms"), str):
-                        skill["synonyms"] = json.loads(skill["synonyms"])
-                return response.data
-            return []
+            return decode_jsonb_rows(response.data or [], "synonyms")
 
         except Exception as e:
             print(f"Error searching skills: {e}")
@@ -162,33 +177,31 @@ class SkillRepository:
         Get all unique skill categories
         """
         try:
-            response = self.client.table("skills_database").select("category").execute()
-
-            if response.data:
-                categories = list(set(item["category"] for item in response.data))
-                return sorted(categories)
-            return []
+            return self.cache.get_or_load("skills:categories", self._fetch_skill_categories)
 
         except Exception as e:
             print(f"Error fetching categories: {e}")
             return []
 
+    def _fetch_skill_categories(self) -> List[str]:
+        response = self.client.table("skills_database").select("category").execute()
+        return sorted(set(item["category"] for item in response.data or []))
+
     def get_role_categories(self) -> List[str]:
         """
         Get all unique job role categories
         """
         try:
-            response = self.client.table("job_roles").select("category").execute()
-
-            if response.data:
-                categories = list(set(item["category"] for item in response.data))
-                return sorted(categories)
-            return []
+            return self.cache.get_or_load("job_roles:categories", self._fetch_role_categories)
 
         except Exception as e:
             print(f"Error fetching role categories: {e}")
             return []
 
+    def _fetch_role_categories(self) -> List[str]:
+        response = self.client.table("job_roles").select("category").execute()
+        return sorted(set(item["category"] for item in response.data or []))
+
     def add_custom_skill(
         self,
         skill_name: str,
@@ -203,11 +216,12 @@ class SkillRepository:
             skill_data = {
                 "skill_name": skill_name,
                 "category": category,
-                "synonyms": json.dumps(synonyms or []),
+                "synonyms": list(synonyms or []),
                 "popularity_score": popularity_score
             }
 
             response = self.client.table("skills_database").insert(skill_data).execute()
+            self.invalidate_cache("skills:")
 
             if response.data:
                 return response.data[0]
@@ -1,19 +1,33 @@
+from __future__ import annotations
 import os
-from typing import Optional
-from supabase import create_client, Client
+import threading
+from typing import Any, Dict, Optional, TYPE_CHECKING
 from dotenv import load_dotenv
-import streamlit as st
+
+# supabase and streamlit are imported when the client is first created,
+# so importing the repositories stays cheap
+if TYPE_CHECKING:
+    from supabase import Client
 
 load_dotenv()
 
+# Process-wide client for code that runs outside any session (see get_supabase_client)
 _supabase_client: Optional[Client] = None
+_client_lock = threading.Lock()
 
 def init_supabase() -> Client:
     """
     Initialize Supabase client with environment variables.
-    This should be called once at application startup.
+    Call once per session: each call returns a new client, whose auth
+    state (and so the Authorization header its queries carry) belongs to
+    that session alone. All clients share one pooled HTTP connection set.
     """
-    global _supabase_client
+    return _create_client()
+
+def _create_client() -> Client:
+    import streamlit as st
+    from supabase import ClientOptions, create_client
+    from .http_pool import get_http_client
 
     try:
         # Use Streamlit secrets (works both locally and in production)
@@ -33,17 +47,33 @@ def init_supabase() -> Client:
                 "VITE_SUPABASE_ANON_KEY are set in your .env file."
             )
 
-    _supabase_client = create_client(supabase_url, supabase_key)
-    return _supabase_client
+    # AuthService refreshes tokens itself (see auth_service); a second
+    # refresher would race it with the same single-use refresh token.
+    # Sub-clients send their headers per request, so sharing the pooled
+    # HTTP/2 client does not share the session's auth between clients.
+    return create_client(supabase_url, supabase_key, ClientOptions(
+        auto_refresh_token=False,
+        httpx_client=get_http_client(),
+    ))
 
 def get_supabase_client() -> Client:
     """
-    Get the initialized Supabase client.
-    Creates a new client if one doesn't exist.
+    Get the process-wide client, created once (thread-safe).
+    Used where there is no session, e.g. catalog loads. Nothing signs in
+    on it, so it always reads with the anon key, whichever sessions exist;
+    per-user data goes through the session's own client.
     """
     global _supabase_client
 
-    if _supabase_client is None:
-        _supabase_client = init_supabase()
+    client = _supabase_client
+    if client is None:
+        with _client_lock:
+            if _supabase_client is None:
+                _supabase_client = _create_client()
+            client = _supabase_client
+    return client
 
-    return _supabase_client
+def get_http_pool_stats() -> Dict[str, Any]:
+    """Connections, requests in flight and latency of the shared HTTP pool"""
+    from .http_pool import pool_stats
+    return pool_stats()
@@ -0,0 +1,99 @@
+"""
+Local verification of Supabase access tokens.
+
+A signed-in user's access token is a JWT. Checking its signature,
+expiry and audience here replaces an auth.get_user() round-trip per page
+render. Projects signing with the legacy shared secret (HS256) need
+SUPABASE_JWT_SECRET. Projects with asymmetric signing keys (ES256/RS256)
+are verified against the project's JWKS, fetched once and then cached.
+Decoded claims are cached per token until the token expires.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import jwt
+
+# Clock skew tolerated between this host and the auth server
+DEFAULT_LEEWAY_SECONDS = 30
+_ASYMMETRIC_ALGORITHMS = ("ES256", "RS256")
+_MAX_CACHED_TOKENS = 1024
+
+def _setting(secret_name: str, env_name: str) -> Optional[str]:
+    """Streamlit secret if set, else environment variable (as init_supabase does)"""
+    try:
+        import streamlit as st
+        return st.secrets[secret_name]
+    except Exception:
+        return os.getenv(env_name)
+
+class TokenVerifier:
+    """
+    verifier.verify(access_token) -> claims, or raises jwt.InvalidTokenError
+    """
+
+    def __init__(self, jwt_secret: Optional[str] = None, jwks_url: Optional[str] = None,
+                 api_key: Optional[str] = None, audience: str = "authenticated",
+                 leeway: float = DEFAULT_LEEWAY_SECONDS):
+        self.jwt_secret = jwt_secret
+        self.audience = audience
+        self.leeway = leeway
+        self._jwks = None
+        if jwks_url:
+            headers = {"apikey": api_key} if api_key else None
+            self._jwks = jwt.PyJWKClient(jwks_url, cache_keys=True, headers=headers)
+        self._claims: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "TokenVerifier":
+        url = _setting("SUPABASE_URL", "VITE_SUPABASE_URL")
+        return cls(
+            jwt_secret=_setting("SUPABASE_JWT_SECRET", "SUPABASE_JWT_SECRET"),
+            jwks_url=f"{url.rstrip('/')}/auth/v1/.well-known/jwks.json" if url else None,
+            api_key=_setting("SUPABASE_KEY", "VITE_SUPABASE_ANON_KEY"),
+        )
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        with self._lock:
+            claims = self._claims.get(token)
+        if claims is not None:
+            if claims.get("exp", 0) + self.leeway > time.time():
+                return claims
+            with self._lock:
+                self._claims.pop(token, None)
+            raise jwt.ExpiredSignatureError("Signature has expired")
+
+        algorithm = jwt.get_unverified_header(token).get("alg")
+        claims = jwt.decode(token, self._key(token, algorithm), algorithms=[algorithm],
+                            audience=self.audience, leeway=self.leeway, options={"require": ["exp", "sub"]})
+        with self._lock:
+            if len(self._claims) >= _MAX_CACHED_TOKENS:
+                self._claims.clear()
+            self._claims[token] = claims
+        return claims
+
+    def _key(self, token: str, algorithm: Optional[str]) -> Any:
+        if algorithm == "HS256":
+            if not self.jwt_secret:
+                raise jwt.InvalidKeyError("HS256 token but SUPABASE_JWT_SECRET is not set")
+            return self.jwt_secret
+        if algorithm in _ASYMMETRIC_ALGORITHMS:
+            if self._jwks is None:
+                raise jwt.InvalidKeyError(f"{algorithm} token but no JWKS URL is configured")
+            return self._jwks.get_signing_key_from_jwt(token).key
+        raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {algorithm}")
+
+_verifier: Optional[TokenVerifier] = None
+_verifier_lock = threading.Lock()
+
+def get_token_verifier() -> TokenVerifier:
+    """Process-wide verifier (shares the cached JWKS and claims)"""
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                _verifier = TokenVerifier.from_settings()
+    return _verifier
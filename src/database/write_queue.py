@@ -0,0 +1,218 @@
+"""
+In-process write-behind queue for inserts the UI does not wait on.
+
+Rows are queued with submit() and written by one background worker in
+batches: consecutive rows for the same table go out as one bulk upsert.
+Rows carry a client-generated primary key, so a retried batch whose first
+attempt did land is a no-op (ON CONFLICT DO NOTHING). submit_call() queues
+an RPC instead; it runs on its own, in order with the rows, and must be
+idempotent in the same way. Failed writes are retried with exponential
+backoff; a batch still failing after the last attempt is logged with its
+row ids and appended to a dead-letter file (one JSON object per line),
+from which requeue_dead_letters() submits it again. Pending rows are
+flushed at interpreter exit.
+"""
+from __future__ import annotations
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.parsing.log_events import log_event
+
+logger = logging.getLogger(__name__)
+
+PROJ_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "50"))
+# How long the worker waits for more rows before writing a partial batch
+DEFAULT_MAX_DELAY_SECONDS = float(os.getenv("WRITE_BEHIND_MAX_DELAY_SECONDS", "0.05"))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", "5"))
+DEFAULT_SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv("WRITE_BEHIND_SHUTDOWN_TIMEOUT_SECONDS", "10"))
+# Batches that failed every attempt, kept for requeue_dead_letters()
+DEFAULT_DEAD_LETTER_PATH = Path(os.getenv("WRITE_BEHIND_DEAD_LETTER_PATH",
+                                          PROJ_ROOT / ".cache" / "write_behind_failed.jsonl"))
+
+# Item kinds: a row for a table, or the parameters of an RPC
+_ROW = "row"
+_CALL = "call"
+
+def _runs(batch: List[Tuple[Any, str, str, Dict[str, Any]]]) -> List[Tuple[Any, str, str, List[Dict[str, Any]]]]:
+    """Group consecutive rows for the same client and table, keeping submission order; calls stay single"""
+    runs: List[Tuple[Any, str, str, List[Dict[str, Any]]]] = []
+    for client, kind, target, payload in batch:
+        last = runs[-1] if runs else None
+        if kind == _ROW and last and last[0] is client and last[1] == _ROW and last[2] == target:
+            last[3].append(payload)
+        else:
+            runs.append((client, kind, target, [payload]))
+    return runs
+
+def _item_id(payload: Dict[str, Any]) -> Any:
+    """A row's primary key, or that of the first row among an RPC's parameters"""
+    if "id" in payload:
+        return payload["id"]
+    for value in payload.values():
+        if isinstance(value, dict) and "id" in value:
+            return value["id"]
+    return None
+
+class WriteBehindQueue:
+    """
+    write_queue.submit(client, "resumes", row)  # returns at once
+    write_queue.flush(timeout=5)                # wait until everything queued so far is written
+
+    Rows are written in submission order, so a parent row submitted
+    before its children is inserted first.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, max_delay: float = DEFAULT_MAX_DELAY_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, backoff: float = 0.5, max_backoff: float = 10.0,
+                 shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT_SECONDS, name: str = "write-behind",
+                 dead_letter_path: Optional[Union[str, Path]] = DEFAULT_DEAD_LETTER_PATH):
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.shutdown_timeout = shutdown_timeout
+        self.name = name
+        self.dead_letter_path = Path(dead_letter_path) if dead_letter_path else None
+        self._dead_letter_lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[Any, str, str, Dict[str, Any]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._worker: Optional[threading.Thread] = None
+        self._stats = {"submitted": 0, "written": 0, "batches": 0, "retries": 0, "failed": 0, "dead_lettered": 0}
+
+    def submit(self, client: Any, table: str, row: Dict[str, Any]) -> None:
+        """Queue `row` for insertion into `table`; it must include its primary key `id`"""
+        self._put(client, _ROW, table, row)
+
+    def submit_call(self, client: Any, function: str, params: Dict[str, Any]) -> None:
+        """Queue `client.rpc(function, params)`; retried like a batch, so it must be idempotent"""
+        self._put(client, _CALL, function, params)
+
+    def _put(self, client: Any, kind: str, target: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending += 1
+            self._stats["submitted"] += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+                atexit.register(self.flush, self.shutdown_timeout)
+        self._queue.put((client, kind, target, payload))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every row submitted so far is written or given up on; False on timeout"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending
+        return stats
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                for client, kind, target, payloads in _runs(batch):
+                    self._write(client, kind, target, payloads)
+            finally:
+                with self._idle:
+                    self._pending -= len(batch)
+                    self._stats["batches"] += 1
+                    self._idle.notify_all()
+
+    def _write(self, client: Any, kind: str, target: str, payloads: List[Dict[str, Any]]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if kind == _CALL:
+                    client.rpc(target, payloads[0]).execute()
+                else:
+                    client.table(target).upsert(payloads, on_conflict="id", ignore_duplicates=True).execute()
+                with self._lock:
+                    self._stats["written"] += len(payloads)
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    with self._lock:
+                        self._stats["failed"] += len(payloads)
+                    self._dead_letter(kind, target, payloads, e, attempt)
+                    return
+                with self._lock:
+                    self._stats["retries"] += 1
+                # Exponential backoff with jitter so retries from several processes spread out
+                delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def _dead_letter(self, kind: str, target: str, payloads: List[Dict[str, Any]], error: Exception,
+                     attempts: int) -> None:
+        stored = False
+        if self.dead_letter_path is not None:
+            entry = {"failed_at": datetime.now(timezone.utc).isoformat(), "kind": kind, "target": target,
+                     "error": str(error), "payloads": payloads}
+            try:
+                with self._dead_letter_lock:
+                    self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(entry, default=str) + "\n")
+                stored = True
+                with self._lock:
+                    self._stats["dead_lettered"] += len(payloads)
+            except OSError as write_error:
+                log_event(logger, logging.ERROR, "write_behind.dead_letter_failed",
+                          path=str(self.dead_letter_path), error=str(write_error))
+        log_event(logger, logging.ERROR, "write_behind.gave_up", kind=kind, target=target, items=len(payloads),
+                  ids=",".join(str(_item_id(payload)) for payload in payloads), attempts=attempts, error=str(error),
+                  dead_letter=str(self.dead_letter_path) if stored else None)
+
+    def requeue_dead_letters(self, client: Any) -> int:
+        """
+        Submit every dead-lettered batch again through `client` and empty the
+        file; returns the number of items queued. Safe to repeat: rows and
+        calls are idempotent.
+        """
+        if self.dead_letter_path is None:
+            return 0
+        with self._dead_letter_lock:
+            try:
+                lines = self.dead_letter_path.read_text(encoding="utf-8").splitlines()
+            except FileNotFoundError:
+                return 0
+            self.dead_letter_path.unlink()
+        count = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            for payload in entry["payloads"]:
+                self._put(client, entry["kind"], entry["target"], payload)
+                count += 1
+        return count
+
+# Shared by every ResumeRepository in the process
+write_queue = WriteBehindQueue()
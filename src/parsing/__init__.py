@@ -15,43 +15,75 @@
     if not path.exists():
         raise FileNotFoundError(f"PDF not found: {pdf_path}")'''
 
+import hashlib
+import logging
 from pathlib import Path
 from typing import Optional, Dict, List, Literal
-from .pdf_parser_improved import extract_text_from_pdf
-from .docx_parser import extract_text_from_docx
+from .sources import FileSource, detect_file_type, is_bytes_source, to_bytes
+from .pdf_document import PdfDocument, PdfSource
+from .pdf_parser_improved import extract_text_from_pdf, DEFAULT_MODE
+from .extraction_cache import get_extraction_cache, file_sha256
+from .docx_parser import extract_text_from_docx, DEFAULT_DOCX_ENGINE
 from .text_cleaner import clean_extracted_text, clean_and_preserve_structure
 from .enhanced_parser import enhanced_extract_sections as extract_sections
+from .log_events import log_event, configure_logging
+
+logger = logging.getLogger(__name__)
 
 __version__ = "1.0.0"
-__all__ = ['parse_resume', 'parse_pdf']  # Public API
+__all__ = ['parse_resume', 'parse_pdf', 'PdfDocument', 'configure_logging']  # Public API
 # __all__ - it tells (other Python files) what (functions) they can use
 
 # -> Optional[str]: Might return text (str) or None if failed
-def parse_pdf(pdf_path: str, engine: Literal["auto", "pypdf2", "pdfminer"] = "auto") -> Optional[str]:
+def parse_pdf(pdf_path: PdfSource, engine: Literal["auto", "pypdf2", "pdfminer"] = "auto") -> Optional[str]:
     """Cross-platform PDF parser with multiple fallback strategies"""
-    path = Path(pdf_path)
-    if not path.exists():
+    if not isinstance(pdf_path, PdfDocument) and not is_bytes_source(pdf_path) and not Path(pdf_path).exists():
         raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
     text = extract_text_from_pdf(pdf_path)
     return clean_and_preserve_structure(text) if text else None
 
-def parse_resume(file_path: str) -> Optional[Dict[str, List[str]]]:
-    """Unified parser that returns structured data"""
-    path = Path(file_path)
-    suffix = path.suffix.lower()
-    
+def parse_resume(file_path: FileSource, file_type: Optional[str] = None) -> Optional[Dict[str, List[str]]]:
+    """
+    Unified parser that returns structured data.
+    Accepts a path or the upload's bytes (bytes/BytesIO/memoryview); the type
+    of in-memory uploads is sniffed unless `file_type` ('pdf'/'docx') is given.
+    """
+    suffix = detect_file_type(file_path, file_type)
+    if suffix not in ('.pdf', '.docx'):
+        raise ValueError(f"Unsupported file format: {suffix}")
+
+    if is_bytes_source(file_path):
+        # Parse straight from memory, nothing is written to disk
+        file_path = to_bytes(file_path)
+        name = "upload" + suffix
+        digest = hashlib.sha256(file_path).hexdigest()
+    else:
+        name = Path(file_path).name
+        digest = file_sha256(file_path) if Path(file_path).exists() else None
+
+    # Identical bytes parse to identical sections: serve repeats from the cache
+    cache = get_extraction_cache()
+    key = None
+    if cache is not None and digest is not None:
+        key = cache.key(digest, DEFAULT_MODE if suffix == '.pdf' else f"docx-{DEFAULT_DOCX_ENGINE}")
+        entry = cache.get(key)
+        if entry and "sections" in entry:
+            log_event(logger, logging.INFO, "parse.cache_hit", file=name,
+                      skills_found=len(entry["sections"].get("skills", [])))
+            return entry["sections"]
+
     # Extract raw text first
-    raw_text = None
     if suffix == '.pdf':
-        raw_text = parse_pdf(file_path, engine="auto")
-    elif suffix == '.docx':
-        raw_text = extract_text_from_docx(file_path)
+        # One session per upload: text extraction and table extraction share it
+        with PdfDocument(file_path, sha256=digest, name=name) as document:
+            raw_text = parse_pdf(document, engine="auto")
+            sections = extract_sections(raw_text, document) if raw_text else None
     else:
-        raise ValueError(f"Unsupported file format: {suffix}")
-
-    if not raw_text:
-        return None
+        raw_text = extract_text_from_docx(file_path)
+        # Convert raw text to structured data
+        sections = extract_sections(raw_text) if raw_text else None
 
-    # Convert raw text to structured data
-    return extract_sections(raw_text, file_path)  # This should return dict
\ No newline at end of file
+    if sections is not None and key is not None:
+        cache.update(key, sections=sections)
+    return sections
@@ -1,82 +1,80 @@
 # src/parsing/advanced_pdf_parser.py
-import pdfplumber
-from pdfminer.high_level import extract_text
-from pathlib import Path
+import logging
 from typing import Optional
-import tempfile
-import os
+from .pdf_document import PdfDocument, PdfSource, open_pdf_document
+from .ocr_pool import ocr_dependencies_available, ocr_images
+from .log_events import log_event
 
-try:
-    from pdf2image import convert_from_path
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-    print("⚠️ OCR dependencies not installed. Run: pip install pdf2image pytesseract pillow")
+logger = logging.getLogger(__name__)
 
-def extract_text_advanced(pdf_path: str, use_ocr: bool = True) -> Optional[str]:
+OCR_AVAILABLE = ocr_dependencies_available()
+if not OCR_AVAILABLE:
+    log_event(logger, logging.WARNING, "ocr.unavailable", install="pip install pytesseract pillow")
+
+def extract_text_advanced(pdf_path: PdfSource, use_ocr: bool = True) -> Optional[str]:
     """
     Advanced PDF text extraction with OCR fallback
     """
-    path = Path(pdf_path)
-    if not path.exists():
-        raise FileNotFoundError(f"PDF not found: {pdf_path}")
-    
+    with open_pdf_document(pdf_path) as document:
+        return _extract_text_advanced(document, use_ocr)
+
+def _extract_text_advanced(document: PdfDocument, use_ocr: bool) -> Optional[str]:
     text = ""
     
     # Strategy 1: Try pdfplumber first (best for modern PDFs)
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        print(f"✅ pdfplumber extracted {len(text)} characters")
+        for page_text in document.page_texts:
+            if page_text:
+                text += page_text + "\n"
+        log_event(logger, logging.DEBUG, "pdf.engine", engine="pdfplumber", chars=len(text))
     except Exception as e:
-        print(f"❌ pdfplumber failed: {e}")
+        log_event(logger, logging.WARNING, "pdf.engine_failed", engine="pdfplumber", error=str(e))
     
     # Strategy 2: If little text, try pdfminer
     if len(text.strip()) < 100:
         try:
-            pdfminer_text = extract_text(pdf_path)
+            if "pdfminer" not in document.text_layers:
+                from pdfminer.high_level import extract_text
+                with document.open_stream() as stream:
+                    document.text_layers["pdfminer"] = extract_text(stream)
+            pdfminer_text = document.text_layers["pdfminer"]
             if pdfminer_text and len(pdfminer_text.strip()) > len(text.strip()):
                 text = pdfminer_text
-                print(f"✅ pdfminer extracted {len(text)} characters")
+                log_event(logger, logging.DEBUG, "pdf.engine", engine="pdfminer", chars=len(text))
         except Exception as e:
-            print(f"❌ pdfminer failed: {e}")
+            log_event(logger, logging.WARNING, "pdf.engine_failed", engine="pdfminer", error=str(e))
     
     # Strategy 3: If still little text and OCR available, use OCR
     if use_ocr and OCR_AVAILABLE and len(text.strip()) < 100:
-        print("🔄 Trying OCR extraction...")
-        ocr_text = extract_text_with_ocr(pdf_path)
+        log_event(logger, logging.DEBUG, "pdf.ocr_fallback", file=document.name)
+        ocr_text = extract_text_with_ocr(document)
         if ocr_text and len(ocr_text.strip()) > len(text.strip()):
             text = ocr_text
-            print(f"✅ OCR extracted {len(text)} characters")
+            log_event(logger, logging.DEBUG, "pdf.engine", engine="OCR", chars=len(text))
     
     return text if text.strip() else None
 
-def extract_text_with_ocr(pdf_path: str) -> Optional[str]:
+def extract_text_with_ocr(pdf_path: PdfSource) -> Optional[str]:
     """Extract text from PDF using OCR"""
     if not OCR_AVAILABLE:
-        print("⚠️ OCR not available")
+        log_event(logger, logging.WARNING, "ocr.unavailable")
         return None
         
     try:
-        # Convert PDF to images
-        images = convert_from_path(pdf_path, dpi=300)
+        # Convert PDF to images (PDFium, in-process)
+        with open_pdf_document(pdf_path) as document:
+            images = document.render_pages(dpi=300)
         
         text = ""
-        for i, image in enumerate(images):
-            # Use OCR on each page
-            page_text = pytesseract.image_to_string(image)
-            text += f"--- Page {i+1} ---\n{page_text}\n"
+        for page in ocr_images(images):
+            text += f"--- Page {page.page_number} ---\n{page.text}\n"
         
         return text
     except Exception as e:
-        print(f"❌ OCR extraction failed: {e}")
+        log_event(logger, logging.WARNING, "ocr.failed", error=str(e))
         return None
 
-def is_scanned_pdf(pdf_path: str) -> bool:
+def is_scanned_pdf(pdf_path: PdfSource) -> bool:
     """Check if PDF is likely scanned (image-based)"""
     try:
         # Extract text with regular methods
@@ -86,5 +84,6 @@ def is_scanned_pdf(pdf_path: str) -> bool:
         if text and len(text.strip()) < 100:
             return True
         return False
-    except:
+    except Exception as e:
+        log_event(logger, logging.WARNING, "pdf.scan_check_failed", error=str(e))
         return True
\ No newline at end of file
@@ -1,8 +1,12 @@
 # Provides a fallback parser if the primary PDF parser (pdfminer) fails.
 # Different PDF libraries handle edge cases differently (e.g., scanned text, tables).
+import logging
 import PyPDF2
 from typing import Optional
 from pathlib import Path
+from ..log_events import log_event
+
+logger = logging.getLogger(__name__)
 
 class PDFExtractor:
     """PyPDF2-based extractor with better error handling"""
@@ -17,5 +21,5 @@ class PDFExtractor:
                         text.append(page_text)
             return '\n'.join(text) if text else None
         except Exception as e:
-            print(f"PyPDF2 extraction failed: {e}")
+            log_event(logger, logging.WARNING, "pdf.engine_failed", engine="PyPDF2", error=str(e))
             return None
\ No newline at end of file
@@ -1,8 +1,26 @@
 # DOCX-specific parser to handle tables and formatted text
-from docx import Document
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterator, List, Literal, Optional, Union
+import io
+import logging
+import os
 import re
+import zipfile
+import xml.etree.ElementTree as ET
+from .sources import FileSource, is_bytes_source, to_bytes
+from .log_events import log_event
+
+logger = logging.getLogger(__name__)
+
+# "python-docx": full object model; paragraphs first, then table cells
+#   (merged cells are repeated once per grid column/row they span)
+# "stream": iterparse over word/document.xml; paragraphs and each physical
+#   table cell once, in document order, with memory bounded by the open elements
+DocxEngine = Literal["python-docx", "stream"]
+DEFAULT_DOCX_ENGINE: DocxEngine = os.getenv("DOCX_EXTRACTION_ENGINE", "python-docx")
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
 
 '''def read_docx_file(file_path):
     """
@@ -22,40 +40,115 @@ import re
         doc = Document(file_path)
         all_text = []'''
 
-def extract_text_from_docx(docx_path: str) -> Optional[str]:
+def extract_text_from_docx(docx_path: FileSource, engine: Optional[DocxEngine] = None) -> Optional[str]:
     """
     Extract text from DOCX including tables
     
     Args:
-        docx_path: Path to DOCX file
+        docx_path: Path to DOCX file, or the upload's bytes
+        engine: "python-docx" or "stream" (default: DOCX_EXTRACTION_ENGINE env var)
         
     Returns:
         Combined text from paragraphs and tables
     """
+    engine = engine or DEFAULT_DOCX_ENGINE
     try:
-        if not Path(docx_path).exists():
+        if is_bytes_source(docx_path):
+            docx_path = io.BytesIO(to_bytes(docx_path))
+        elif not Path(docx_path).exists():
             raise FileNotFoundError(f"DOCX file not found: {docx_path}")
-            
-        doc = Document(docx_path)
-        text_parts = []
-        
-        # 1. Extract paragraphs
-        for p in doc.paragraphs:
-            if p.text.strip():
-                text_parts.append(p.text)
-        # text_parts.extend(p.text for p in doc.paragraphs if p.text.strip())
-        
-        # 2. Extract table content
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text_parts.append(cell.text)
-        
-        # 3. Combine and clean
+
+        if engine == "stream":
+            text_parts = list(_stream_docx_parts(docx_path))
+        else:
+            text_parts = _python_docx_parts(docx_path)
+
+        # Combine and clean
         combined = '\n'.join(text_parts)
         return combined if combined.strip() else None
         
     except Exception as e:
-        print(f"[python-docx] Extraction error: {e}")
-        return None
\ No newline at end of file
+        log_event(logger, logging.WARNING, "docx.extraction_failed", engine=engine, error=str(e))
+        return None
+
+def _python_docx_parts(docx_path: Union[str, Path, BinaryIO]) -> List[str]:
+    from docx import Document
+    doc = Document(docx_path)
+    text_parts = []
+    
+    # 1. Extract paragraphs
+    for p in doc.paragraphs:
+        if p.text.strip():
+            text_parts.append(p.text)
+    # text_parts.extend(p.text for p in doc.paragraphs if p.text.strip())
+    
+    # 2. Extract table content
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                if cell.text.strip():
+                    text_parts.append(cell.text)
+    return text_parts
+
+def _stream_docx_parts(docx_path: Union[str, Path, BinaryIO]) -> Iterator[str]:
+    """
+    Yield non-empty paragraphs and table cells of word/document.xml in document order.
+
+    Each <w:tc> is emitted once: a cell spanning several grid columns is one
+    element, and vertical-merge continuation cells (<w:vMerge/> without
+    val="restart") are skipped. Every element is read by its end event and
+    then detached from its parent, so the tree never holds more than the
+    elements still open and memory does not grow with the file.
+    """
+    with zipfile.ZipFile(docx_path) as archive, archive.open("word/document.xml") as xml:
+        open_elements: List[ET.Element] = []
+        paragraphs: List[List[str]] = []  # text runs of the open (possibly nested) paragraphs
+        cells: List[dict] = []            # open table cells, innermost last
+        fallback_depth = 0                # inside <mc:Fallback>: duplicate of the preferred content
+
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                open_elements.append(elem)
+            else:
+                open_elements.pop()
+                if open_elements:
+                    # Later siblings start after this end, so elem is its parent's only child left
+                    open_elements[-1].remove(elem)
+
+            tag = elem.tag
+            if tag == MC_FALLBACK:
+                fallback_depth += 1 if event == "start" else -1
+                continue
+            if fallback_depth:
+                continue
+
+            if event == "start":
+                if tag == W + "p":
+                    paragraphs.append([])
+                elif tag == W + "tc":
+                    cells.append({"paragraphs": [], "continuation": False})
+                continue
+
+            if tag == W + "t" and paragraphs:
+                paragraphs[-1].append(elem.text or "")
+            elif tag == W + "tab" and paragraphs and open_elements[-1].tag == W + "r":
+                # Run content; <w:tab> under <w:pPr><w:tabs> defines a tab stop
+                paragraphs[-1].append("\t")
+            elif tag in (W + "br", W + "cr") and paragraphs:
+                paragraphs[-1].append("\n")
+            elif tag == W + "vMerge" and cells:
+                cells[-1]["continuation"] = elem.get(W + "val", "continue") == "continue"
+            elif tag == W + "p":
+                text = "".join(paragraphs.pop())
+                if paragraphs:
+                    # Text box inside a paragraph: keep it with the enclosing paragraph
+                    paragraphs[-1].append("\n" + text)
+                elif cells:
+                    cells[-1]["paragraphs"].append(text)
+                elif text.strip():
+                    yield text
+            elif tag == W + "tc":
+                cell = cells.pop()
+                text = "\n".join(cell["paragraphs"])
+                if text.strip() and not cell["continuation"]:
+                    yield text
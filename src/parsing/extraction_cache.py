@@ -0,0 +1,130 @@
+# src/parsing/extraction_cache.py
+"""
+Disk-backed, content-addressed cache for extraction results.
+
+Entries are keyed by the SHA-256 of the uploaded file's bytes plus a
+parser-version string, so re-uploading the same resume (or a Streamlit rerun
+on the same file) skips pdftotext/OCR entirely. Each entry is a small JSON
+file; the least recently used entries are evicted once the directory grows
+past `max_bytes`.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from .log_events import log_event
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction or section parsing changes its output
+PARSER_VERSION = "4"
+
+PROJ_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = Path(os.getenv("RESUME_CACHE_DIR", PROJ_ROOT / ".cache" / "extraction"))
+DEFAULT_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+CACHE_ENABLED = os.getenv("RESUME_CACHE", "1") != "0"
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """
+    Content-addressed JSON entries with LRU size eviction
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        version: str = PARSER_VERSION
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+
+    def key(self, sha256: str, variant: str = "") -> str:
+        """Cache key for file bytes with digest `sha256` (variant: e.g. extraction mode)"""
+        suffix = f"-{variant}" if variant else ""
+        return f"{sha256}-v{self.version}{suffix}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry or None; a hit marks the entry as recently used"""
+        path = self._entry_path(key)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # LRU: mtime is the last access time
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def update(self, key: str, **fields: Any) -> None:
+        """Merge `fields` into the entry for `key` and evict if over budget"""
+        try:
+            with self._lock:
+                entry = self.get(key) or {}
+                entry.update(fields)
+
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                # Write to a temp file and rename so readers never see half an entry
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(tmp_path, self._entry_path(key))
+
+                self._evict()
+        except OSError as e:
+            log_event(logger, logging.WARNING, "cache.write_failed", key=key, error=str(e))
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        # Oldest access first
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+_cache: Optional[ExtractionCache] = ExtractionCache() if CACHE_ENABLED else None
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """The process-wide cache, or None when disabled (RESUME_CACHE=0)"""
+    return _cache
+
+def configure_extraction_cache(cache: Optional[ExtractionCache]) -> None:
+    """Replace the process-wide cache (None disables caching)"""
+    global _cache
+    _cache = cache
@@ -0,0 +1,119 @@
+# src/parsing/keyword_scanner.py
+"""
+Multi-keyword scanner (Aho-Corasick automaton).
+
+All keywords are compiled into one automaton, so the text is read once
+no matter how many keywords there are. Matching is case-insensitive.
+A match must also sit on word boundaries: a keyword edge that is a
+letter or digit may not touch another letter or digit ("go" does not
+match inside "google", but "c++" matches in "c++,").
+"""
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Union
+
+class KeywordMatch(NamedTuple):
+    start: int    # offsets into the scanned text
+    end: int
+    keyword: str  # keyword as registered (lowercase)
+    skill: str    # canonical skill name
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+class KeywordScanner:
+    """
+    Build once, scan many texts.
+
+        scanner = KeywordScanner({"ml": "machine learning", "python": "python"})
+        scanner.skills("Python and ML")  # ['python', 'machine learning']
+    """
+
+    def __init__(self, keywords: Union[Mapping[str, str], Iterable[str]]):
+        if not isinstance(keywords, Mapping):
+            keywords = {keyword: keyword for keyword in keywords}
+
+        # Node 0 is the root; per node: transitions, failure link, keywords ending here
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[tuple] = [()]
+        self._skills: Dict[str, str] = {}
+
+        for keyword, skill in keywords.items():
+            keyword = " ".join(keyword.lower().split())
+            if keyword and keyword not in self._skills:
+                self._skills[keyword] = skill
+                self._insert(keyword)
+        self._link()
+
+    @classmethod
+    def from_synonyms(cls, synonyms_map: Mapping[str, Iterable[str]]) -> "KeywordScanner":
+        """From {canonical: [variants]} (SKILL_SYNONYMS / skills_database shape); first mapping wins"""
+        keywords: Dict[str, str] = {}
+        for skill, variants in synonyms_map.items():
+            keywords.setdefault(skill.lower(), skill)
+            for variant in variants or ():
+                keywords.setdefault(variant.lower(), skill)
+        return cls(keywords)
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def _insert(self, keyword: str) -> None:
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = next_node
+        self._out[node] = (keyword,)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; each node also reports the keywords of its suffixes"""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+
+    def finditer(self, text: str) -> Iterator[KeywordMatch]:
+        """Every keyword occurrence on word boundaries, ordered by end offset (overlaps included)"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lower-case to two ("İ"); keep offsets aligned with `text`
+            lowered = "".join(char.lower()[0] for char in text)
+
+        goto, fail, out, skills = self._goto, self._fail, self._out, self._skills
+        root = goto[0]
+        node = 0
+        for index, char in enumerate(lowered):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0) if node else root.get(char, 0)
+            if not out[node]:
+                continue
+            end = index + 1
+            for keyword in out[node]:
+                start = end - len(keyword)
+                if start and _is_word_char(keyword[0]) and _is_word_char(lowered[start - 1]):
+                    continue
+                if end < len(lowered) and _is_word_char(keyword[-1]) and _is_word_char(lowered[end]):
+                    continue
+                yield KeywordMatch(start, end, keyword, skills[keyword])
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        return list(self.finditer(text))
+
+    def skills(self, text: str) -> List[str]:
+        """Distinct canonical skills in order of first appearance"""
+        found: Dict[str, None] = {}
+        for match in self.finditer(text):
+            found.setdefault(match.skill)
+        return list(found)
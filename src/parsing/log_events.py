@@ -0,0 +1,105 @@
+# src/parsing/log_events.py
+"""
+Structured, leveled events for the parse/match path.
+
+    logger = logging.getLogger(__name__)
+    log_event(logger, logging.INFO, "pdf.extracted", engine="pypdfium2", chars=5120, elapsed_ms=12.5)
+
+Nothing is formatted unless the logger is enabled for the level, so
+disabled events cost one isEnabledFor() check. Callers that would build
+an expensive field (previews, full lists) guard it with
+`logger.isEnabledFor(logging.DEBUG)`.
+
+Levels are set per module from RESUME_LOG_LEVELS, e.g.
+"src=WARNING,src.parsing.pdf_parser_improved=INFO" (a bare level such
+as "DEBUG" applies to the "src" package). RESUME_LOG_FORMAT=json emits
+one JSON object per line for the log shipper.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+ROOT_LOGGER = "src"
+DEFAULT_LEVELS = os.getenv("RESUME_LOG_LEVELS", "INFO")
+DEFAULT_FORMAT = os.getenv("RESUME_LOG_FORMAT", "text")
+
+class Event:
+    """Message object: rendered only if a handler actually emits the record"""
+
+    __slots__ = ("name", "fields")
+
+    def __init__(self, name: str, fields: Dict[str, Any]):
+        self.name = name
+        self.fields = fields
+
+    def __str__(self) -> str:
+        if not self.fields:
+            return self.name
+        return self.name + " " + " ".join(f"{key}={_render(value)}" for key, value in self.fields.items())
+
+def _render(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    if isinstance(value, str) and (" " in value or not value):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields: Any) -> None:
+    """Log `event` with structured fields; a no-op below the logger's level"""
+    if logger.isEnabledFor(level):
+        logger.log(level, "%s", Event(event, fields), extra={"event": event, "fields": fields})
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None) or record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """"src=WARNING,src.parsing.enhanced_parser=DEBUG" -> {logger name: level}"""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level_name = item.rpartition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level in {item!r}")
+        levels[name.strip() or ROOT_LOGGER] = level
+    return levels
+
+_configured = False
+_configure_lock = threading.Lock()
+
+def configure_logging(levels: Optional[str] = None, fmt: Optional[str] = None, force: bool = False) -> None:
+    """
+    Apply per-module levels and attach one stderr handler to the "src"
+    logger. Apps call this once at startup; repeated calls are no-ops
+    unless `force` is set.
+    """
+    global _configured
+    with _configure_lock:
+        if _configured and not force:
+            return
+        for name, level in parse_levels(levels or DEFAULT_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in [h for h in root.handlers if getattr(h, "_resume_handler", False)]:
+            root.removeHandler(handler)
+        handler = logging.StreamHandler()
+        handler._resume_handler = True
+        if (fmt or DEFAULT_FORMAT) == "json":
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        root.addHandler(handler)
+        root.propagate = False
+        _configured = True
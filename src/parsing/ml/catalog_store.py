@@ -0,0 +1,163 @@
+# src/parsing/ml/catalog_store.py
+"""
+Process-wide, versioned snapshot of static catalog data (roles, synonyms).
+
+Readers get the current snapshot without touching the network. When it is
+older than the refresh interval, the first reader to notice starts one
+background reload and keeps returning the old snapshot meanwhile; the new
+one is swapped in with a single assignment once it is fully built. A
+failed reload keeps the previous snapshot. A fallback snapshot (the first
+load failed or came back empty) is retried after the much shorter
+`fallback_retry_interval`, so a transient failure at startup does not pin
+the fallback for a whole refresh interval.
+
+With an `updater`, reloads are incremental: the updater returns a copy of
+the current catalog patched with what changed since its last sync (it
+must not modify the catalog it is given, which readers still hold), and a
+full load runs only every `full_refresh_every` refreshes (or when an
+update fails).
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+from src.parsing.log_events import log_event
+
+logger = logging.getLogger(__name__)
+
+# Seconds a snapshot is served before a background reload is started
+DEFAULT_REFRESH_SECONDS = float(os.getenv("CATALOG_REFRESH_SECONDS", "300"))
+# Incremental refreshes between two full loads (repairs any drift)
+DEFAULT_FULL_REFRESH_EVERY = int(os.getenv("CATALOG_FULL_SYNC_EVERY", "12"))
+# Seconds a fallback snapshot is served before the loader is tried again
+DEFAULT_FALLBACK_RETRY_SECONDS = float(os.getenv("CATALOG_FALLBACK_RETRY_SECONDS", "15"))
+
+class CatalogSnapshot(NamedTuple):
+    catalog: Any
+    version: int       # increases by one per successful load
+    loaded_at: float   # time.monotonic() of the load
+    fallback: bool     # built from the static fallback, not the loader
+
+class CatalogStore:
+    """
+    store = CatalogStore(fetch_from_db, fallback=static_catalog)
+    store.warm()          # app startup: first load in the background
+    catalog = store.get() # request path: never blocks on the loader once loaded
+    """
+
+    def __init__(self, loader: Callable[[], Any], fallback: Optional[Callable[[], Any]] = None,
+                 refresh_interval: float = DEFAULT_REFRESH_SECONDS, name: str = "catalog",
+                 updater: Optional[Callable[[Any], Any]] = None,
+                 full_refresh_every: int = DEFAULT_FULL_REFRESH_EVERY,
+                 fallback_retry_interval: float = DEFAULT_FALLBACK_RETRY_SECONDS):
+        self.loader = loader
+        self.fallback = fallback
+        self.updater = updater
+        self.full_refresh_every = full_refresh_every
+        self._updates_since_full = 0
+        self.refresh_interval = refresh_interval
+        self.fallback_retry_interval = fallback_retry_interval
+        self.name = name
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        self._load_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()  # guards _refreshing only; never held during a load
+        self._refreshing = False
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        return self._snapshot
+
+    def get(self) -> Any:
+        return self.get_snapshot().catalog
+
+    def get_snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Cold start (warm() not called or not finished): the only blocking load
+            with self._load_lock:
+                if self._snapshot is None:
+                    self._load()
+            return self._snapshot
+        interval = self.fallback_retry_interval if snapshot.fallback else self.refresh_interval
+        if time.monotonic() - snapshot.loaded_at >= interval:
+            self.refresh_in_background()
+        return snapshot
+
+    def warm(self) -> None:
+        """Start the first load without waiting for it"""
+        if self._snapshot is None:
+            self.refresh_in_background()
+
+    def refresh_in_background(self) -> bool:
+        """Start a reload unless one is already running; False if one was"""
+        with self._refresh_lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        threading.Thread(target=self._refresh_worker, name=f"{self.name}-refresh", daemon=True).start()
+        return True
+
+    def refresh(self, full: bool = False) -> CatalogSnapshot:
+        """Reload now, in the calling thread (`full` skips the incremental update)"""
+        with self._load_lock:
+            self._load(full)
+        return self._snapshot
+
+    def _refresh_worker(self) -> None:
+        try:
+            with self._load_lock:
+                self._load()
+        except Exception:
+            pass  # no fallback configured; already logged, the current snapshot stays
+        finally:
+            with self._refresh_lock:
+                self._refreshing = False
+
+    def _update(self, previous: CatalogSnapshot) -> Optional[Any]:
+        """Incremental update of the previous catalog, or None when a full load is due"""
+        if (self.updater is None or previous.fallback
+                or self._updates_since_full >= self.full_refresh_every):
+            return None
+        try:
+            catalog = self.updater(previous.catalog)
+        except Exception as e:
+            log_event(logger, logging.WARNING, "catalog.update_failed", catalog=self.name, error=str(e))
+            return None
+        self._updates_since_full += 1
+        return catalog
+
+    def _load(self, full: bool = False) -> None:
+        # Caller holds _load_lock
+        start = time.perf_counter()
+        previous = self._snapshot
+        catalog = None if full or previous is None else self._update(previous)
+        if catalog is not None:
+            self._version += 1
+            self._snapshot = CatalogSnapshot(catalog, self._version, time.monotonic(), False)
+            log_event(logger, logging.INFO, "catalog.refreshed", catalog=self.name, version=self._version,
+                      mode="update", elapsed_ms=(time.perf_counter() - start) * 1000)
+            return
+
+        try:
+            catalog = self.loader()
+            fallback = False
+            self._updates_since_full = 0
+        except Exception as e:
+            log_event(logger, logging.WARNING, "catalog.refresh_failed", catalog=self.name, error=str(e),
+                      keeping_version=previous.version if previous else None)
+            if previous is not None and not previous.fallback:
+                # Keep serving the last good snapshot; try again after another interval
+                self._snapshot = previous._replace(loaded_at=time.monotonic())
+                return
+            if self.fallback is None:
+                raise
+            catalog = self.fallback()
+            fallback = True
+
+        self._version += 1
+        self._snapshot = CatalogSnapshot(catalog, self._version, time.monotonic(), fallback)
+        log_event(logger, logging.INFO, "catalog.refreshed", catalog=self.name, version=self._version,
+                  mode="fallback" if fallback else "full", elapsed_ms=(time.perf_counter() - start) * 1000)
@@ -0,0 +1,178 @@
+# src/parsing/ml/role_matrix.py
+"""
+All-roles scoring as one sparse matrix-vector product.
+
+The catalog is compiled once into a role x canonical-skill incidence
+matrix (CSR, 1 where the role requires the skill). A resume becomes a 0/1
+vector over the same skills; `matrix @ vector` counts every role's
+matched skills at once, and top-k roles come from argpartition instead
+of sorting the whole catalog.
+
+Scores match compute_skill_gap(): distinct matched skills divided by the
+length of the role's required list as stored, times 100.
+
+Delta sync patches single roles with update_role()/remove_role(). Patched
+rows live in a small overlay scored in Python next to the untouched CSR
+base (CSR cannot change its sparsity cheaply); once the overlay grows
+past a threshold it is folded into a fresh base. The base is never
+modified, so copy() only duplicates the row bookkeeping and overlay.
+"""
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# Overlay size that triggers a rebuild of the CSR base
+MAX_OVERRIDES = 512
+
+class _State(NamedTuple):
+    roles: List[str]                 # row -> role name (removed roles keep their row until compaction)
+    role_index: Dict[str, int]
+    matrix: "sparse.csr_matrix"      # base rows only
+    skill_index: Dict[str, int]      # base columns
+    skill_names: List[str]
+    role_sizes: np.ndarray           # base rows only
+    overrides: Dict[int, Optional[Tuple[FrozenSet[str], int]]]  # row -> (skills, size), None if removed
+
+class RoleMatrix:
+    def __init__(self, roles: Sequence[str], role_skills: Sequence[Iterable[str]], role_sizes: Sequence[int]):
+        """
+        `role_skills[i]` are role i's normalized skills; `role_sizes[i]` is the
+        length of its raw required list (the score denominator).
+        """
+        self._state = self._compile(list(roles), role_skills, role_sizes)
+
+    @staticmethod
+    def _compile(roles: List[str], role_skills: Iterable[Iterable[str]], role_sizes: Sequence[int]) -> _State:
+        skill_index: Dict[str, int] = {}
+        indptr, indices = [0], []
+        for skills in role_skills:
+            columns = {skill_index.setdefault(skill, len(skill_index)) for skill in skills}
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(roles), max(len(skill_index), 1)),
+        )
+        return _State(roles, {role: row for row, role in enumerate(roles)}, matrix, skill_index,
+                      list(skill_index), np.asarray(role_sizes, dtype=np.float64), {})
+
+    @classmethod
+    def from_roles(cls, roles_map: Mapping[str, List[str]], normalize: Callable[[str], str]) -> "RoleMatrix":
+        roles = list(roles_map)
+        role_skills = [[base for base in map(normalize, roles_map[role]) if base] for role in roles]
+        return cls(roles, role_skills, [len(roles_map[role]) for role in roles])
+
+    @property
+    def roles(self) -> List[str]:
+        """Live roles in catalog order"""
+        state = self._state
+        return [role for row, role in enumerate(state.roles) if state.overrides.get(row, ()) is not None]
+
+    def __len__(self) -> int:
+        state = self._state
+        return len(state.roles) - sum(entry is None for entry in state.overrides.values())
+
+    def vector(self, skills: Iterable[str]) -> np.ndarray:
+        """0/1 vector over the base skills; skills no base role requires are ignored"""
+        skill_index = self._state.skill_index
+        vector = np.zeros(self._state.matrix.shape[1], dtype=np.float64)
+        columns = [skill_index[skill] for skill in skills if skill in skill_index]
+        vector[columns] = 1.0
+        return vector
+
+    def scores(self, skills: Iterable[str]) -> np.ndarray:
+        """Match percentage for every row, in catalog order (NaN for removed roles)"""
+        state = self._state
+        skills = set(skills)
+        n_base = state.matrix.shape[0]
+        out = np.zeros(len(state.roles), dtype=np.float64)
+
+        columns = [state.skill_index[skill] for skill in skills if skill in state.skill_index]
+        vector = np.zeros(state.matrix.shape[1], dtype=np.float64)
+        vector[columns] = 1.0
+        np.divide(state.matrix @ vector, state.role_sizes, out=out[:n_base], where=state.role_sizes > 0)
+        out[:n_base] *= 100
+
+        for row, entry in state.overrides.items():
+            if row >= len(out):
+                continue  # role appended after this read began
+            if entry is None:
+                out[row] = np.nan
+            else:
+                row_skills, size = entry
+                out[row] = (len(row_skills & skills) / size) * 100 if size else 0.0
+        return out
+
+    def top_k(self, skills: Iterable[str], k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Best `k` roles as (role, score), highest first; ties keep catalog
+        order, as the old stable sort did.
+        """
+        roles = self._state.roles
+        scores = self.scores(skills)
+        live = np.flatnonzero(~np.isnan(scores))
+        if k <= 0 or not len(live):
+            return []
+        live_scores = scores[live]
+        if k < len(live):
+            # Widen the cut to every role tied with the k-th score so ties resolve by catalog order
+            kth = live_scores[np.argpartition(-live_scores, k - 1)[:k]].min()
+            candidates = live[live_scores >= kth]
+        else:
+            candidates = live
+        order = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+        return [(roles[i], float(scores[i])) for i in order]
+
+    def copy(self) -> "RoleMatrix":
+        """Matrix to patch while this one keeps serving; shares the CSR base"""
+        state = self._state
+        matrix = RoleMatrix.__new__(RoleMatrix)
+        matrix._state = state._replace(roles=list(state.roles), role_index=dict(state.role_index),
+                                       overrides=dict(state.overrides))
+        return matrix
+
+    def update_role(self, role: str, skills: Iterable[str], size: int) -> None:
+        """Add `role` or replace its skills (normalized) and score denominator"""
+        state = self._state
+        row = state.role_index.get(role)
+        overrides = dict(state.overrides)
+        if row is None:
+            row = len(state.roles)
+            overrides[row] = (frozenset(skills), size)
+            self._state = state._replace(overrides=overrides)
+            state.roles.append(role)
+            state.role_index[role] = row
+        else:
+            overrides[row] = (frozenset(skills), size)
+            self._state = state._replace(overrides=overrides)
+        self._maybe_compact()
+
+    def remove_role(self, role: str) -> None:
+        state = self._state
+        row = state.role_index.get(role)
+        if row is not None:
+            self._state = state._replace(overrides={**state.overrides, row: None})
+            # Forget the row so a re-added role goes to the end, like a dict re-insert
+            del state.role_index[role]
+            self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if len(self._state.overrides) > MAX_OVERRIDES:
+            self.compact()
+
+    def _row_skills(self, state: _State, row: int) -> Tuple[Iterable[str], int]:
+        if row in state.overrides:
+            return state.overrides[row]
+        matrix = state.matrix
+        columns = matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]
+        return [state.skill_names[column] for column in columns], int(state.role_sizes[row])
+
+    def compact(self) -> None:
+        """Fold the overlay into a new CSR base (drops removed roles)"""
+        state = self._state
+        rows = [row for row in range(len(state.roles)) if state.overrides.get(row, ()) is not None]
+        entries = [self._row_skills(state, row) for row in rows]
+        self._state = self._compile([state.roles[row] for row in rows],
+                                    [skills for skills, _ in entries], [size for _, size in entries])
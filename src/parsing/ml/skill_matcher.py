@@ -1,18 +1,24 @@
 # src/ml/skill_matcher.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-import re
-import pandas as pd
+from typing import Dict, List, Tuple, Optional, Union
+import logging
+import time
 
 # Fix import paths - remove the problematic import
 try:
     from src.parsing import parse_resume
+    from src.parsing.log_events import log_event
+    from src.parsing.ml.skill_normalizer import SkillNormalizer
 except ImportError:
     # Fallback for direct execution
     import sys
     sys.path.append(str(Path(__file__).parent.parent.parent))
     from src.parsing import parse_resume
+    from src.parsing.log_events import log_event
+    from src.parsing.ml.skill_normalizer import SkillNormalizer
+
+logger = logging.getLogger(__name__)
 
 # ----------------------------
 # Paths - FIXED
@@ -47,72 +53,57 @@ SKILL_SYNONYMS = {
     # ... keep the rest of your SKILL_SYNONYMS
 }
 
+_normalizer = SkillNormalizer(SKILL_SYNONYMS)
+
 def normalize_skill_to_base(skill: str) -> str:
     """Normalize skill to base form"""
-    if not skill:
-        return ""
-    
-    skill_lower = skill.lower().strip()
-    skill_lower = re.sub(r'[^\w\s]', '', skill_lower)
-    skill_lower = re.sub(r'\s+', ' ', skill_lower)
-    
-    for base_skill, synonyms in SKILL_SYNONYMS.items():
-        if skill_lower in synonyms or skill_lower == base_skill:
-            return base_skill
-    
-    return skill_lower
+    return _normalizer.normalize(skill)
 
 def debug_skill_matching(resume_skills: List[str], required_skills: List[str]):
-    """Debug function to see skill matching process"""
-    print("=== DEBUG SKILL MATCHING ===")
-    print(f"Original resume skills: {resume_skills}")
-    print(f"Original required skills: {required_skills}")
-    
+    """Debug event showing the skill matching process (only computed when DEBUG is enabled)"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
     normalized_resume = [normalize_skill_to_base(s) for s in resume_skills]
     normalized_required = [normalize_skill_to_base(s) for s in required_skills]
     
-    print(f"Normalized resume: {normalized_resume}")
-    print(f"Normalized required: {normalized_required}")
-    
     matched = set(normalized_resume) & set(normalized_required)
     missing = set(normalized_required) - set(normalized_resume)
     
-    print(f"Matched: {matched}")
-    print(f"Missing: {missing}")
-    print("========================")
+    log_event(logger, logging.DEBUG, "match.debug", resume_skills=resume_skills, required_skills=required_skills,
+              normalized_resume=normalized_resume, normalized_required=normalized_required,
+              matched=sorted(matched), missing=sorted(missing))
 
 # ----------------------------
 # Data loaders - SIMPLIFIED
 # ----------------------------
 def load_skill_dataset(csv_path: Path = DATASET_CSV):
     """Load job roles from CSV file"""
-    print(f"🔍 Looking for CSV at: {csv_path}")
-    
     if csv_path.exists():
         try:
+            import pandas as pd
             df = pd.read_csv(csv_path)
             roles_map = {}
-            print(f" CSV loaded successfully with {len(df)} roles")
             
             for _, row in df.iterrows():
                 role = row['role']
                 #  CORRECT: s comes from row['skills'].split()
                 skills = [s.strip() for s in row['skills'].split(';')]
                 roles_map[role] = skills
-                print(f"   - {role}: {len(skills)} skills")
             
+            log_event(logger, logging.DEBUG, "roles.loaded", source=str(csv_path), roles=len(roles_map))
             return roles_map
             
         except Exception as e:
-            print(f"❌ Error loading CSV: {e}")
+            log_event(logger, logging.WARNING, "roles.load_failed", source=str(csv_path), error=str(e))
             return get_fallback_roles()
     else:
-        print(f" CSV file not found at: {csv_path}")
+        log_event(logger, logging.WARNING, "roles.csv_missing", source=str(csv_path))
         return get_fallback_roles()  # Now returns ALL 20 roles!
 
 def get_fallback_roles():
     """Fallback roles that match your actual app roles"""
-    print(" Using comprehensive fallback dataset")
+    log_event(logger, logging.INFO, "roles.fallback")
     return {
         'Junior Data Scientist': ['Python', 'Pandas', 'Numpy', 'Data Visualization', 'SQL', 'Statistics', 'Scikit-learn', 'EDA', 'Communication'],
         'Senior Data Scientist': ['Machine Learning', 'Deep Learning', 'Big Data', 'Cloud', 'NLP', 'Model Deployment', 'Leadership', 'Advanced Statistics'],
@@ -124,7 +115,7 @@ def get_fallback_roles():
         # Add more roles to match your 20...
     }
 
-def parse_resume_structured(file_path: str) -> Dict[str, List[str]]:
+def parse_resume_structured(file_path: Union[str, bytes]) -> Dict[str, List[str]]:
     """Parse resume and return structured data - FIXED VERSION"""
     try:
         result = parse_resume(file_path)
@@ -144,7 +135,7 @@ def parse_resume_structured(file_path: str) -> Dict[str, List[str]]:
         return {"skills": [], "education": [], "experience": []}
         
     except Exception as e:
-        print(f"Error in parse_resume_structured: {e}")
+        log_event(logger, logging.ERROR, "parse.failed", error=str(e))
         return {"skills": [], "education": [], "experience": []}
 
 def compute_skill_gap(resume_skills: List[str], required_skills: List[str]) -> Dict[str, List[str]]:
@@ -172,15 +163,12 @@ def compute_skill_gap(resume_skills: List[str], required_skills: List[str]) -> D
     
     return {"matched": matched, "missing": missing}
 
-def analyze_resume(file_path: str, chosen_role: Optional[str] = None) -> Dict:
+def analyze_resume(file_path: Union[str, bytes], chosen_role: Optional[str] = None) -> Dict:
     """End-to-end resume analysis with debug info - FIXED VERSION"""
+    start = time.perf_counter()
     roles_map = load_skill_dataset()
     structured = parse_resume_structured(file_path)
-
-    # DEBUG: Show what was parsed
-    print(f"DEBUG: Parsed skills: {structured.get('skills', [])}")
-    print(f"DEBUG: Skills type: {type(structured.get('skills', []))}")
-    print(f"DEBUG: Skills count: {len(structured.get('skills', []))}")
+    log_event(logger, logging.DEBUG, "analyze.parsed", skills=structured.get("skills", []))
     
     skills_list = structured.get("skills", [])
     
@@ -200,13 +188,15 @@ def analyze_resume(file_path: str, chosen_role: Optional[str] = None) -> Dict:
     required = roles_map.get(chosen_role, [])
     
     # DEBUG: Show matching process
-    print(f"DEBUG: Required skills for {chosen_role}: {required}")
     debug_skill_matching(skills_list, required)
     
     gap = compute_skill_gap(skills_list, required)
 
     total = len(required)
     score = (len(gap["matched"]) / total) * 100 if total > 0 else 0.0
+    log_event(logger, logging.INFO, "analyze.completed", role=chosen_role, skills_found=len(skills_list),
+              roles=len(roles_map), matched=len(gap["matched"]), missing=len(gap["missing"]),
+              match_score=score, elapsed_ms=(time.perf_counter() - start) * 1000)
 
     return {
         "parsed": structured,
@@ -1,16 +1,29 @@
 from __future__ import annotations
+import copy
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-import re
+from typing import Any, Dict, Iterable, List, Set, Tuple, Optional, Union
+import logging
+import os
+import time
 
 try:
     from src.parsing import parse_resume
-    from src.database import SkillRepository
+    from src.parsing.log_events import log_event
+    from src.parsing.ml.skill_normalizer import SkillNormalizer, clean_skill
+    from src.parsing.ml.catalog_store import CatalogSnapshot, CatalogStore
+    from src.database import SkillRepository, catalog_cache
 except ImportError:
     import sys
     sys.path.append(str(Path(__file__).parent.parent.parent))
     from src.parsing import parse_resume
-    from src.database import SkillRepository
+    from src.parsing.log_events import log_event
+    from src.parsing.ml.skill_normalizer import SkillNormalizer, clean_skill
+    from src.parsing.ml.catalog_store import CatalogSnapshot, CatalogStore
+    from src.database import SkillRepository, catalog_cache
+
+logger = logging.getLogger(__name__)
 
 PROJ_ROOT = Path(__file__).resolve().parents[3]
 
@@ -45,41 +58,50 @@ def build_skill_synonyms_from_db(skill_repo: SkillRepository) -> Dict[str, List[
     Build skill synonyms mapping from database
     """
     try:
-        all_skills = skill_repo.get_all_skills()
-        synonyms_map = {}
-
-        for skill_record in all_skills:
-            skill_name = skill_record['skill_name'].lower()
-            synonyms = skill_record.get('synonyms', [])
-
-            if isinstance(synonyms, list):
-                synonyms_map[skill_name] = [s.lower() for s in synonyms]
-            else:
-                synonyms_map[skill_name] = [skill_name]
-
-        return {**SKILL_SYNONYMS, **synonyms_map}
+        return {**SKILL_SYNONYMS, **_synonyms_from_rows(skill_repo.get_all_skills())}
 
     except Exception as e:
-        print(f"Warning: Could not load skills from database: {e}")
+        log_event(logger, logging.WARNING, "skills.db_load_failed", error=str(e))
         return SKILL_SYNONYMS
 
-def normalize_skill_to_base(skill: str, synonyms_map: Dict[str, List[str]] = None) -> str:
-    """Normalize skill to base form using database synonyms"""
-    if not skill:
-        return ""
+def _synonyms_from_rows(skill_rows: Iterable[Dict[str, Any]]) -> Dict[str, List[str]]:
+    synonyms_map = {}
+    for skill_record in skill_rows:
+        skill_name = skill_record['skill_name'].lower()
+        synonyms = skill_record.get('synonyms', [])
 
-    if synonyms_map is None:
-        synonyms_map = SKILL_SYNONYMS
+        if isinstance(synonyms, list):
+            synonyms_map[skill_name] = [s.lower() for s in synonyms]
+        else:
+            synonyms_map[skill_name] = [skill_name]
+    return synonyms_map
 
-    skill_lower = skill.lower().strip()
-    skill_lower = re.sub(r'[^\w\s]', '', skill_lower)
-    skill_lower = re.sub(r'\s+', ' ', skill_lower)
+_default_normalizer = SkillNormalizer(SKILL_SYNONYMS)
+_last_normalizer = _default_normalizer
 
-    for base_skill, synonyms in synonyms_map.items():
-        if skill_lower in synonyms or skill_lower == base_skill:
-            return base_skill
+def skill_normalizer(synonyms_map: Dict[str, List[str]] = None) -> SkillNormalizer:
+    """
+    Compiled normalizer for `synonyms_map`. The most recent map's index is
+    reused while callers keep passing the same dict object.
+    """
+    global _last_normalizer
+    if synonyms_map is None or synonyms_map is SKILL_SYNONYMS:
+        return _default_normalizer
+    normalizer = _last_normalizer
+    if normalizer.source is not synonyms_map:
+        normalizer = _last_normalizer = SkillNormalizer(synonyms_map)
+    return normalizer
 
-    return skill_lower
+def normalize_skill_to_base(skill: str, synonyms_map: Dict[str, List[str]] = None) -> str:
+    """Normalize skill to base form using database synonyms"""
+    return skill_normalizer(synonyms_map).normalize(skill)
+
+FALLBACK_ROLES = {
+    'Junior Data Scientist': ['Python', 'Pandas', 'Numpy', 'Data Visualization',
+                            'SQL', 'Statistics', 'Scikit-learn', 'EDA', 'Communication'],
+    'Data Analyst': ['SQL', 'Excel', 'Data Visualization', 'Statistics',
+                   'Reporting', 'Communication'],
+}
 
 def load_skill_dataset_from_db() -> Dict[str, List[str]]:
     """
@@ -89,15 +111,10 @@ def load_skill_dataset_from_db() -> Dict[str, List[str]]:
         skill_repo = SkillRepository()
         return skill_repo.get_all_job_roles()
     except Exception as e:
-        print(f"Warning: Could not load roles from database: {e}")
-        return {
-            'Junior Data Scientist': ['Python', 'Pandas', 'Numpy', 'Data Visualization',
-                                    'SQL', 'Statistics', 'Scikit-learn', 'EDA', 'Communication'],
-            'Data Analyst': ['SQL', 'Excel', 'Data Visualization', 'Statistics',
-                           'Reporting', 'Communication'],
-        }
-
-def parse_resume_structured(file_path: str) -> Dict[str, List[str]]:
+        log_event(logger, logging.WARNING, "roles.db_load_failed", error=str(e))
+        return FALLBACK_ROLES
+
+def parse_resume_structured(file_path: Union[str, bytes]) -> Dict[str, List[str]]:
     """Parse resume and return structured data"""
     try:
         result = parse_resume(file_path)
@@ -116,9 +133,18 @@ def parse_resume_structured(file_path: str) -> Dict[str, List[str]]:
         return {"skills": [], "education": [], "experience": []}
 
     except Exception as e:
-        print(f"Error in parse_resume_structured: {e}")
+        log_event(logger, logging.ERROR, "parse.failed", error=str(e))
         return {"skills": [], "education": [], "experience": []}
 
+def _normalize_skills(skills: Iterable[str], normalizer: SkillNormalizer) -> Dict[str, str]:
+    """Normalized base skill -> skill as written (a later duplicate wins)"""
+    normalized = {}
+    for skill in skills:
+        base = normalizer.normalize(skill)
+        if base:
+            normalized[base] = skill
+    return normalized
+
 def compute_skill_gap(
     resume_skills: List[str],
     required_skills: List[str],
@@ -126,75 +152,332 @@ def compute_skill_gap(
 ) -> Dict[str, List[str]]:
     """Compute skill gap with proper normalization"""
     if synonyms_map is None:
-        try:
-            skill_repo = SkillRepository()
-            synonyms_map = build_skill_synonyms_from_db(skill_repo)
-        except:
-            synonyms_map = SKILL_SYNONYMS
+        normalizer = load_role_catalog().normalizer
+    else:
+        normalizer = skill_normalizer(synonyms_map)
+    normalized_resume = set(_normalize_skills(resume_skills, normalizer))
+    return _gap(normalized_resume, _normalize_skills(required_skills, normalizer))
+
+def _gap(normalized_resume: set, skill_mapping: Dict[str, str]) -> Dict[str, List[str]]:
+    normalized_required = skill_mapping.keys()
+    matched = [skill_mapping[skill] for skill in normalized_required & normalized_resume]
+    missing = [skill_mapping[skill] for skill in normalized_required - normalized_resume]
+    return {"matched": matched, "missing": missing}
 
-    normalized_resume = set()
-    for skill in resume_skills:
-        normalized = normalize_skill_to_base(skill, synonyms_map)
-        if normalized:
-            normalized_resume.add(normalized)
+@dataclass(frozen=True)
+class ParsedResume:
+    """
+    Output of the expensive stage (extract + parse). Immutable, so apps can
+    keep it for the session and re-score it against any role.
+    """
+    skills: Tuple[str, ...] = ()
+    education: Tuple[str, ...] = ()
+    experience: Tuple[str, ...] = ()
 
-    skill_mapping = {}
-    normalized_required = set()
+    @classmethod
+    def from_dict(cls, structured: Dict[str, List[str]]) -> "ParsedResume":
+        return cls(tuple(structured.get("skills", [])), tuple(structured.get("education", [])),
+                   tuple(structured.get("experience", [])))
 
-    for skill in required_skills:
-        normalized = normalize_skill_to_base(skill, synonyms_map)
-        if normalized:
-            normalized_required.add(normalized)
-            skill_mapping[normalized] = skill
+    def as_dict(self) -> Dict[str, List[str]]:
+        return {"skills": list(self.skills), "education": list(self.education), "experience": list(self.experience)}
 
-    matched_normalized = normalized_resume & normalized_required
-    missing_normalized = normalized_required - normalized_resume
+    def with_skills(self, skills: Iterable[str]) -> "ParsedResume":
+        return replace(self, skills=tuple(skills))
 
-    matched = [skill_mapping[skill] for skill in matched_normalized]
-    missing = [skill_mapping[skill] for skill in missing_normalized]
+    def add_skill(self, skill: str) -> "ParsedResume":
+        if skill in self.skills:
+            return self
+        return self.with_skills(self.skills + (skill,))
 
-    return {"matched": matched, "missing": missing}
+    def remove_skill(self, skill: str) -> "ParsedResume":
+        wanted = skill.lower().strip()
+        return self.with_skills(s for s in self.skills if s.lower().strip() != wanted)
 
-def analyze_resume(file_path: str, chosen_role: Optional[str] = None) -> Dict:
+@dataclass
+class RoleCatalog:
     """
-    End-to-end resume analysis with database integration
+    Roles and synonyms loaded once; each role's required skills are
+    normalized up front, and all-roles ranking goes through a sparse
+    RoleMatrix built on first use. apply_delta() patches it in place, so
+    a catalog that readers may hold is only ever patched through copy().
     """
-    roles_map = load_skill_dataset_from_db()
-    structured = parse_resume_structured(file_path)
+    roles: Dict[str, List[str]]
+    synonyms: Dict[str, List[str]]
+    required: Dict[str, Dict[str, str]] = field(default_factory=dict, repr=False)
+    normalizer: Optional[SkillNormalizer] = field(default=None, repr=False)
+    # Newest updated_at / last_updated / deleted_at seen per table, and each
+    # row's own timestamp (to tell a tombstone from a later re-insert)
+    watermarks: Dict[str, datetime] = field(default_factory=dict)
+    row_stamps: Dict[str, Dict[str, datetime]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        if self.normalizer is None:
+            self.normalizer = skill_normalizer(self.synonyms)
+        if not self.required:
+            self.required = {role: _normalize_skills(skills, self.normalizer) for role, skills in self.roles.items()}
+        self._matrix = None
+        # Cleaned spelling -> roles requiring it, to find the roles a synonym change affects
+        self._spelling_roles: Dict[str, Set[str]] = {}
+        for role, skills in self.roles.items():
+            self._index_role(role, skills)
+
+    def _index_role(self, role: str, skills: Iterable[str], add: bool = True) -> None:
+        for skill in skills:
+            spelling = clean_skill(skill)
+            if add:
+                self._spelling_roles.setdefault(spelling, set()).add(role)
+            elif spelling in self._spelling_roles:
+                self._spelling_roles[spelling].discard(role)
+
+    @property
+    def matrix(self) -> "RoleMatrix":
+        if self._matrix is None:
+            # scipy is only imported once something is actually scored
+            from src.parsing.ml.role_matrix import RoleMatrix
+            roles = list(self.roles)
+            self._matrix = RoleMatrix(roles, [self.required[role] for role in roles],
+                                      [len(self.roles[role]) for role in roles])
+        return self._matrix
+
+    def copy(self) -> "RoleCatalog":
+        """
+        Independent catalog for apply_delta(). Cheap next to a full load:
+        containers are copied shallowly, skill lists are shared (they are
+        replaced, never edited), and the matrix copy keeps its CSR base.
+        """
+        clone = copy.copy(self)  # skips __post_init__
+        clone.roles = dict(self.roles)
+        clone.synonyms = dict(self.synonyms)
+        clone.required = dict(self.required)
+        clone.normalizer = self.normalizer.copy(clone.synonyms)
+        clone.watermarks = dict(self.watermarks)
+        clone.row_stamps = {table: dict(stamps) for table, stamps in self.row_stamps.items()}
+        clone._matrix = None if self._matrix is None else self._matrix.copy()
+        clone._spelling_roles = {spelling: set(roles) for spelling, roles in self._spelling_roles.items()}
+        return clone
+
+    def apply_delta(self, role_changes: Dict[str, Optional[List[str]]],
+                    skill_changes: Dict[str, Optional[List[str]]]) -> Dict[str, int]:
+        """
+        Patch the catalog for {role: required skills | None} and
+        {canonical: synonyms | None} (None removes). Only the changed
+        roles, and roles using a spelling whose canonical changed, are
+        re-normalized and re-scored in the matrix.
+        """
+        # Normalizer first: its patchable index is built from the unpatched map
+        changed_spellings = self.normalizer.update(skill_changes) if skill_changes else set()
+        for skill, synonyms in skill_changes.items():
+            if synonyms is None:
+                self.synonyms.pop(skill, None)
+            else:
+                self.synonyms[skill] = synonyms
+
+        affected = set(role_changes)
+        for spelling in changed_spellings:
+            affected.update(self._spelling_roles.get(spelling, ()))
+
+        for role in affected:
+            old_skills = self.roles.get(role)
+            new_skills = role_changes[role] if role in role_changes else old_skills
+            if old_skills is not None and new_skills is not old_skills:
+                self._index_role(role, old_skills, add=False)
+            if new_skills is None:
+                self.roles.pop(role, None)
+                self.required.pop(role, None)
+                if self._matrix is not None:
+                    self._matrix.remove_role(role)
+                continue
+            if new_skills is not old_skills:
+                self._index_role(role, new_skills)
+            self.roles[role] = new_skills
+            self.required[role] = _normalize_skills(new_skills, self.normalizer)
+            if self._matrix is not None:
+                self._matrix.update_role(role, self.required[role], len(new_skills))
+
+        return {"roles_changed": len(role_changes), "skills_changed": len(skill_changes),
+                "spellings_remapped": len(changed_spellings), "roles_rescored": len(affected)}
+
+# Re-read this much before each watermark: a row committed late can carry
+# an updated_at slightly older than rows already seen
+SYNC_OVERLAP = timedelta(seconds=int(os.getenv("CATALOG_SYNC_OVERLAP_SECONDS", "120")))
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def _newest(rows: Iterable[Dict[str, Any]], column: str, current: Optional[datetime] = None) -> Optional[datetime]:
+    for row in rows:
+        stamp = _timestamp(row.get(column))
+        if stamp is not None and (current is None or stamp > current):
+            current = stamp
+    return current
+
+def fetch_role_catalog_from_db() -> RoleCatalog:
+    """
+    One full catalog load (roles + synonyms), with the role matrix built
+    here so no request ever pays for it. Reads straight from the database,
+    not the query cache, so each reload sees current rows. Raises if a read
+    fails or no roles come back, so the catalog store keeps its previous
+    snapshot.
+    """
+    skill_repo = SkillRepository()
+    role_rows = skill_repo.fetch_all_job_role_rows()
+    if not role_rows:
+        raise RuntimeError("no job roles returned from the database")
+    skill_rows = skill_repo.fetch_all_skill_rows()
+
+    # Fresh containers for apply_delta() to patch
+    roles_map = {row.get("role_name"): row.get("required_skills") or [] for row in role_rows}
+    catalog = RoleCatalog(roles_map, {**SKILL_SYNONYMS, **_synonyms_from_rows(skill_rows)})
+    roles_mark = _newest(role_rows, "updated_at") or _EPOCH
+    skills_mark = _newest(skill_rows, "last_updated") or _EPOCH
+    # Anything deleted after the older of the two reads may be missing from them
+    catalog.watermarks = {"job_roles": roles_mark, "skills_database": skills_mark,
+                          "catalog_deletions": min(roles_mark, skills_mark)}
+    catalog.row_stamps = {
+        "job_roles": {row.get("role_name"): _timestamp(row.get("updated_at")) or _EPOCH for row in role_rows},
+        "skills_database": {row['skill_name'].lower(): _timestamp(row.get("last_updated")) or _EPOCH for row in skill_rows},
+    }
+    catalog.matrix
+    catalog.normalizer.prepare_updates()
+    return catalog
+
+def sync_role_catalog(catalog: RoleCatalog, skill_repo: Optional[SkillRepository] = None) -> RoleCatalog:
+    """
+    Delta sync: fetch only the job_roles / skills_database rows changed (or
+    deleted) since the catalog's watermarks and return a patched copy; the
+    catalog passed in, which requests may be scoring against, is left
+    untouched. Cost follows the number of changed rows, not the catalog
+    size. A renamed row arrives as its new name plus a tombstone for the
+    old one. Raises on query errors; the caller then falls back to a full
+    load.
+    """
+    start = time.perf_counter()
+    skill_repo = skill_repo or SkillRepository()
+    marks = catalog.watermarks
+
+    def since(table: str) -> str:
+        return ((marks.get(table) or _EPOCH) - SYNC_OVERLAP).isoformat()
+
+    role_rows = skill_repo.get_job_roles_changed_since(since("job_roles"))
+    skill_rows = skill_repo.get_skills_changed_since(since("skills_database"))
+    deletions = skill_repo.get_catalog_deletions_since(since("catalog_deletions"))
+
+    catalog = catalog.copy()
+    role_stamps = catalog.row_stamps.setdefault("job_roles", {})
+    skill_stamps = catalog.row_stamps.setdefault("skills_database", {})
+
+    # Upserts, skipping rows the overlap window re-read unchanged
+    role_changes: Dict[str, Optional[List[str]]] = {}
+    for row in role_rows:
+        name, skills = row.get("role_name"), row.get("required_skills") or []
+        role_stamps[name] = _timestamp(row.get("updated_at")) or _EPOCH
+        if catalog.roles.get(name) != skills:
+            role_changes[name] = skills
+    skill_changes: Dict[str, Optional[List[str]]] = {}
+    for name, synonyms in _synonyms_from_rows(skill_rows).items():
+        if catalog.synonyms.get(name) != synonyms:
+            skill_changes[name] = synonyms
+    for row in skill_rows:
+        skill_stamps[row['skill_name'].lower()] = _timestamp(row.get("last_updated")) or _EPOCH
+
+    # Deletions, unless the row was (re-)written after the tombstone
+    for row in deletions:
+        deleted_at = _timestamp(row.get("deleted_at")) or _EPOCH
+        name = row.get("row_name")
+        if row.get("table_name") == "job_roles":
+            if name in role_stamps and role_stamps[name] < deleted_at:
+                del role_stamps[name]
+                role_changes[name] = None
+        elif row.get("table_name") == "skills_database":
+            name = (name or "").lower()
+            if name in skill_stamps and skill_stamps[name] < deleted_at:
+                del skill_stamps[name]
+                # A deleted DB skill falls back to the built-in synonyms, if any
+                restored = SKILL_SYNONYMS.get(name)
+                if catalog.synonyms.get(name) != restored:
+                    skill_changes[name] = restored
+
+    applied = catalog.apply_delta(role_changes, skill_changes)
+    catalog.watermarks = {
+        "job_roles": _newest(role_rows, "updated_at", marks.get("job_roles")),
+        "skills_database": _newest(skill_rows, "last_updated", marks.get("skills_database")),
+        "catalog_deletions": _newest(deletions, "deleted_at", marks.get("catalog_deletions")),
+    }
+    log_event(logger, logging.INFO, "catalog.delta_applied", rows=len(role_rows) + len(skill_rows) + len(deletions),
+              **applied, elapsed_ms=(time.perf_counter() - start) * 1000)
+    return catalog
 
-    print(f"DEBUG: Parsed skills: {structured.get('skills', [])}")
+def _fallback_catalog() -> RoleCatalog:
+    return RoleCatalog(FALLBACK_ROLES, SKILL_SYNONYMS)
 
-    skills_list = structured.get("skills", [])
+_catalog_store = CatalogStore(fetch_role_catalog_from_db, fallback=_fallback_catalog,
+                              updater=sync_role_catalog, name="role_catalog")
 
-    try:
-        skill_repo = SkillRepository()
-        synonyms_map = build_skill_synonyms_from_db(skill_repo)
-    except:
-        synonyms_map = SKILL_SYNONYMS
+def load_role_catalog() -> RoleCatalog:
+    """
+    Current process-wide catalog snapshot. No database round-trip once the
+    first load is done; stale snapshots are reloaded in the background.
+    """
+    return _catalog_store.get()
 
-    predictions = []
-    for role, required_skills in roles_map.items():
-        gap_result = compute_skill_gap(skills_list, required_skills, synonyms_map)
-        match_score = (len(gap_result["matched"]) / len(required_skills)) * 100 if required_skills else 0
-        predictions.append((role, match_score))
+def warm_role_catalog() -> None:
+    """Start loading the catalog in the background (call at app startup)"""
+    _catalog_store.warm()
 
-    predictions.sort(key=lambda x: x[1], reverse=True)
+def refresh_role_catalog() -> CatalogSnapshot:
+    """Reload the catalog now, e.g. after editing roles or skills"""
+    catalog_cache.invalidate()
+    return _catalog_store.refresh(full=True)
 
-    if chosen_role is None:
-        chosen_role = predictions[0][0] if predictions else next(iter(roles_map.keys()))
+def parse_resume_for_scoring(file_path: Union[str, bytes]) -> ParsedResume:
+    """Expensive stage: extract and parse the file once"""
+    return ParsedResume.from_dict(parse_resume_structured(file_path))
+
+def score_resume(parsed: ParsedResume, catalog: RoleCatalog, chosen_role: Optional[str] = None) -> Dict:
+    """
+    Cheap stage: rank every role and compute the gap for `chosen_role`
+    (the best match when None). Returns the same shape as analyze_resume().
+    """
+    normalized_resume = set(_normalize_skills(parsed.skills, catalog.normalizer))
 
-    required = roles_map.get(chosen_role, [])
+    predictions = catalog.matrix.top_k(normalized_resume, 3)
 
-    gap = compute_skill_gap(skills_list, required, synonyms_map)
+    if chosen_role is None:
+        chosen_role = predictions[0][0] if predictions else next(iter(catalog.roles.keys()))
+
+    required = catalog.roles.get(chosen_role, [])
+    gap = _gap(normalized_resume, catalog.required.get(chosen_role, {}))
 
     total = len(required)
-    score = (len(gap["matched"]) / total) * 100 if total > 0 else 0.0
+    match_score = (len(gap["matched"]) / total) * 100 if total > 0 else 0.0
 
     return {
-        "parsed": structured,
-        "predictions": predictions[:3],
+        "parsed": parsed.as_dict(),
+        "predictions": predictions,
         "chosen_role": chosen_role,
         "required_skills": required,
         "gap": gap,
-        "match_score": score
+        "match_score": match_score
     }
+
+def analyze_resume(file_path: Union[str, bytes], chosen_role: Optional[str] = None) -> Dict:
+    """
+    End-to-end resume analysis with database integration. Apps that
+    re-score the same file should call parse_resume_for_scoring() once and
+    score_resume() per role instead.
+    """
+    start = time.perf_counter()
+    catalog = load_role_catalog()
+    parsed = parse_resume_for_scoring(file_path)
+    log_event(logger, logging.DEBUG, "analyze.parsed", skills=list(parsed.skills))
+
+    result = score_resume(parsed, catalog, chosen_role)
+    log_event(logger, logging.INFO, "analyze.completed", role=result["chosen_role"], skills_found=len(parsed.skills),
+              roles=len(catalog.roles), matched=len(result["gap"]["matched"]),
+              missing=len(result["gap"]["missing"]), match_score=result["match_score"],
+              elapsed_ms=(time.perf_counter() - start) * 1000)
+    return result
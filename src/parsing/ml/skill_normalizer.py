@@ -0,0 +1,180 @@
+# src/parsing/ml/skill_normalizer.py
+"""
+Skill normalization through an inverted synonym index.
+
+    normalizer = SkillNormalizer(SKILL_SYNONYMS)
+    normalizer("Python3")  # 'python'
+
+The {canonical: [synonyms]} map is inverted once into {spelling: canonical},
+so a lookup is one dict probe instead of a walk over the whole taxonomy.
+Results are memoized per raw string (bounded LRU). rebuild() compiles a
+new index and memo and swaps them in with a single assignment, so
+concurrent readers see either the old or the new taxonomy, never a mix.
+update() patches only the spellings of the canonicals that changed (delta
+catalog sync) and reports which spellings now resolve differently; delta
+sync patches a copy() so the normalizer in use never changes.
+"""
+import bisect
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+DEFAULT_CACHE_SIZE = 8192
+
+def clean_skill(skill: str) -> str:
+    """Lowercase, drop punctuation, collapse whitespace ("Node.js " -> "nodejs")"""
+    return _SPACES.sub(" ", _NON_WORD.sub("", skill.lower().strip()))
+
+def build_index(synonyms_map: Mapping[str, Iterable[str]]) -> Dict[str, str]:
+    """
+    {spelling: canonical}. Same precedence as the old linear scan: the
+    first canonical (in map order) that lists a spelling, or is named by
+    it, wins.
+    """
+    index: Dict[str, str] = {}
+    for base_skill, synonyms in synonyms_map.items():
+        index.setdefault(base_skill, base_skill)
+        for synonym in synonyms or ():
+            index.setdefault(synonym, base_skill)
+    return index
+
+class SynonymIndex:
+    """
+    build_index() that can be patched: every spelling keeps the list of
+    canonicals claiming it, ordered by map position, so removing or adding
+    one canonical re-resolves only its own spellings. Canonicals added by
+    update() rank after all existing ones.
+    """
+
+    def __init__(self, synonyms_map: Mapping[str, Iterable[str]]):
+        self.index: Dict[str, str] = {}
+        self._position: Dict[str, int] = {}
+        self._next_position = 0
+        self._spellings: Dict[str, tuple] = {}
+        self._claims: Dict[str, List[tuple]] = {}  # spelling -> [(position, canonical)]
+        for base_skill, synonyms in synonyms_map.items():
+            self._add(base_skill, synonyms)
+        self.index = {spelling: claims[0][1] for spelling, claims in self._claims.items()}
+
+    def _add(self, base_skill: str, synonyms: Iterable[str]) -> tuple:
+        position = self._position.get(base_skill)
+        if position is None:
+            position = self._position[base_skill] = self._next_position
+            self._next_position += 1
+        spellings = tuple(dict.fromkeys((base_skill, *(synonyms or ()))))
+        self._spellings[base_skill] = spellings
+        for spelling in spellings:
+            bisect.insort(self._claims.setdefault(spelling, []), (position, base_skill))
+        return spellings
+
+    def copy(self) -> "SynonymIndex":
+        clone = SynonymIndex.__new__(SynonymIndex)
+        clone.index = dict(self.index)
+        clone._position = dict(self._position)
+        clone._next_position = self._next_position
+        clone._spellings = dict(self._spellings)
+        clone._claims = {spelling: list(claims) for spelling, claims in self._claims.items()}
+        return clone
+
+    def update(self, changes: Mapping[str, Optional[Iterable[str]]]) -> Set[str]:
+        """
+        Apply {canonical: synonyms, or None to remove it} and return the
+        spellings whose canonical changed.
+        """
+        touched: Set[str] = set()
+        for base_skill, synonyms in changes.items():
+            for spelling in self._spellings.pop(base_skill, ()):
+                claims = self._claims[spelling]
+                claims.remove((self._position[base_skill], base_skill))
+                if not claims:
+                    del self._claims[spelling]
+                touched.add(spelling)
+            if synonyms is None:
+                self._position.pop(base_skill, None)
+            else:
+                touched.update(self._add(base_skill, synonyms))
+
+        changed = set()
+        for spelling in touched:
+            claims = self._claims.get(spelling)
+            winner = claims[0][1] if claims else None
+            if self.index.get(spelling) != winner:
+                changed.add(spelling)
+                if winner is None:
+                    del self.index[spelling]
+                else:
+                    self.index[spelling] = winner
+        return changed
+
+class SkillNormalizer:
+    """Compiled synonym -> canonical lookup with a bounded memo"""
+
+    def __init__(self, synonyms_map: Mapping[str, Iterable[str]], cache_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.rebuild(synonyms_map)
+
+    def _compile(self, index: Dict[str, str]) -> Callable[[str], str]:
+        @lru_cache(maxsize=self.cache_size)
+        def lookup(skill: str) -> str:
+            cleaned = clean_skill(skill)
+            return index.get(cleaned, cleaned)
+
+        lookup.index = index
+        return lookup
+
+    def rebuild(self, synonyms_map: Mapping[str, Iterable[str]]) -> None:
+        """Compile `synonyms_map` off to the side, then swap it in atomically"""
+        self._synonym_index = None
+        self._state = (synonyms_map, self._compile(build_index(synonyms_map)))
+
+    def prepare_updates(self) -> None:
+        """Build the patchable index now (off the request path) instead of on the first update()"""
+        if self._synonym_index is None:
+            self._synonym_index = SynonymIndex(self._state[0])
+
+    def copy(self, source: Optional[Mapping[str, Iterable[str]]] = None) -> "SkillNormalizer":
+        """
+        Normalizer to update() while this one keeps serving. It shares the
+        compiled lookup until its first update; `source` replaces the map
+        it was built from (pass the copy the caller is going to patch).
+        """
+        clone = SkillNormalizer.__new__(SkillNormalizer)
+        clone.cache_size = self.cache_size
+        clone._synonym_index = None if self._synonym_index is None else self._synonym_index.copy()
+        clone._state = (self._state[0] if source is None else source, self._state[1])
+        return clone
+
+    def update(self, changes: Mapping[str, Optional[Iterable[str]]]) -> Set[str]:
+        """
+        Patch the index for {canonical: synonyms | None} (see SynonymIndex)
+        and start a fresh memo; returns the spellings that now resolve
+        differently. The first update builds the patchable index once, from
+        `source`, so patch the source map only after calling this.
+        """
+        source = self._state[0]
+        self.prepare_updates()
+        changed = self._synonym_index.update(changes)
+        # Patched in place: readers see each spelling either before or after
+        self._state = (source, self._compile(self._synonym_index.index))
+        return changed
+
+    @property
+    def source(self) -> Mapping[str, Iterable[str]]:
+        """The synonyms map the current index was built from"""
+        return self._state[0]
+
+    def __len__(self) -> int:
+        return len(self._state[1].index)
+
+    def normalize(self, skill: str) -> str:
+        if not skill:
+            return ""
+        return self._state[1](skill)
+
+    __call__ = normalize
+
+    def cache_info(self):
+        return self._state[1].cache_info()
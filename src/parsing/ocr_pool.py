@@ -0,0 +1,124 @@
+# src/parsing/ocr_pool.py
+"""
+Parallel per-page OCR.
+
+Pages are sent to one process-wide pool so concurrent uploads share the same
+workers instead of each starting their own. Every worker runs tesseract with
+OMP_THREAD_LIMIT=1, so the total number of tesseract threads on the machine
+never exceeds the pool size.
+"""
+import atexit
+import importlib.util
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, NamedTuple, Optional, Sequence
+from .log_events import log_event
+
+logger = logging.getLogger(__name__)
+
+# Pool size: OCR_MAX_WORKERS env var, or half the cores (tesseract is CPU bound
+# and the Streamlit server still needs room to run)
+DEFAULT_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", "0")) or max(1, (os.cpu_count() or 2) // 2)
+
+def ocr_dependencies_available() -> bool:
+    """True if pytesseract, Pillow and pypdfium2 (page rendering) are installed, checked without importing them"""
+    return all(importlib.util.find_spec(module) for module in ("pytesseract", "PIL", "pypdfium2"))
+
+class OcrPage(NamedTuple):
+    page_number: int  # 1-based
+    text: str
+    elapsed_ms: float
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = DEFAULT_MAX_WORKERS
+_pool_lock = threading.Lock()
+
+def _init_worker(tesseract_cmd: Optional[str]) -> None:
+    """Runs once in every worker process"""
+    # One thread per tesseract call; parallelism comes from the pool
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    if tesseract_cmd:
+        import pytesseract
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+def _ocr_page(page_number: int, image, config: str) -> OcrPage:
+    import pytesseract
+    start = time.perf_counter()
+    text = pytesseract.image_to_string(image, config=config)
+    return OcrPage(page_number, text, (time.perf_counter() - start) * 1000)
+
+def configure_ocr_pool(max_workers: int) -> None:
+    """Resize the shared OCR pool (takes effect on the next OCR call)"""
+    global _pool_workers
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    with _pool_lock:
+        _pool_workers = max_workers
+        _shutdown_locked()
+
+def shutdown_ocr_pool() -> None:
+    with _pool_lock:
+        _shutdown_locked()
+
+def _shutdown_locked() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import pytesseract
+            # spawn: forking a threaded Streamlit server is not safe
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(pytesseract.pytesseract.tesseract_cmd,),
+            )
+        return _pool
+
+atexit.register(shutdown_ocr_pool)
+
+def ocr_images(images: Sequence, config: str = "", page_numbers: Optional[Sequence[int]] = None) -> List[OcrPage]:
+    """
+    OCR rendered pages in parallel and return the results in page order.
+
+    Args:
+        images: PIL images, one per page
+        config: extra tesseract options (e.g. '--psm 6')
+        page_numbers: 1-based page numbers of `images` (defaults to 1..n)
+    """
+    if page_numbers is None:
+        page_numbers = range(1, len(images) + 1)
+    jobs = list(zip(page_numbers, images))
+
+    if jobs:
+        try:
+            pool = _get_pool()
+            futures = [pool.submit(_ocr_page, number, image, config) for number, image in jobs]
+            pages = [future.result() for future in futures]
+            _report(pages)
+            return pages
+        except (BrokenProcessPool, OSError) as e:
+            log_event(logger, logging.WARNING, "ocr.pool_unavailable", error=str(e))
+            shutdown_ocr_pool()
+
+    pages = [_ocr_page(number, image, config) for number, image in jobs]
+    _report(pages)
+    return pages
+
+def _report(pages: List[OcrPage]) -> None:
+    for page in pages:
+        log_event(logger, logging.DEBUG, "ocr.page", page=page.page_number, chars=len(page.text.strip()),
+                  elapsed_ms=page.elapsed_ms)
+    log_event(logger, logging.INFO, "ocr.completed", pages=len(pages),
+              chars=sum(len(page.text.strip()) for page in pages),
+              elapsed_ms=sum(page.elapsed_ms for page in pages))
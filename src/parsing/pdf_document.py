@@ -0,0 +1,200 @@
+# src/parsing/pdf_document.py
+import hashlib
+import io
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+from .extraction_cache import file_sha256
+from .sources import FileSource, is_bytes_source, to_bytes
+
+# A table as returned by pdfplumber: rows of cells, cells may be None
+Table = List[List[Optional[str]]]
+
+# PDFium is not thread-safe; every pypdfium2 call in the process goes through this lock
+PDFIUM_LOCK = threading.Lock()
+
+# Resolution used when rasterizing pages for OCR
+RENDER_DPI = 200
+
+class PdfDocument:
+    """
+    PDF session opened once per upload and shared by every extraction stage.
+
+    pdfplumber parses each page lazily and caches the layout objects on the
+    page, so text and table extraction from the same session reuse one parse.
+
+    The source is either a path or the upload's bytes; with bytes nothing is
+    written to disk (`path` is None and engines read `data`).
+    """
+
+    def __init__(self, pdf_path: FileSource, sha256: Optional[str] = None, name: Optional[str] = None):
+        if is_bytes_source(pdf_path):
+            self.path: Optional[Path] = None
+            self.data: Optional[bytes] = to_bytes(pdf_path)
+            self._name = name or "upload.pdf"
+        else:
+            self.path = Path(pdf_path)
+            self.data = None
+            self._name = name or self.path.name
+            if not self.path.exists():
+                raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+
+        # Full-document text produced by each engine (engine name -> text)
+        self.text_layers: Dict[str, Optional[str]] = {}
+        # Engine whose text was accepted by the extractor
+        self.engine: Optional[str] = None
+
+        self._closed = False
+        self._pdf = None
+        self._pdfium = None
+        self._pdfium_texts: Optional[List[str]] = None
+        self._sha256 = sha256
+        self._page_texts: Optional[List[str]] = None
+        self._tables: Optional[List[List[Table]]] = None
+
+    def __str__(self) -> str:
+        return str(self.path) if self.path else self._name
+
+    def __enter__(self) -> "PdfDocument":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def size(self) -> int:
+        return len(self.data) if self.data is not None else self.path.stat().st_size
+
+    @property
+    def sha256(self) -> str:
+        """Digest of the file bytes (cache key)"""
+        if self._sha256 is None:
+            if self.data is not None:
+                self._sha256 = hashlib.sha256(self.data).hexdigest()
+            else:
+                self._sha256 = file_sha256(self.path)
+        return self._sha256
+
+    def open_stream(self) -> BinaryIO:
+        """A fresh binary stream over the PDF bytes (caller closes it)"""
+        if self.data is not None:
+            return io.BytesIO(self.data)
+        return open(self.path, "rb")
+
+    @property
+    def pdf(self):
+        """pdfplumber handle, opened on first use"""
+        if self._pdf is None:
+            self._check_open()
+            import pdfplumber
+            self._pdf = pdfplumber.open(self.path if self.data is None else io.BytesIO(self.data))
+        return self._pdf
+
+    @property
+    def pdfium(self):
+        """pypdfium2 handle, opened on first use (caller holds PDFIUM_LOCK)"""
+        if self._pdfium is None:
+            self._check_open()
+            import pypdfium2
+            self._pdfium = pypdfium2.PdfDocument(self.data if self.data is not None else str(self.path))
+        return self._pdfium
+
+    def _check_open(self) -> None:
+        # A handle opened after close() would never be closed
+        if self._closed:
+            raise ValueError(f"PDF session for {self} is closed")
+
+    @property
+    def pdfium_page_texts(self) -> List[str]:
+        """PDFium text layer of every page, extracted in-process"""
+        return self.extract_pdfium_page_texts()
+
+    def extract_pdfium_page_texts(self, cancelled: Optional[Callable[[], bool]] = None) -> Optional[List[str]]:
+        """pdfium_page_texts, checking `cancelled` before each page (None once it returns True)"""
+        if self._pdfium_texts is None:
+            texts = []
+            with PDFIUM_LOCK:
+                for index in range(len(self.pdfium)):
+                    if cancelled is not None and cancelled():
+                        return None
+                    page = self.pdfium[index]
+                    textpage = page.get_textpage()
+                    texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                    textpage.close()
+                    page.close()
+            self._pdfium_texts = texts
+        return self._pdfium_texts
+
+    def render_pages(self, page_numbers: Optional[List[int]] = None, dpi: int = RENDER_DPI) -> list:
+        """
+        Rasterize pages (1-based; default all) to PIL images with PDFium,
+        in-process and without intermediate image files
+        """
+        images = []
+        with PDFIUM_LOCK:
+            numbers = page_numbers or range(1, len(self.pdfium) + 1)
+            for number in numbers:
+                page = self.pdfium[number - 1]
+                images.append(page.render(scale=dpi / 72).to_pil())
+                page.close()
+        return images
+
+    @property
+    def pages(self) -> list:
+        return self.pdf.pages
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def page_texts(self) -> List[str]:
+        """pdfplumber text layer of every page ('' for pages without text)"""
+        if self._page_texts is None:
+            self._page_texts = [page.extract_text() or "" for page in self.pages]
+        return self._page_texts
+
+    @property
+    def page_tables(self) -> List[List[Table]]:
+        """Table candidates of every page"""
+        if self._tables is None:
+            self._tables = [page.extract_tables() for page in self.pages]
+        return self._tables
+
+    @property
+    def tables(self) -> List[Table]:
+        """Table candidates of the whole document, in page order"""
+        return [table for tables in self.page_tables for table in tables]
+
+    def close(self) -> None:
+        self._closed = True
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        if self._pdfium is not None:
+            with PDFIUM_LOCK:
+                self._pdfium.close()
+            self._pdfium = None
+
+PdfSource = Union[FileSource, PdfDocument]
+
+@contextmanager
+def open_pdf_document(source: PdfSource) -> Iterator[PdfDocument]:
+    """
+    Yield a PdfDocument for `source`. An existing session is passed through
+    untouched; a path or bytes are opened here and closed on exit.
+    """
+    if isinstance(source, PdfDocument):
+        yield source
+        return
+
+    document = PdfDocument(source)
+    try:
+        yield document
+    finally:
+        document.close()
@@ -1,141 +1,138 @@
 # src/parsing/pdf_parser_final.py
 import subprocess
+import logging
 import os
-import tempfile
-from pathlib import Path
+import time
 from typing import Optional
+from .pdf_document import PdfDocument, PdfSource, open_pdf_document
+from .ocr_pool import ocr_dependencies_available, ocr_images
+from .log_events import log_event
 
-try:
-    import pytesseract
-    from pdf2image import convert_from_path
-    from PIL import Image
-    OCR_AVAILABLE = True
+logger = logging.getLogger(__name__)
+
+OCR_AVAILABLE = ocr_dependencies_available()
+if not OCR_AVAILABLE:
+    log_event(logger, logging.WARNING, "ocr.unavailable", install="pip install pytesseract pillow")
+
+# Auto-detect Tesseract path
+def find_tesseract_path():
+    possible_paths = [
+        r"C:\Program Files\Tesseract-OCR\tesseract.exe",
+        r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
+        os.path.expanduser(r"~\AppData\Local\Tesseract-OCR\tesseract.exe")
+    ]
     
-    # Auto-detect Tesseract path
-    def find_tesseract_path():
-        possible_paths = [
-            r"C:\Program Files\Tesseract-OCR\tesseract.exe",
-            r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
-            os.path.expanduser(r"~\AppData\Local\Tesseract-OCR\tesseract.exe")
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-        
-        # Try to find in PATH
-        try:
-            subprocess.run(['tesseract', '--version'], capture_output=True, check=True)
-            return 'tesseract'  # Use from PATH
-        except:
-            return None
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
     
-    tesseract_path = find_tesseract_path()
-    if tesseract_path:
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
-        print(f"✅ Tesseract configured: {tesseract_path}")
-    else:
-        print("❌ Tesseract not found. Please install from: https://github.com/UB-Mannheim/tesseract/wiki")
-        OCR_AVAILABLE = False
-        
-except ImportError as e:
-    print(f"❌ OCR dependencies missing: {e}")
-    OCR_AVAILABLE = False
+    # Try to find in PATH
+    try:
+        subprocess.run(['tesseract', '--version'], capture_output=True, check=True)
+        return 'tesseract'  # Use from PATH
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+_tesseract_checked = False
+
+def configure_tesseract() -> bool:
+    """Detect Tesseract on first OCR use (spawns `tesseract --version` once)"""
+    global OCR_AVAILABLE, _tesseract_checked
+    if OCR_AVAILABLE and not _tesseract_checked:
+        _tesseract_checked = True
+        tesseract_path = find_tesseract_path()
+        if tesseract_path:
+            import pytesseract
+            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+            log_event(logger, logging.INFO, "ocr.tesseract_configured", path=tesseract_path)
+        else:
+            log_event(logger, logging.WARNING, "ocr.tesseract_missing",
+                      install="https://github.com/UB-Mannheim/tesseract/wiki")
+            OCR_AVAILABLE = False
+    return OCR_AVAILABLE
 
 class FinalPDFExtractor:
     def __init__(self):
         self.poppler_path = r"C:\poppler\Library\bin"
         self.pdftotext_exe = os.path.join(self.poppler_path, "pdftotext.exe")
         
-    def extract_text(self, pdf_path: str) -> Optional[str]:
+    def extract_text(self, pdf_path: PdfSource) -> Optional[str]:
         """Extract text with OCR fallback for scanned PDFs"""
-        path = Path(pdf_path)
-        if not path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-        
-        print(f"🔍 Extracting from: {path.name}")
-        print(f"📊 File size: {path.stat().st_size} bytes")
-        
-        # Method 1: Try pdftotext first (for text-based PDFs)
-        text = self._extract_with_pdftotext(pdf_path)
-        if text and text.strip():
-            print(f"✅ Text-based PDF: {len(text)} characters")
-            return text
-        
-        # Method 2: If pdftotext fails, use OCR (for scanned PDFs)
-        if OCR_AVAILABLE:
-            print("🔄 Text extraction failed, trying OCR...")
-            ocr_text = self._extract_with_ocr(pdf_path)
-            if ocr_text and ocr_text.strip():
-                print(f"✅ OCR extracted: {len(ocr_text)} characters")
-                return ocr_text
-        else:
-            print("❌ OCR not available - install Tesseract and dependencies")
-        
-        print("❌ All extraction methods failed")
+        start = time.perf_counter()
+        with open_pdf_document(pdf_path) as document:
+            log_event(logger, logging.DEBUG, "pdf.extract_started", file=document.name, bytes=document.size)
+
+            # Method 1: Try pdftotext first (for text-based PDFs)
+            if "pdftotext" not in document.text_layers:
+                document.text_layers["pdftotext"] = self._extract_with_pdftotext(document)
+            text = document.text_layers["pdftotext"]
+            if text and text.strip():
+                document.engine = "pdftotext"
+                log_event(logger, logging.INFO, "pdf.extracted", file=document.name, engine=document.engine,
+                          chars=len(text), elapsed_ms=(time.perf_counter() - start) * 1000)
+                return text
+
+            # Method 2: If pdftotext fails, use OCR (for scanned PDFs)
+            if configure_tesseract():
+                log_event(logger, logging.DEBUG, "pdf.ocr_fallback", file=document.name)
+                if "OCR" not in document.text_layers:
+                    document.text_layers["OCR"] = self._extract_with_ocr(document)
+                ocr_text = document.text_layers["OCR"]
+                if ocr_text and ocr_text.strip():
+                    document.engine = "OCR"
+                    log_event(logger, logging.INFO, "pdf.extracted", file=document.name, engine=document.engine,
+                              chars=len(ocr_text), elapsed_ms=(time.perf_counter() - start) * 1000)
+                    return ocr_text
+            else:
+                log_event(logger, logging.WARNING, "ocr.unavailable", file=document.name)
+
+        log_event(logger, logging.WARNING, "pdf.extraction_failed", file=document.name, engines="pdftotext,OCR",
+                  elapsed_ms=(time.perf_counter() - start) * 1000)
         return None
     
-    def _extract_with_pdftotext(self, pdf_path: str) -> Optional[str]:
-        """Extract from text-based PDFs"""
+    def _extract_with_pdftotext(self, document: PdfDocument) -> Optional[str]:
+        """Extract from text-based PDFs (output streamed through stdout)"""
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.txt') as temp_file:
-                temp_path = temp_file.name
-            
-            cmd = [self.pdftotext_exe, "-layout", "-enc", "UTF-8", str(pdf_path), temp_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            # '-' as input reads the upload's bytes from stdin, '-' as output writes to stdout
+            source = "-" if document.data is not None else str(document.path)
+            cmd = [self.pdftotext_exe, "-layout", "-enc", "UTF-8", source, "-"]
+            result = subprocess.run(cmd, input=document.data, capture_output=True, timeout=30)
             
-            if result.returncode == 0 and os.path.exists(temp_path):
-                with open(temp_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    text = f.read()
-                
-                # Clean up
-                os.unlink(temp_path)
-                
-                return text
+            if result.returncode == 0:
+                return result.stdout.decode("utf-8", errors="ignore")
                 
         except Exception as e:
-            print(f"⚠️ pdftotext failed: {e}")
+            log_event(logger, logging.WARNING, "pdf.engine_failed", engine="pdftotext", error=str(e))
         
         return None
     
-    def _extract_with_ocr(self, pdf_path: str) -> Optional[str]:
+    def _extract_with_ocr(self, document: PdfDocument) -> Optional[str]:
         """Extract text from scanned PDFs using OCR"""
         try:
-            print("📄 Converting PDF to images for OCR...")
-            
-            # Convert PDF to images
-            images = convert_from_path(
-                pdf_path,
-                dpi=200,  # Balanced resolution for speed/quality
-                poppler_path=self.poppler_path
-            )
+            # Convert PDF to images (PDFium, in-process)
+            # dpi=200: balanced resolution for speed/quality
+            images = document.render_pages(dpi=200)
             
             text = ""
-            total_pages = len(images)
+            log_event(logger, logging.DEBUG, "ocr.started", pages=len(images))
             
-            for i, image in enumerate(images):
-                print(f"🔍 OCR processing page {i+1}/{total_pages}...")
-                
-                # Use OCR on the image
-                page_text = pytesseract.image_to_string(
-                    image,
-                    config='--psm 6'  # Uniform block of text
-                )
-                
-                if page_text.strip():
-                    text += f"--- Page {i+1} ---\n{page_text}\n"
+            # Pages are OCR'd in parallel and come back in page order
+            # --psm 6: uniform block of text
+            for page in ocr_images(images, config='--psm 6'):
+                if page.text.strip():
+                    text += f"--- Page {page.page_number} ---\n{page.text}\n"
                 else:
-                    print(f"   ⚠️ Page {i+1}: No text detected by OCR")
+                    log_event(logger, logging.DEBUG, "ocr.page_empty", page=page.page_number)
             
             return text if text.strip() else None
             
         except Exception as e:
-            print(f"❌ OCR extraction failed: {e}")
+            log_event(logger, logging.WARNING, "ocr.failed", error=str(e))
             return None
 
 # Global instance
 pdf_extractor = FinalPDFExtractor()
 
-def extract_text_from_pdf(pdf_path: str) -> Optional[str]:
+def extract_text_from_pdf(pdf_path: PdfSource) -> Optional[str]:
     """Main extraction function"""
     return pdf_extractor.extract_text(pdf_path)
\ No newline at end of file
@@ -1,19 +1,74 @@
 import subprocess
+import logging
 import os
 import platform
-import tempfile
+import threading
+import time
 import shutil
-from pathlib import Path
-from typing import Optional
-
-try:
-    import pytesseract
-    from pdf2image import convert_from_path
-    from PIL import Image
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-    print("⚠️ OCR libraries not available. Install: pip install pytesseract pdf2image pillow")
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Literal, Optional
+from .pdf_document import PdfDocument, PdfSource, open_pdf_document
+from .ocr_pool import ocr_dependencies_available, ocr_images
+from .extraction_cache import get_extraction_cache
+from .log_events import log_event
+
+logger = logging.getLogger(__name__)
+
+# The OCR stack is imported only when a page actually needs OCR
+OCR_AVAILABLE = ocr_dependencies_available()
+if not OCR_AVAILABLE:
+    log_event(logger, logging.WARNING, "ocr.unavailable", install="pip install pytesseract pillow")
+
+# "fallback": first engine that returns text wins, OCR only if all fail
+# "hybrid": OCR only the pages whose text layer is empty or too short
+# "race": run the fast text engines concurrently and keep the first good result
+ExtractionMode = Literal["fallback", "hybrid", "race"]
+DEFAULT_MODE: ExtractionMode = os.getenv("PDF_EXTRACTION_MODE", "fallback")
+
+# Pages with fewer characters than this in their text layer are OCR'd in hybrid mode
+MIN_PAGE_CHARS = 50
+
+# Engines started together in race mode
+RACE_ENGINES = ("pypdfium2", "pdftotext", "PyPDF2")
+
+PDFTOTEXT_TIMEOUT = 30
+
+def text_quality_ok(text: Optional[str], min_chars: int = MIN_PAGE_CHARS) -> bool:
+    """Cheap check that extracted text is real text and not empty or glyph garbage"""
+    if not text:
+        return False
+    stripped = text.strip()
+    if len(stripped) < min_chars:
+        return False
+    # Unmapped fonts come out as '(cid:123)' or U+FFFD replacement characters
+    if stripped.count("(cid:") * 8 + stripped.count("\ufffd") > len(stripped) * 0.1:
+        return False
+    readable = sum(1 for ch in stripped if ch.isalnum() or ch.isspace())
+    return readable / len(stripped) >= 0.6
+
+class Cancellation:
+    """Cancels a running engine: sets a flag and kills any subprocess it started"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes = []
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def register(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.append(process)
+            if self._event.is_set():
+                process.kill()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._event.set()
+            for process in self._processes:
+                if process.poll() is None:
+                    process.kill()
 
 class CrossPlatformPDFExtractor:
     """
@@ -23,7 +78,6 @@ class CrossPlatformPDFExtractor:
     def __init__(self):
         self.system = platform.system()
         self.pdftotext_path = self._find_pdftotext()
-        self.poppler_path = self._find_poppler()
         self.tesseract_path = self._find_tesseract()
 
     def _find_pdftotext(self) -> Optional[str]:
@@ -43,21 +97,6 @@ class CrossPlatformPDFExtractor:
 
         return None
 
-    def _find_poppler(self) -> Optional[str]:
-        """Find poppler path for pdf2image"""
-        if self.system == "Windows":
-            possible_paths = [
-                r"C:\poppler\Library\bin",
-                r"C:\Program Files\poppler\bin",
-                os.path.expanduser(r"~\poppler\bin")
-            ]
-            for path in possible_paths:
-                if os.path.exists(path):
-                    return path
-            return None
-
-        return None
-
     def _find_tesseract(self) -> Optional[str]:
         """Find tesseract executable"""
         if not OCR_AVAILABLE:
@@ -71,6 +110,7 @@ class CrossPlatformPDFExtractor:
             ]
             for path in possible_paths:
                 if os.path.exists(path):
+                    import pytesseract
                     pytesseract.pytesseract.tesseract_cmd = path
                     return path
 
@@ -79,122 +119,268 @@ class CrossPlatformPDFExtractor:
 
         return None
 
-    def extract_text(self, pdf_path: str) -> Optional[str]:
+    def extract_text(self, pdf_path: PdfSource, mode: ExtractionMode = None) -> Optional[str]:
         """
         Extract text using multiple strategies with fallbacks
         """
-        path = Path(pdf_path)
-        if not path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-
-        print(f"🔍 Extracting from: {path.name}")
-        print(f"📊 File size: {path.stat().st_size} bytes")
-        print(f"💻 System: {self.system}")
-
-        text = self._try_pdftotext(pdf_path)
-        if text and text.strip():
-            print(f"✅ pdftotext extracted: {len(text)} characters")
+        mode = mode or DEFAULT_MODE
+        with open_pdf_document(pdf_path) as document:
+            start = time.perf_counter()
+            if mode == "hybrid":
+                text = self._extract_hybrid(document)
+            elif mode == "race":
+                text = self._extract_race(document)
+            else:
+                text = self._extract_from_document(document)
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if text:
+                log_event(logger, logging.INFO, "pdf.extracted", file=document.name, mode=mode,
+                          engine=document.engine, chars=len(text), bytes=document.size, elapsed_ms=elapsed_ms)
+            else:
+                log_event(logger, logging.WARNING, "pdf.extraction_failed", file=document.name, mode=mode,
+                          engines=",".join(document.text_layers), elapsed_ms=elapsed_ms)
             return text
 
-        text = self._try_pypdf2(pdf_path)
-        if text and text.strip():
-            print(f"✅ PyPDF2 extracted: {len(text)} characters")
-            return text
-
-        text = self._try_pdfplumber(pdf_path)
-        if text and text.strip():
-            print(f"✅ pdfplumber extracted: {len(text)} characters")
-            return text
+    def _extract_from_document(self, document: PdfDocument) -> Optional[str]:
 
+        engines = [
+            ("pypdfium2", self._try_pypdfium2),
+            ("pdftotext", self._try_pdftotext),
+            ("PyPDF2", self._try_pypdf2),
+            ("pdfplumber", self._try_pdfplumber),
+        ]
         if OCR_AVAILABLE and self.tesseract_path:
-            print("🔄 Trying OCR...")
-            text = self._try_ocr(pdf_path)
+            engines.append(("OCR", self._try_ocr))
+
+        for engine, extract in engines:
+            if engine not in document.text_layers:
+                start = time.perf_counter()
+                document.text_layers[engine] = extract(document)
+                log_event(logger, logging.DEBUG, "pdf.engine", engine=engine,
+                          chars=len(document.text_layers[engine] or ""),
+                          elapsed_ms=(time.perf_counter() - start) * 1000)
+
+            text = document.text_layers[engine]
             if text and text.strip():
-                print(f"✅ OCR extracted: {len(text)} characters")
+                document.engine = engine
                 return text
 
-        print("❌ All extraction methods failed")
         return None
 
-    def _try_pdftotext(self, pdf_path: str) -> Optional[str]:
-        """Extract using pdftotext command"""
+    def _extract_race(self, document: PdfDocument) -> Optional[str]:
+        """
+        Start the fast engines together and keep the first result that passes
+        the quality check; the others are cancelled (pdftotext is killed) and
+        waited for, so no engine touches the document after it is closed.
+        Falls back to the sequential chain if no engine produces good text.
+        """
+        engines = {
+            "pypdfium2": self._try_pypdfium2,
+            "pdftotext": self._try_pdftotext,
+            "PyPDF2": self._try_pypdf2,
+        }
+        racers = [name for name in RACE_ENGINES if name in engines and name not in document.text_layers]
+        cancellation = Cancellation()
+        start = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=max(1, len(racers)), thread_name_prefix="pdf-race")
+        try:
+            futures = {executor.submit(engines[name], document, cancellation): name for name in racers}
+            for future in as_completed(futures):
+                name = futures[future]
+                text = future.result()
+                document.text_layers[name] = text
+                if text_quality_ok(text):
+                    cancellation.cancel()
+                    document.engine = name
+                    log_event(logger, logging.DEBUG, "pdf.race_won", engine=name, chars=len(text),
+                              elapsed_ms=(time.perf_counter() - start) * 1000)
+                    return text
+        finally:
+            cancellation.cancel()
+            # In-process engines stop at their next page check
+            executor.shutdown(wait=True)
+
+        # Engines that already ran are cached on the document and not repeated
+        return self._extract_from_document(document)
+
+    def _extract_hybrid(self, document: PdfDocument, min_chars: int = MIN_PAGE_CHARS) -> Optional[str]:
+        """
+        Keep each page's text layer and OCR only the pages without one
+        (e.g. a typed CV with a scanned certificate appended)
+        """
+        page_texts = self._page_text_layers(document)
+        sparse_pages = [i + 1 for i, text in enumerate(page_texts) if len(text.strip()) < min_chars]
+
+        if sparse_pages and OCR_AVAILABLE and self.tesseract_path:
+            log_event(logger, logging.DEBUG, "pdf.hybrid_ocr", pages=len(page_texts), ocr_pages=sparse_pages)
+            try:
+                images = self._render_pages(document, sparse_pages)
+                for page in ocr_images(images, config='--psm 6', page_numbers=sparse_pages):
+                    if len(page.text.strip()) > len(page_texts[page.page_number - 1].strip()):
+                        page_texts[page.page_number - 1] = page.text
+            except Exception as e:
+                log_event(logger, logging.WARNING, "ocr.failed", error=str(e))
+
+        text = "\n".join(page_text for page_text in page_texts if page_text.strip())
+        if not text.strip():
+            return None
+
+        document.text_layers["hybrid"] = text
+        document.engine = "hybrid"
+        return text
+
+    def _page_text_layers(self, document: PdfDocument) -> List[str]:
+        """
+        Per-page text: PDFium pages, else pdftotext pages (split on form feeds)
+        when they line up, else pdfplumber
+        """
+        for engine, extract in (("pypdfium2", self._try_pypdfium2), ("pdftotext", self._try_pdftotext)):
+            if engine not in document.text_layers:
+                document.text_layers[engine] = extract(document)
+
+            text = document.text_layers[engine]
+            if text:
+                pages = text.split("\x0c")
+                # Both engines end every page with a form feed
+                if pages and not pages[-1].strip():
+                    pages.pop()
+                if len(pages) == document.page_count:
+                    return pages
+
+        return list(document.page_texts)
+
+    def _render_pages(self, document: PdfDocument, page_numbers: Optional[List[int]] = None) -> list:
+        """Rasterize pages (1-based; default all) for OCR with PDFium, in-process"""
+        return document.render_pages(page_numbers)
+
+    def _try_pypdfium2(self, document: PdfDocument, cancellation: Optional[Cancellation] = None) -> Optional[str]:
+        """Extract using PDFium in-process (no subprocess, no temp file)"""
+        try:
+            page_texts = document.extract_pdfium_page_texts(cancellation.is_set if cancellation is not None else None)
+            if page_texts is None:
+                return None
+            # Pages end with a form feed, like pdftotext output
+            return "".join(page_text + "\x0c" for page_text in page_texts)
+        except Exception as e:
+            log_event(logger, logging.WARNING, "pdf.engine_failed", engine="pypdfium2", error=str(e))
+            return None
+
+    def _try_pdftotext(self, document: PdfDocument, cancellation: Optional[Cancellation] = None) -> Optional[str]:
+        """Extract using pdftotext command, streamed through a pipe (no temp files)"""
         if not self.pdftotext_path:
             return None
 
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.txt') as temp_file:
-                temp_path = temp_file.name
+            # '-' as output writes to stdout; '-' as input reads the upload's bytes from stdin
+            source = "-" if document.data is not None else str(document.path)
+            cmd = [self.pdftotext_path, "-layout", "-enc", "UTF-8", source, "-"]
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if document.data is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            if cancellation is not None:
+                cancellation.register(process)
 
-            cmd = [self.pdftotext_path, "-layout", "-enc", "UTF-8", str(pdf_path), temp_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            try:
+                output, _ = process.communicate(input=document.data, timeout=PDFTOTEXT_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
 
-            if result.returncode == 0 and os.path.exists(temp_path):
-                with open(temp_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    text = f.read()
-                os.unlink(temp_path)
-                return text
+            if process.returncode == 0:
+                return output.decode("utf-8", errors="ignore")
 
         except Exception as e:
-            print(f"⚠️ pdftotext failed: {e}")
+            log_event(logger, logging.WARNING, "pdf.engine_failed", engine="pdftotext", error=str(e))
 
         return None
 
-    def _try_pypdf2(self, pdf_path: str) -> Optional[str]:
+    def _try_pypdf2(self, document: PdfDocument, cancellation: Optional[Cancellation] = None) -> Optional[str]:
         """Extract using PyPDF2"""
         try:
             import PyPDF2
-            with open(pdf_path, 'rb') as file:
+            with document.open_stream() as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 text = ""
                 for page in pdf_reader.pages:
+                    if cancellation is not None and cancellation.is_set():
+                        return None
                     text += page.extract_text() + "\n"
                 return text
         except Exception as e:
-            print(f"⚠️ PyPDF2 failed: {e}")
+            log_event(logger, logging.WARNING, "pdf.engine_failed", engine="PyPDF2", error=str(e))
             return None
 
-    def _try_pdfplumber(self, pdf_path: str) -> Optional[str]:
-        """Extract using pdfplumber"""
+    def _try_pdfplumber(self, document: PdfDocument) -> Optional[str]:
+        """Extract using pdfplumber (shares the session's parsed pages)"""
         try:
-            import pdfplumber
             text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            for page_text in document.page_texts:
+                if page_text:
+                    text += page_text + "\n"
             return text
         except Exception as e:
-            print(f"⚠️ pdfplumber failed: {e}")
+            log_event(logger, logging.WARNING, "pdf.engine_failed", engine="pdfplumber", error=str(e))
             return None
 
-    def _try_ocr(self, pdf_path: str) -> Optional[str]:
+    def _try_ocr(self, document: PdfDocument) -> Optional[str]:
         """Extract using OCR"""
         if not OCR_AVAILABLE or not self.tesseract_path:
             return None
 
         try:
-            images = convert_from_path(
-                pdf_path,
-                dpi=200,
-                poppler_path=self.poppler_path
-            )
+            images = self._render_pages(document)
 
             text = ""
-            for i, image in enumerate(images):
-                print(f"🔍 OCR processing page {i+1}/{len(images)}...")
-                page_text = pytesseract.image_to_string(image, config='--psm 6')
-                if page_text.strip():
-                    text += f"--- Page {i+1} ---\n{page_text}\n"
+            for page in ocr_images(images, config='--psm 6'):
+                if page.text.strip():
+                    text += f"--- Page {page.page_number} ---\n{page.text}\n"
 
             return text if text.strip() else None
 
         except Exception as e:
-            print(f"❌ OCR failed: {e}")
+            log_event(logger, logging.WARNING, "ocr.failed", error=str(e))
             return None
 
-pdf_extractor = CrossPlatformPDFExtractor()
-
-def extract_text_from_pdf(pdf_path: str) -> Optional[str]:
-    """Main extraction function"""
-    return pdf_extractor.extract_text(pdf_path)
+_pdf_extractor: Optional[CrossPlatformPDFExtractor] = None
+_pdf_extractor_lock = threading.Lock()
+
+def get_pdf_extractor() -> CrossPlatformPDFExtractor:
+    """Shared extractor; engine discovery runs on first use, not at import"""
+    global _pdf_extractor
+    if _pdf_extractor is None:
+        with _pdf_extractor_lock:
+            if _pdf_extractor is None:
+                _pdf_extractor = CrossPlatformPDFExtractor()
+    return _pdf_extractor
+
+def __getattr__(name: str):
+    # `pdf_extractor` used to be built at import time; keep the name working
+    if name == "pdf_extractor":
+        return get_pdf_extractor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def extract_text_from_pdf(pdf_path: PdfSource, mode: ExtractionMode = None) -> Optional[str]:
+    """Main extraction function (served from the extraction cache when possible)"""
+    mode = mode or DEFAULT_MODE
+    cache = get_extraction_cache()
+    if cache is None:
+        return get_pdf_extractor().extract_text(pdf_path, mode=mode)
+
+    with open_pdf_document(pdf_path) as document:
+        key = cache.key(document.sha256, mode)
+        entry = cache.get(key)
+        if entry and entry.get("raw_text"):
+            log_event(logger, logging.INFO, "pdf.cache_hit", file=document.name, mode=mode,
+                      engine=entry.get("engine"), chars=len(entry["raw_text"]))
+            return entry["raw_text"]
+
+        text = get_pdf_extractor().extract_text(document, mode=mode)
+        if text:
+            cache.update(key, raw_text=text, engine=document.engine)
+        return text
@@ -1,35 +1,35 @@
-import pdfplumber
+import logging
 import re
 from typing import List
+from .pdf_document import PdfSource, open_pdf_document
+from .log_events import log_event
 
-def extract_skills_from_pdf_tables(pdf_path: str) -> List[str]:
+logger = logging.getLogger(__name__)
+
+def extract_skills_from_pdf_tables(pdf_path: PdfSource) -> List[str]:
     """
     Extract skills from PDF tables using pdfplumber
     """
     skills = []
     
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                # Extract tables
-                tables = page.extract_tables()
+        with open_pdf_document(pdf_path) as document:
+            for table in document.tables:
+                if not table:
+                    continue
                 
-                for table in tables:
-                    if not table:
-                        continue
-                    
-                    # Check if this looks like a skills table
-                    if is_skills_table(table):
-                        # Extract skills from table cells
-                        for row in table:
-                            for cell in row:
-                                if cell and isinstance(cell, str):
-                                    cell_text = cell.strip()
-                                    if cell_text and looks_like_skill(cell_text):
-                                        skills.append(cell_text)
+                # Check if this looks like a skills table
+                if is_skills_table(table):
+                    # Extract skills from table cells
+                    for row in table:
+                        for cell in row:
+                            if cell and isinstance(cell, str):
+                                cell_text = cell.strip()
+                                if cell_text and looks_like_skill(cell_text):
+                                    skills.append(cell_text)
                                 
     except Exception as e:
-        print(f"PDF table extraction error: {e}")
+        log_event(logger, logging.WARNING, "pdf.table_extraction_failed", error=str(e))
     
     return skills
 
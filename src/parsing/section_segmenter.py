@@ -0,0 +1,152 @@
+# src/parsing/section_segmenter.py
+"""
+Single-pass resume section segmenter.
+
+Every header phrase is compiled into one alternation, so the text is
+scanned once regardless of how many sections or phrases exist. A section's
+text runs from its header to the next header of any kind.
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# Header phrases per extracted section
+SECTION_HEADERS: Dict[str, tuple] = {
+    "skills": (
+        "skills/core competencies", "core competencies", "technical skills", "technical skill",
+        "key skills", "core skills", "skills", "skill", "technologies", "expertise",
+        "competencies", "proficiencies",
+    ),
+    "education": (
+        "education", "academic background", "academics", "qualifications", "degrees", "degree",
+    ),
+    "experience": (
+        "work experience", "professional experience", "experience", "work history",
+        "employment history", "employment", "career history",
+    ),
+    "certifications": (
+        "certifications", "certification", "certificates", "certificate", "licenses", "license",
+    ),
+}
+
+# Headers we do not extract; they only end the section before them
+BOUNDARY_HEADERS = (
+    "projects", "project details", "teaching", "trainings", "training", "basic information",
+    "personal information", "personal details", "summary", "professional summary", "profile",
+    "objective", "career objective", "languages", "interests", "hobbies", "references",
+    "achievements", "awards", "publications", "volunteering", "contact",
+)
+
+class SectionHeader(NamedTuple):
+    section: Optional[str]  # None for boundary-only headers
+    title: str              # header as written
+    start: int              # offset of the header line
+    content_start: int      # offset just after the header (and its ':' if any)
+    line: bool              # header on its own line (vs. inside a line)
+
+class SectionSpan(NamedTuple):
+    title: str
+    start: int
+    end: int
+
+def _normalize(title: str) -> str:
+    return " ".join(title.lower().split())
+
+_PHRASE_SECTION: Dict[str, Optional[str]] = {phrase: None for phrase in BOUNDARY_HEADERS}
+for _section, _phrases in SECTION_HEADERS.items():
+    _PHRASE_SECTION.update((phrase, _section) for phrase in _phrases)
+
+def _spellings(phrase: str) -> tuple:
+    # Headers are written "Work experience", "Work Experience" or "WORK EXPERIENCE"
+    return phrase.capitalize(), phrase.title(), phrase.upper()
+
+def _trie_pattern(phrases) -> str:
+    """
+    Alternation factored into a prefix trie: "certificat(?:e(?:s)?|ion(?:s)?)".
+    Branches sharing a prefix are tested once, and the set of first
+    characters lets the regex engine skip every other position quickly.
+    """
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [(r"[ \t]+" if char == " " else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+# Case-sensitive on purpose: lowercase words are never headers, and without
+# re.IGNORECASE the engine can use its first-character fast path
+_HEADER_RE = re.compile(
+    r"(?P<title>" + _trie_pattern(spelling for phrase in _PHRASE_SECTION for spelling in _spellings(phrase)) + r")"
+    r"(?![^\W\d_])"
+    r"[ \t]*(?P<delimiter>:|[-–—|](?=[ \t\n]|$))?"
+)
+
+_BULLETS = "-•*▪–—"
+
+def _classify(text: str, match: "re.Match") -> Optional[bool]:
+    """
+    True for a header line ("Experience", "Skills: Python", "SKILLS Python"),
+    False for a header sharing its line ("Education MSc in ...", or glued by a
+    two-column layout: "...gmail.comSkills/Core Competencies"), None for
+    ordinary words ("Experience in REST APIs", "a Certificate in ...").
+    """
+    title = match.group("title")
+    start = match.start()
+    previous = text[start - 1] if start else "\n"
+    if previous.isalpha() and not previous.islower():
+        return None  # inside a word
+
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", match.end())
+    rest = text[match.end():line_end if line_end != -1 else len(text)].strip()
+    at_line_start = not text[line_start:start].strip(" \t" + _BULLETS)
+
+    if at_line_start and (not rest or match.group("delimiter") is not None or title.isupper()):
+        return True
+    if previous.islower() or (at_line_start and not rest[:1].islower()):
+        return False
+    return None
+
+def find_headers(text: str) -> List[SectionHeader]:
+    """All section headers in `text`, in order (one scan of the text)"""
+    headers = []
+    for match in _HEADER_RE.finditer(text):
+        kind = _classify(text, match)
+        if kind is not None:
+            headers.append(SectionHeader(_PHRASE_SECTION[_normalize(match.group("title"))],
+                                         match.group("title"), match.start(), match.end(), kind))
+    return headers
+
+def segment_sections(text: str) -> Dict[str, SectionSpan]:
+    """
+    Map each extracted section to the span of its content. A header line
+    beats an inline header; otherwise the first header of a section wins.
+    Content ends where the next header of any kind starts.
+    """
+    headers = find_headers(text)
+    spans: Dict[str, SectionSpan] = {}
+    line_headers = set()
+    for index, header in enumerate(headers):
+        if header.section is None or header.section in line_headers:
+            continue
+        if header.section in spans and not header.line:
+            continue
+        end = headers[index + 1].start if index + 1 < len(headers) else len(text)
+        spans[header.section] = SectionSpan(header.title, header.content_start, end)
+        if header.line:
+            line_headers.add(header.section)
+    return spans
+
+def section_texts(text: str, spans: Optional[Dict[str, SectionSpan]] = None) -> Dict[str, str]:
+    """Section name -> stripped content"""
+    spans = segment_sections(text) if spans is None else spans
+    return {section: text[span.start:span.end].strip() for section, span in spans.items()}
@@ -0,0 +1,37 @@
+# src/parsing/sources.py
+# Helpers for parser inputs that may be a path on disk or the upload's bytes
+import io
+from pathlib import Path
+from typing import Optional, Union
+
+BytesSource = Union[bytes, bytearray, memoryview, io.BytesIO]
+FileSource = Union[str, Path, BytesSource]
+
+def is_bytes_source(source) -> bool:
+    return isinstance(source, (bytes, bytearray, memoryview, io.BytesIO))
+
+def to_bytes(source: BytesSource) -> bytes:
+    """Bytes of an in-memory upload (Streamlit gives memoryview/BytesIO)"""
+    if isinstance(source, io.BytesIO):
+        return source.getvalue()
+    if isinstance(source, bytes):
+        return source
+    return bytes(source)
+
+def detect_file_type(source: FileSource, file_type: Optional[str] = None) -> str:
+    """
+    Return '.pdf', '.docx' or the unsupported suffix.
+    Paths use their suffix; bytes are sniffed unless `file_type` is given.
+    """
+    if file_type:
+        return "." + file_type.lower().lstrip(".")
+
+    if not is_bytes_source(source):
+        return Path(source).suffix.lower()
+
+    head = to_bytes(source)[:8]
+    if head.startswith(b"%PDF"):
+        return ".pdf"
+    if head.startswith(b"PK\x03\x04"):  # DOCX is a zip container
+        return ".docx"
+    return ""
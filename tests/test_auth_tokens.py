@@ -0,0 +1,121 @@
+# tests/test_auth_tokens.py
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import jwt
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database import AuthService
+from src.database.token_verifier import TokenVerifier
+
+SECRET = "test-secret-with-at-least-32-bytes!!"
+
+def _token(sub="user-1", expires_in=3600, secret=SECRET):
+    now = int(time.time())
+    return jwt.encode({"sub": sub, "aud": "authenticated", "iat": now, "exp": now + expires_in}, secret, algorithm="HS256")
+
+def _session(expires_in=3600, refresh_token="refresh-1"):
+    return SimpleNamespace(access_token=_token(expires_in=expires_in), refresh_token=refresh_token,
+                           expires_at=int(time.time()) + expires_in)
+
+class FakeAuth:
+    def __init__(self):
+        self.calls = []
+        self.refresh_error = None
+
+    def get_user(self):
+        self.calls.append("get_user")
+        return SimpleNamespace(user=SimpleNamespace(id="user-1"))
+
+    def refresh_session(self, refresh_token):
+        self.calls.append(("refresh_session", refresh_token))
+        if self.refresh_error:
+            raise self.refresh_error
+        return SimpleNamespace(session=_session(refresh_token="refresh-2"), user=None)
+
+    def sign_out(self):
+        self.calls.append("sign_out")
+
+def _service(verifier=None):
+    client = SimpleNamespace(auth=FakeAuth())
+    service = AuthService(client, verifier=verifier or TokenVerifier(jwt_secret=SECRET, leeway=0))
+    return service, client.auth
+
+def test_verifier_checks_signature_and_expiry():
+    verifier = TokenVerifier(jwt_secret=SECRET, leeway=0)
+    assert verifier.verify(_token())["sub"] == "user-1"
+    with pytest.raises(jwt.InvalidSignatureError):
+        verifier.verify(_token(secret="another-secret-with-at-least-32-bytes"))
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(_token(expires_in=-10))
+
+def test_verified_claims_are_cached_until_expiry(monkeypatch):
+    verifier = TokenVerifier(jwt_secret=SECRET, leeway=0)
+    token = _token(expires_in=2)
+    verifier.verify(token)
+
+    decodes = []
+    monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: decodes.append(1))
+    assert verifier.verify(token)["sub"] == "user-1"
+    assert decodes == []
+
+    monkeypatch.setattr(time, "time", lambda: 10 ** 10)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(token)
+
+def test_current_user_makes_no_auth_server_calls():
+    service, auth = _service()
+    user = SimpleNamespace(id="user-1")
+    service._remember(_session(), user)
+    try:
+        for _ in range(5):
+            assert service.get_current_user() is user
+        assert auth.calls == []
+    finally:
+        service._remember(None, None)
+
+def test_token_close_to_expiry_is_refreshed_on_use():
+    service, auth = _service()
+    service._remember(_session(expires_in=30), SimpleNamespace(id="user-1"))  # inside the margin
+    assert service.get_current_user().id == "user-1"
+    assert service._session.refresh_token == "refresh-2"
+    assert service.get_current_user().id == "user-1"
+    assert auth.calls == [("refresh_session", "refresh-1")]
+    # Nothing runs between calls: an abandoned session stops renewing its token
+    assert not any(isinstance(thread, threading.Timer) for thread in threading.enumerate())
+
+def test_failed_early_refresh_keeps_the_valid_token_and_backs_off():
+    service, auth = _service()
+    auth.refresh_error = ConnectionError("auth server down")
+    service._remember(_session(expires_in=30), SimpleNamespace(id="user-1"))
+    assert service.get_current_user().id == "user-1"
+    assert service.get_current_user().id == "user-1"
+    assert auth.calls == [("refresh_session", "refresh-1")]
+
+def test_sign_out_drops_the_session():
+    service, auth = _service()
+    service._remember(_session(expires_in=30), SimpleNamespace(id="user-1"))
+    service.sign_out()
+    assert service._session is None
+    assert "sign_out" in auth.calls and ("refresh_session", "refresh-1") not in auth.calls
+
+def test_expired_token_that_cannot_be_refreshed_ends_the_session():
+    service, auth = _service()
+    auth.refresh_error = ConnectionError("auth server down")
+    service._session = _session(expires_in=-10)
+    service._user = SimpleNamespace(id="user-1")
+    assert service.get_current_user() is None
+
+def test_without_a_key_the_server_is_asked_once_per_token():
+    service, auth = _service(TokenVerifier(jwt_secret=None))
+    user = SimpleNamespace(id="user-1")
+    service._session, service._user = _session(), user
+    assert service.get_current_user() is user
+    assert service.get_current_user() is user
+    assert auth.calls == ["get_user"]
@@ -0,0 +1,68 @@
+# tests/test_bytes_input.py
+import io
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.parsing import parse_resume
+from src.parsing.docx_parser import extract_text_from_docx
+from src.parsing.pdf_document import PdfDocument
+from src.parsing.pdf_parser_improved import CrossPlatformPDFExtractor
+from src.parsing.pdf_table_extractor import extract_skills_from_pdf_tables
+from src.parsing.sources import detect_file_type
+
+TEST_DATA = project_root / "tests" / "tests" / "test_data"
+TABLES_PDF = TEST_DATA / "pdfs" / "tables.pdf"
+SIMPLE_DOCX = TEST_DATA / "docs" / "simple.docx"
+
+FAKE_PDFTOTEXT = """\
+#!{python}
+import sys
+# pdftotext <options> <input> <output>: expect stdin in and stdout out
+assert sys.argv[-2:] == ["-", "-"], sys.argv
+data = sys.stdin.buffer.read()
+sys.stdout.write(f"read {{len(data)}} bytes from stdin")
+"""
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, io.BytesIO])
+def test_pdf_document_from_memory_matches_path(wrap):
+    data = TABLES_PDF.read_bytes()
+    with PdfDocument(TABLES_PDF) as on_disk, PdfDocument(wrap(data)) as in_memory:
+        assert in_memory.path is None
+        assert in_memory.page_texts == on_disk.page_texts
+        assert in_memory.sha256 == on_disk.sha256
+        assert in_memory.size == on_disk.size
+
+def test_table_extraction_accepts_bytes():
+    data = TABLES_PDF.read_bytes()
+    assert extract_skills_from_pdf_tables(data) == extract_skills_from_pdf_tables(str(TABLES_PDF))
+
+def test_docx_accepts_bytes():
+    data = SIMPLE_DOCX.read_bytes()
+    assert extract_text_from_docx(memoryview(data)) == extract_text_from_docx(str(SIMPLE_DOCX))
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a script as pdftotext")
+def test_pdftotext_streams_through_pipes(tmp_path):
+    script = tmp_path / "pdftotext"
+    script.write_text(FAKE_PDFTOTEXT.format(python=sys.executable))
+    script.chmod(0o755)
+    extractor = CrossPlatformPDFExtractor()
+    extractor.pdftotext_path = str(script)
+    data = TABLES_PDF.read_bytes()
+
+    with PdfDocument(data) as document:
+        assert extractor._try_pdftotext(document) == f"read {len(data)} bytes from stdin"
+
+def test_file_type_detection():
+    assert detect_file_type(TABLES_PDF.read_bytes()) == ".pdf"
+    assert detect_file_type(SIMPLE_DOCX.read_bytes()) == ".docx"
+    assert detect_file_type(b"plain text") == ""
+    assert detect_file_type(b"plain text", file_type="PDF") == ".pdf"
+    assert detect_file_type("resume.DOCX") == ".docx"
+
+def test_unknown_bytes_are_rejected():
+    with pytest.raises(ValueError):
+        parse_resume(b"just some text")
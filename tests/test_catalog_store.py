@@ -0,0 +1,134 @@
+# tests/test_catalog_store.py
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database import QueryCache, SkillRepository
+from src.parsing.ml import skill_matcher_db
+from src.parsing.ml.catalog_store import CatalogStore
+
+def test_cold_start_loads_once_then_serves_snapshot():
+    calls = []
+    store = CatalogStore(lambda: calls.append(1) or {"roles": len(calls)})
+    assert store.get() == {"roles": 1}
+    assert store.get() == {"roles": 1}
+    assert calls == [1]
+    assert store.snapshot.version == 1
+
+def test_stale_snapshot_is_served_while_reloading_in_background():
+    release = threading.Event()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        if len(loads) > 1:
+            release.wait(5)
+        return len(loads)
+
+    store = CatalogStore(loader, refresh_interval=0.0)
+    assert store.get() == 1
+    # Reload is stuck in the loader, yet readers are not blocked
+    assert store.get() == 1
+    assert store.get() == 1
+    release.set()
+    for _ in range(200):
+        if store.snapshot.version == 2:
+            break
+        threading.Event().wait(0.01)
+    assert store.snapshot.catalog == 2
+    assert len(loads) == 2  # a single background reload despite several stale reads
+
+def test_failed_reload_keeps_last_good_snapshot():
+    results = iter([{"v": 1}, RuntimeError("db down")])
+
+    def loader():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    store = CatalogStore(loader, fallback=lambda: {"v": "fallback"})
+    store.refresh()
+    snapshot = store.refresh()
+    assert snapshot.catalog == {"v": 1} and snapshot.version == 1 and not snapshot.fallback
+
+def test_fallback_when_first_load_fails():
+    def loader():
+        raise RuntimeError("db down")
+
+    store = CatalogStore(loader, fallback=lambda: {"v": "fallback"})
+    assert store.get() == {"v": "fallback"}
+    assert store.snapshot.fallback
+
+def test_matcher_reads_snapshot_without_touching_the_database(monkeypatch):
+    catalog = skill_matcher_db.RoleCatalog({"Analyst": ["SQL", "Excel"]}, skill_matcher_db.SKILL_SYNONYMS)
+    store = CatalogStore(lambda: catalog)
+    store.refresh()
+    monkeypatch.setattr(skill_matcher_db, "_catalog_store", store)
+
+    def no_database(*args, **kwargs):
+        raise AssertionError("request path opened a database connection")
+
+    monkeypatch.setattr(skill_matcher_db, "SkillRepository", no_database)
+    assert skill_matcher_db.load_role_catalog() is catalog
+    gap = skill_matcher_db.compute_skill_gap(["postgres"], ["SQL", "Excel"])
+    assert gap == {"matched": ["SQL"], "missing": ["Excel"]}
+
+class FakeCatalogClient:
+    def __init__(self):
+        self.failing = set()
+        self.rows = {
+            "job_roles": [{"role_name": "Data Analyst", "required_skills": ["SQL", "Excel"]}],
+            "skills_database": [{"skill_name": "spark", "synonyms": ["spark", "pyspark"]}],
+        }
+
+    def table(self, name):
+        client = self
+
+        class Query:
+            def __getattr__(self, attr):
+                return lambda *args, **kwargs: self
+
+            def execute(self):
+                if name in client.failing:
+                    raise ConnectionError("database unreachable")
+                return SimpleNamespace(data=[dict(row) for row in client.rows[name]])
+
+        return Query()
+
+def test_full_reload_reads_current_rows_and_keeps_the_last_good_catalog(monkeypatch):
+    client = FakeCatalogClient()
+    cache = QueryCache(ttl=3600)
+    monkeypatch.setattr(skill_matcher_db, "SkillRepository", lambda: SkillRepository(client, cache=cache))
+    store = CatalogStore(skill_matcher_db.fetch_role_catalog_from_db, fallback=skill_matcher_db._fallback_catalog)
+    assert set(store.refresh().catalog.roles) == {"Data Analyst"}
+
+    # The reload sees the new row, not the query cache's copy of the old ones
+    client.rows["job_roles"].append({"role_name": "Data Engineer", "required_skills": ["SQL", "Spark"]})
+    assert set(store.refresh().catalog.roles) == {"Data Analyst", "Data Engineer"}
+
+    # A failed synonyms read keeps the previous catalog instead of one without DB synonyms
+    client.failing.add("skills_database")
+    snapshot = store.refresh()
+    assert snapshot.version == 2 and not snapshot.fallback
+    assert snapshot.catalog.normalizer("pyspark") == "spark"
+
+def test_empty_first_load_retries_instead_of_keeping_the_fallback(monkeypatch):
+    client = FakeCatalogClient()
+    roles = client.rows["job_roles"]
+    client.rows["job_roles"] = []  # e.g. rows hidden by RLS: the load raises
+    monkeypatch.setattr(skill_matcher_db, "SkillRepository", lambda: SkillRepository(client, cache=QueryCache()))
+    store = CatalogStore(skill_matcher_db.fetch_role_catalog_from_db, fallback=skill_matcher_db._fallback_catalog,
+                         refresh_interval=3600, fallback_retry_interval=0.0)
+    assert store.get_snapshot().fallback
+
+    client.rows["job_roles"] = roles
+    for _ in range(200):
+        if not store.get_snapshot().fallback:
+            break
+        threading.Event().wait(0.01)
+    assert set(store.get().roles) == {"Data Analyst"}
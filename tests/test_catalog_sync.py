@@ -0,0 +1,141 @@
+# tests/test_catalog_sync.py
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.ml import role_matrix
+from src.parsing.ml.skill_matcher_db import SKILL_SYNONYMS, ParsedResume, RoleCatalog, score_resume, sync_role_catalog
+from src.parsing.ml.skill_normalizer import SynonymIndex, build_index
+
+def test_synonym_index_updates_match_a_full_rebuild():
+    rng = random.Random(7)
+    current = {name: list(synonyms) for name, synonyms in SKILL_SYNONYMS.items()}
+    index = SynonymIndex(current)
+    spellings = [spelling for synonyms in SKILL_SYNONYMS.values() for spelling in synonyms] + ["new", "api"]
+    for step in range(300):
+        name = rng.choice(list(current) + [f"skill{step % 7}"])
+        if rng.random() < 0.3:
+            change = None
+            current.pop(name, None)
+        else:
+            change = rng.sample(spellings, rng.randint(0, 4))
+            current[name] = change
+        before = dict(index.index)
+        changed = index.update({name: change})
+        assert index.index == build_index(current)
+        assert changed == {s for s in before.keys() | index.index.keys() if before.get(s) != index.index.get(s)}
+
+def test_patched_matrix_matches_a_fresh_build(monkeypatch):
+    monkeypatch.setattr(role_matrix, "MAX_OVERRIDES", 5)  # exercise compaction too
+    rng = random.Random(3)
+    vocabulary = [f"s{i}" for i in range(30)]
+    roles = {f"r{i}": rng.sample(vocabulary, rng.randint(0, 6)) for i in range(40)}
+    matrix = role_matrix.RoleMatrix(list(roles), list(roles.values()), [len(v) for v in roles.values()])
+    for step in range(60):
+        name = f"r{rng.randrange(50)}"
+        if rng.random() < 0.3:
+            roles.pop(name, None)
+            matrix.remove_role(name)
+        else:
+            roles.pop(name, None)  # a changed role keeps its place in the matrix, so compare scores by name
+            roles[name] = rng.sample(vocabulary, rng.randint(0, 6))
+            matrix.update_role(name, roles[name], len(roles[name]))
+        fresh = role_matrix.RoleMatrix(list(roles), list(roles.values()), [len(v) for v in roles.values()])
+        skills = rng.sample(vocabulary, 8)
+        patched = {role: score for role, score in zip(matrix._state.roles, matrix.scores(skills))
+                   if matrix._state.role_index.get(role) is not None}
+        assert patched == dict(zip(fresh.roles, fresh.scores(skills)))
+        assert sorted(matrix.roles) == sorted(roles)
+        assert len(matrix) == len(roles)
+
+class FakeSyncRepo:
+    def __init__(self, roles=(), skills=(), deletions=()):
+        self.roles, self.skills, self.deletions = list(roles), list(skills), list(deletions)
+        self.since = []
+
+    def get_job_roles_changed_since(self, since):
+        self.since.append(since)
+        return self.roles
+
+    def get_skills_changed_since(self, since):
+        return self.skills
+
+    def get_catalog_deletions_since(self, since):
+        return self.deletions
+
+def base_catalog():
+    catalog = RoleCatalog({"Analyst": ["SQL", "Excel"], "Backend": ["Python", "Docker", "Golang"]},
+                          {**SKILL_SYNONYMS})
+    catalog.matrix
+    catalog.watermarks = {table: datetime.fromisoformat("2026-01-01T00:00:00+00:00")
+                          for table in ("job_roles", "skills_database", "catalog_deletions")}
+    catalog.row_stamps = {"job_roles": {"Analyst": catalog.watermarks["job_roles"], "Backend": catalog.watermarks["job_roles"]},
+                          "skills_database": {}}
+    return catalog
+
+def test_sync_patches_roles_synonyms_and_deletions():
+    catalog = base_catalog()
+    repo = FakeSyncRepo(
+        roles=[{"role_name": "Data Engineer", "required_skills": ["SQL", "Spark"], "updated_at": "2026-02-01T10:00:00+00:00"},
+               {"role_name": "Analyst", "required_skills": ["SQL", "Excel"], "updated_at": "2026-02-01T10:00:01.5+00:00"}],
+        skills=[{"skill_name": "Go", "synonyms": ["go", "golang"], "last_updated": "2026-02-01T11:00:00Z"}],
+        deletions=[{"table_name": "job_roles", "row_name": "Analyst", "deleted_at": "2026-02-01T09:00:00+00:00"},
+                   {"table_name": "job_roles", "row_name": "Backend", "deleted_at": "2026-02-01T12:00:00+00:00"}],
+    )
+    catalog = sync_role_catalog(catalog, repo)
+
+    # Analyst re-written after its tombstone stays; Backend is gone; Golang now normalizes to "go"
+    assert set(catalog.roles) == {"Analyst", "Data Engineer"}
+    assert catalog.normalizer("Golang") == "go"
+    assert repo.since[0].startswith("2025-12-31T23:58:00")  # watermark minus the overlap window
+    assert catalog.watermarks["job_roles"].isoformat() == "2026-02-01T10:00:01.500000+00:00"
+
+    expected = RoleCatalog({"Analyst": ["SQL", "Excel"], "Data Engineer": ["SQL", "Spark"]},
+                           {**SKILL_SYNONYMS, "go": ["go", "golang"]})
+    for skills in (("postgres", "spark"), ("excel",), ()):
+        parsed = ParsedResume(skills=skills)
+        assert score_resume(parsed, catalog)["predictions"] == score_resume(parsed, expected)["predictions"]
+
+def test_synonym_change_rescores_only_affected_roles():
+    catalog = base_catalog()
+    assert catalog.required["Backend"].keys() == {"python", "docker", "golang"}
+    repo = FakeSyncRepo(skills=[{"skill_name": "Go", "synonyms": ["golang"], "last_updated": "2026-02-01T11:00:00+00:00"}])
+    catalog = sync_role_catalog(catalog, repo)
+    assert catalog.required["Backend"].keys() == {"python", "docker", "go"}
+    assert score_resume(ParsedResume(skills=("go", "python")), catalog, "Backend")["match_score"] == (2 / 3) * 100
+
+    # Same rows again (overlap window): nothing to apply
+    before = dict(catalog.required)
+    catalog = sync_role_catalog(catalog, repo)
+    assert catalog.required == before
+
+def test_sync_leaves_the_served_catalog_untouched():
+    catalog = base_catalog()
+    served = score_resume(ParsedResume(skills=("golang", "sql")), catalog)["predictions"]
+    repo = FakeSyncRepo(
+        roles=[{"role_name": "Data Engineer", "required_skills": ["SQL", "Spark"], "updated_at": "2026-02-01T10:00:00+00:00"}],
+        skills=[{"skill_name": "Go", "synonyms": ["golang"], "last_updated": "2026-02-01T11:00:00+00:00"}],
+        deletions=[{"table_name": "job_roles", "row_name": "Analyst", "deleted_at": "2026-02-01T12:00:00+00:00"}],
+    )
+    synced = sync_role_catalog(catalog, repo)
+
+    assert set(synced.roles) == {"Backend", "Data Engineer"} and synced.normalizer("Golang") == "go"
+    assert set(catalog.roles) == {"Analyst", "Backend"} and catalog.normalizer("Golang") == "golang"
+    assert "go" not in catalog.synonyms and set(catalog.row_stamps["job_roles"]) == {"Analyst", "Backend"}
+    assert catalog.matrix.roles == ["Analyst", "Backend"]
+    assert score_resume(ParsedResume(skills=("golang", "sql")), catalog)["predictions"] == served
+
+def test_renamed_role_replaces_its_old_name():
+    catalog = base_catalog()
+    # A rename is the new row plus a tombstone for the old name, both stamped by the same transaction
+    repo = FakeSyncRepo(
+        roles=[{"role_name": "Data Analyst", "required_skills": ["SQL", "Excel"], "updated_at": "2026-02-01T10:00:00+00:00"}],
+        deletions=[{"table_name": "job_roles", "row_name": "Analyst", "deleted_at": "2026-02-01T10:00:00+00:00"}],
+    )
+    catalog = sync_role_catalog(catalog, repo)
+    assert set(catalog.roles) == {"Backend", "Data Analyst"}
+    assert catalog.matrix.roles == ["Backend", "Data Analyst"]
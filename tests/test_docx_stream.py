@@ -0,0 +1,73 @@
+# tests/test_docx_stream.py
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.parsing.docx_parser import extract_text_from_docx
+
+docx = pytest.importorskip("docx")
+
+SIMPLE_DOCX = project_root / "tests" / "tests" / "test_data" / "docs" / "simple.docx"
+
+@pytest.fixture
+def merged_table_docx(tmp_path):
+    """Paragraph, 3x3 table with a horizontal and a vertical merge, paragraph"""
+    document = docx.Document()
+    document.add_paragraph("SKILLS")
+    table = document.add_table(rows=3, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 2)).text = "Technical Skills"
+    table.cell(1, 0).merge(table.cell(2, 0)).text = "Languages"
+    table.cell(1, 1).text = "Python"
+    table.cell(1, 2).text = "SQL"
+    table.cell(2, 1).text = "Java"
+    table.cell(2, 2).text = "Go"
+    document.add_paragraph("EXPERIENCE")
+    path = tmp_path / "merged.docx"
+    document.save(path)
+    return path
+
+def test_stream_emits_each_merged_cell_once_in_document_order(merged_table_docx):
+    text = extract_text_from_docx(merged_table_docx, engine="stream")
+    assert text.split("\n") == ["SKILLS", "Technical Skills", "Languages", "Python", "SQL",
+                                "Java", "Go", "EXPERIENCE"]
+
+def test_python_docx_engine_repeats_merged_cells(merged_table_docx):
+    text = extract_text_from_docx(merged_table_docx, engine="python-docx")
+    assert text.count("Technical Skills") == 3
+    assert text.count("Languages") == 2
+
+def test_engines_agree_without_tables():
+    assert extract_text_from_docx(SIMPLE_DOCX, engine="stream") == extract_text_from_docx(SIMPLE_DOCX)
+
+def test_stream_accepts_bytes():
+    data = SIMPLE_DOCX.read_bytes()
+    assert extract_text_from_docx(data, engine="stream") == extract_text_from_docx(SIMPLE_DOCX, engine="stream")
+
+def test_tab_stops_are_not_tab_characters(tmp_path):
+    from docx.shared import Inches
+    document = docx.Document()
+    paragraph = document.add_paragraph("Python\tSQL")
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(1))
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(2))
+    path = tmp_path / "tabs.docx"
+    document.save(path)
+    assert extract_text_from_docx(path, engine="stream") == "Python\tSQL"
+
+def test_stream_detaches_every_finished_element(merged_table_docx, monkeypatch):
+    from src.parsing import docx_parser
+    iterparse = docx_parser.ET.iterparse
+    roots = []
+
+    def recording_iterparse(source, events=None):
+        for event, elem in iterparse(source, events):
+            if not roots:
+                roots.append(elem)
+            yield event, elem
+
+    monkeypatch.setattr(docx_parser.ET, "iterparse", recording_iterparse)
+    assert extract_text_from_docx(merged_table_docx, engine="stream")
+    # Only <w:document> itself is left: the body and everything in it were dropped once read
+    assert len(list(roots[0].iter())) == 1
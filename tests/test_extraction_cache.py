@@ -0,0 +1,73 @@
+# tests/test_extraction_cache.py
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+import src.parsing as parsing
+from src.parsing import extraction_cache, pdf_parser_improved
+from src.parsing.extraction_cache import ExtractionCache, file_sha256
+
+TEST_DATA = project_root / "tests" / "tests" / "test_data"
+SIMPLE_PDF = TEST_DATA / "pdfs" / "simple.pdf"
+SIMPLE_DOCX = TEST_DATA / "docs" / "simple.docx"
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ExtractionCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(extraction_cache, "_cache", cache)
+    return cache
+
+def test_key_includes_digest_and_parser_version(tmp_path):
+    v1 = ExtractionCache(tmp_path, version="1")
+    v2 = ExtractionCache(tmp_path, version="2")
+    digest = file_sha256(SIMPLE_PDF)
+
+    assert digest in v1.key(digest)
+    assert v1.key(digest) != v2.key(digest)
+    assert v1.key(digest, "hybrid") != v1.key(digest, "fallback")
+
+def test_update_merges_fields(cache):
+    cache.update("k", raw_text="text")
+    cache.update("k", sections={"skills": ["Python"]})
+
+    assert cache.get("k") == {"raw_text": "text", "sections": {"skills": ["Python"]}}
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ExtractionCache(tmp_path, max_bytes=300)  # room for three ~95-byte entries
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.update(key, raw_text="x" * 80)
+        os.utime(tmp_path / f"{key}.json", (1000 + i, 1000 + i))
+
+    cache.get("a")  # "b" is now the least recently used
+    cache.update("d", raw_text="x" * 80)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c") and cache.get("d")
+
+def test_repeat_pdf_extraction_skips_the_engines(cache, monkeypatch):
+    first = pdf_parser_improved.extract_text_from_pdf(str(SIMPLE_PDF))
+    assert first
+
+    def fail(*args, **kwargs):
+        raise AssertionError("extractor ran on a cached file")
+
+    monkeypatch.setattr(pdf_parser_improved.pdf_extractor, "extract_text", fail)
+    assert pdf_parser_improved.extract_text_from_pdf(str(SIMPLE_PDF)) == first
+
+def test_repeat_parse_returns_cached_sections(cache, monkeypatch):
+    sections = {"skills": ["Python"], "education": [], "experience": [], "certifications": []}
+    calls = []
+
+    def fake_sections(text, file_path=None):
+        calls.append(text)
+        return sections
+
+    monkeypatch.setattr(parsing, "extract_sections", fake_sections)
+
+    assert parsing.parse_resume(str(SIMPLE_DOCX)) == sections
+    assert parsing.parse_resume(str(SIMPLE_DOCX)) == sections
+    assert len(calls) == 1
@@ -0,0 +1,118 @@
+# tests/test_http_pool.py
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.http_pool import MeteredTransport, create_http_client
+
+def _metered(monkeypatch, handler):
+    monkeypatch.setattr(httpx.HTTPTransport, "handle_request", lambda self, request: handler(request))
+    return MeteredTransport(httpx.Limits(max_connections=4, max_keepalive_connections=2))
+
+def test_pool_is_bounded_with_http2_and_timeouts():
+    client = create_http_client(max_connections=7, max_keepalive=3, connect_timeout=2, read_timeout=9)
+    try:
+        stats = client._transport.stats()
+        assert stats["max_connections"] == 7 and stats["max_keepalive_connections"] == 3
+        assert stats["connections"] == 0 and stats["utilization"] == 0.0
+        assert client.timeout.connect == 2 and client.timeout.read == 9
+        assert client._transport._pool._http2
+    finally:
+        client.close()
+
+def test_requests_are_counted_while_in_flight(monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+
+    def handler(request):
+        entered.set()
+        release.wait(5)
+        return httpx.Response(200, json=[], request=request)
+
+    client = httpx.Client(transport=_metered(monkeypatch, handler))
+    thread = threading.Thread(target=client.get, args=("https://example.test/rest/v1/job_roles",))
+    thread.start()
+    entered.wait(5)
+    assert client._transport.stats()["in_flight"] == 1
+    release.set()
+    thread.join(5)
+
+    stats = client._transport.stats()
+    assert stats["in_flight"] == 0 and stats["peak_in_flight"] == 1 and stats["requests"] == 1
+
+def test_supabase_sub_clients_share_the_pooled_client(monkeypatch):
+    from supabase import ClientOptions, create_client
+
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json=[{"category": "Data"}], request=request)
+
+    http_client = httpx.Client(transport=_metered(monkeypatch, handler))
+    client = create_client("https://project.supabase.co", "anon-key",
+                           ClientOptions(auto_refresh_token=False, httpx_client=http_client))
+    response = client.table("job_roles").select("category").execute()
+
+    assert response.data == [{"category": "Data"}]
+    assert seen[0].url.path == "/rest/v1/job_roles" and seen[0].headers["apikey"] == "anon-key"
+    assert http_client._transport.stats()["requests"] == 1
+
+def test_each_session_gets_its_own_client_on_the_shared_pool(monkeypatch):
+    import streamlit as st
+    from supabase import ClientOptions
+    from src.database import supabase_client
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["authorization"])
+        return httpx.Response(200, json=[], request=request)
+
+    http_client = httpx.Client(transport=_metered(monkeypatch, handler))
+    monkeypatch.setattr(st, "secrets", {"SUPABASE_URL": "https://project.supabase.co", "SUPABASE_KEY": "anon-key"})
+    monkeypatch.setattr("src.database.http_pool.get_http_client", lambda: http_client)
+    monkeypatch.setattr(supabase_client, "_supabase_client", None)
+
+    first, second = supabase_client.init_supabase(), supabase_client.init_supabase()
+    assert first is not second
+    assert first.options.httpx_client is second.options.httpx_client is http_client
+
+    # Signing in on one session's client leaves the other one anonymous
+    first._listen_to_auth_events("SIGNED_IN", SimpleNamespace(access_token="user-token"))
+    first.table("resumes").select("id").execute()
+    second.table("resumes").select("id").execute()
+    assert seen == ["Bearer user-token", "Bearer anon-key"]
+    # Sessions never replace the process-wide client
+    assert supabase_client._supabase_client is None
+
+def test_shared_client_is_created_once_under_concurrent_first_use(monkeypatch):
+    from src.database import supabase_client
+
+    created = []
+
+    def create():
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setattr(supabase_client, "_supabase_client", None)
+    monkeypatch.setattr(supabase_client, "_create_client", create)
+    start = threading.Barrier(8)
+
+    def first_use():
+        start.wait()
+        supabase_client.get_supabase_client()
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    assert supabase_client.get_supabase_client() is created[0]
+    assert supabase_client.init_supabase() is not created[0]
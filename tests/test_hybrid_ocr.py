@@ -0,0 +1,65 @@
+# tests/test_hybrid_ocr.py
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from PIL import Image
+from PyPDF2 import PdfReader, PdfWriter
+from src.parsing import pdf_parser_improved
+from src.parsing.ocr_pool import OcrPage
+from src.parsing.pdf_document import PdfDocument
+
+SIMPLE_PDF = project_root / "tests" / "tests" / "test_data" / "pdfs" / "simple.pdf"
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """Typed page, scanned (image-only) page, typed page"""
+    scanned = tmp_path / "scanned.pdf"
+    Image.new("RGB", (200, 200), color="white").save(scanned)
+
+    writer = PdfWriter()
+    typed_page = PdfReader(str(SIMPLE_PDF)).pages[0]
+    writer.add_page(typed_page)
+    writer.add_page(PdfReader(str(scanned)).pages[0])
+    writer.add_page(typed_page)
+
+    path = tmp_path / "mixed.pdf"
+    with path.open("wb") as f:
+        writer.write(f)
+    return path
+
+def test_hybrid_only_ocrs_pages_without_text(mixed_pdf, monkeypatch):
+    extractor = pdf_parser_improved.CrossPlatformPDFExtractor()
+    extractor.tesseract_path = "tesseract"
+    rendered = []
+
+    def fake_render(document, page_numbers):
+        rendered.extend(page_numbers)
+        return [f"image-{number}" for number in page_numbers]
+
+    def fake_ocr(images, config="", page_numbers=None):
+        return [OcrPage(number, f"CERTIFICATE FROM {image}", 1.0) for number, image in zip(page_numbers, images)]
+
+    monkeypatch.setattr(pdf_parser_improved, "OCR_AVAILABLE", True)
+    monkeypatch.setattr(extractor, "_render_pages", fake_render)
+    monkeypatch.setattr(pdf_parser_improved, "ocr_images", fake_ocr)
+
+    with PdfDocument(mixed_pdf) as document:
+        text = extractor.extract_text(document, mode="hybrid")
+        typed = document.page_texts[0].strip()
+        assert document.engine == "hybrid"
+
+    assert rendered == [2]
+    first, ocr_pos, last = text.find(typed), text.find("CERTIFICATE FROM image-2"), text.rfind(typed)
+    assert -1 < first < ocr_pos < last
+
+def test_hybrid_without_ocr_keeps_text_layers(mixed_pdf, monkeypatch):
+    monkeypatch.setattr(pdf_parser_improved, "OCR_AVAILABLE", False)
+    extractor = pdf_parser_improved.CrossPlatformPDFExtractor()
+
+    with PdfDocument(mixed_pdf) as document:
+        text = extractor.extract_text(document, mode="hybrid")
+        assert text.count(document.page_texts[0].strip()) == 2
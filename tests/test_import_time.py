@@ -0,0 +1,41 @@
+# tests/test_import_time.py
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Loaded on first use only; importing any of them at startup costs ~1s
+HEAVY_MODULES = ("pdfplumber", "pdfminer", "pytesseract", "pdf2image", "PIL",
+                 "docx", "pandas", "supabase", "streamlit", "httpx")
+
+# Measured ~0.07s after the change (was ~1.2s); generous for slow CI machines
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = """\
+import json, sys, time
+start = time.perf_counter()
+import src.parsing
+import src.parsing.advanced_pdf_parser
+import src.parsing.pdf_parser_final
+import src.parsing.ml.skill_matcher
+import src.parsing.ml.skill_matcher_db
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+def _probe() -> dict:
+    # Fresh interpreter so nothing imported by other tests skews the result
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=project_root,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_heavy_dependencies_are_not_imported_at_startup():
+    assert _probe()["loaded"] == []
+
+def test_import_time_budget():
+    # Best of three to ignore a cold disk cache
+    elapsed = min(_probe()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"cold import took {elapsed:.2f}s"
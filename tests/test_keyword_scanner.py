@@ -0,0 +1,41 @@
+# tests/test_keyword_scanner.py
+import re
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.enhanced_parser import TECHNICAL_SKILLS, extract_skills_from_text_keywords
+from src.parsing.keyword_scanner import KeywordMatch, KeywordScanner
+
+TEXT = ("Built machine learning pipelines in Python and SQL on AWS; "
+        "wrote C++, Go and node.js services. Googled a lot, used sqlite.")
+
+def test_matches_carry_spans_and_canonical_names():
+    scanner = KeywordScanner.from_synonyms({"javascript": ["js", "node.js"], "python": ["py"]})
+    text = "Services in Node.js"
+    # "js" is a word of its own after the dot, like r"\bjs\b"
+    assert scanner.find_all(text) == [KeywordMatch(12, 19, "node.js", "javascript"),
+                                      KeywordMatch(17, 19, "js", "javascript")]
+    assert text[12:19] == "Node.js"
+    assert scanner.skills(text) == ["javascript"]
+
+def test_overlapping_keywords_are_all_reported():
+    scanner = KeywordScanner(["machine learning", "learning", "machine"])
+    assert [m.keyword for m in scanner.finditer("machine learning")] == ["machine", "machine learning", "learning"]
+
+def test_word_boundaries():
+    scanner = KeywordScanner(["go", "sql", "c++", "ai"])
+    assert scanner.skills(TEXT) == ["sql", "c++", "go"]  # not "Googled", "sqlite" or "pipelines"
+
+def test_offsets_survive_characters_that_lowercase_to_two():
+    text = "İstanbul: Python"
+    [match] = KeywordScanner(["python"]).find_all(text)
+    assert text[match.start:match.end] == "Python"
+
+def test_same_skills_as_the_regex_loop_for_word_keywords():
+    words = [skill for skill in TECHNICAL_SKILLS if re.fullmatch(r"[\w ]+", skill)]
+    expected = {skill for skill in words if re.search(r'\b' + re.escape(skill) + r'\b', TEXT.lower())}
+    assert set(KeywordScanner(words).skills(TEXT)) == expected
+    assert expected <= set(extract_skills_from_text_keywords(TEXT))
@@ -0,0 +1,73 @@
+# tests/test_log_events.py
+import json
+import logging
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.parsing import extraction_cache, parse_resume
+from src.parsing.log_events import Event, JsonFormatter, log_event, parse_levels
+
+SIMPLE_PDF = project_root / "tests" / "tests" / "test_data" / "pdfs" / "simple.pdf"
+
+class Expensive:
+    """Field value that records whether it was ever rendered"""
+    rendered = 0
+
+    def __str__(self):
+        Expensive.rendered += 1
+        return "expensive"
+
+def test_disabled_events_are_never_formatted(caplog):
+    logger = logging.getLogger("src.tests.disabled")
+    caplog.set_level(logging.INFO, logger="src.tests.disabled")
+    Expensive.rendered = 0
+
+    log_event(logger, logging.DEBUG, "demo.debug", value=Expensive())
+    assert caplog.records == []
+    assert Expensive.rendered == 0
+
+def test_events_carry_structured_fields(caplog):
+    logger = logging.getLogger("src.tests.enabled")
+    caplog.set_level(logging.INFO, logger="src.tests.enabled")
+
+    log_event(logger, logging.INFO, "pdf.extracted", engine="pypdfium2", chars=120, elapsed_ms=3.25)
+    [record] = caplog.records
+    assert record.event == "pdf.extracted"
+    assert record.fields == {"engine": "pypdfium2", "chars": 120, "elapsed_ms": 3.25}
+    assert record.getMessage() == "pdf.extracted engine=pypdfium2 chars=120 elapsed_ms=3.2"
+
+def test_json_formatter_emits_one_object():
+    record = logging.LogRecord("src.x", logging.INFO, __file__, 1, "%s", (Event("e", {"a": 1}),), None)
+    record.event, record.fields = "e", {"a": 1}
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["event"] == "e" and payload["a"] == 1 and payload["level"] == "INFO"
+
+def test_per_module_levels():
+    assert parse_levels("WARNING, src.parsing.enhanced_parser=debug") == {
+        "src": logging.WARNING, "src.parsing.enhanced_parser": logging.DEBUG}
+    with pytest.raises(ValueError):
+        parse_levels("src=LOUD")
+
+def test_parse_path_logs_instead_of_printing(tmp_path, monkeypatch, capsys, caplog):
+    monkeypatch.setattr(extraction_cache, "_cache", extraction_cache.ExtractionCache(tmp_path))
+    caplog.set_level(logging.INFO, logger="src")
+
+    assert parse_resume(str(SIMPLE_PDF))
+    assert capsys.readouterr().out == ""
+    events = {record.event: record.fields for record in caplog.records if hasattr(record, "event")}
+    assert events["pdf.extracted"]["engine"] == "pypdfium2"
+    assert events["sections.extracted"]["skills_found"] > 0
+
+def test_secondary_extractors_log_instead_of_printing(capsys, caplog):
+    from src.parsing.advanced_pdf_parser import extract_text_advanced, is_scanned_pdf
+    caplog.set_level(logging.DEBUG, logger="src")
+
+    assert extract_text_advanced(str(SIMPLE_PDF), use_ocr=False)
+    assert is_scanned_pdf(project_root / "does_not_exist.pdf")
+    assert capsys.readouterr().out == ""
+    events = [record.event for record in caplog.records if hasattr(record, "event")]
+    assert "pdf.engine" in events and "pdf.scan_check_failed" in events
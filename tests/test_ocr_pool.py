@@ -0,0 +1,54 @@
+# tests/test_ocr_pool.py
+import sys
+import textwrap
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+pytesseract = pytest.importorskip("pytesseract")
+from PIL import Image
+from src.parsing import ocr_pool
+
+FAKE_TESSERACT = """\
+#!{python}
+# Stand-in for tesseract: "reads" the image width and sleeps longer for
+# earlier pages, so completion order is the reverse of page order.
+import os, sys, time
+from PIL import Image
+width = Image.open(sys.argv[1]).width
+time.sleep(0.05 * (5 - width // 10))
+with open(sys.argv[2] + ".txt", "w") as f:
+    f.write(f"width={{width}} threads={{os.environ.get('OMP_THREAD_LIMIT')}}")
+"""
+
+@pytest.fixture
+def fake_tesseract(tmp_path, monkeypatch):
+    script = tmp_path / "tesseract"
+    script.write_text(textwrap.dedent(FAKE_TESSERACT.format(python=sys.executable)))
+    script.chmod(0o755)
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", str(script))
+    ocr_pool.configure_ocr_pool(2)
+    yield script
+    ocr_pool.shutdown_ocr_pool()
+
+def test_pages_come_back_in_order(fake_tesseract):
+    images = [Image.new("L", (10 * (i + 1), 10), color=255) for i in range(4)]
+
+    pages = ocr_pool.ocr_images(images)
+
+    assert [page.page_number for page in pages] == [1, 2, 3, 4]
+    assert [page.text.split()[0] for page in pages] == ["width=10", "width=20", "width=30", "width=40"]
+    assert all(page.elapsed_ms > 0 for page in pages)
+
+def test_workers_run_single_threaded_tesseract(fake_tesseract):
+    pages = ocr_pool.ocr_images([Image.new("L", (40, 10))], page_numbers=[7])
+
+    assert pages[0].page_number == 7
+    assert "threads=1" in pages[0].text
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        ocr_pool.configure_ocr_pool(0)
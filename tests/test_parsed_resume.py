@@ -0,0 +1,64 @@
+# tests/test_parsed_resume.py
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.ml import skill_matcher_db
+from src.parsing.ml.skill_matcher_db import (SKILL_SYNONYMS, ParsedResume, RoleCatalog, compute_skill_gap,
+                                             score_resume)
+
+ROLES = {
+    "Junior Data Scientist": ["Python", "Pandas", "Numpy", "SQL", "Statistics", "Scikit-learn"],
+    "Data Analyst": ["SQL", "Excel", "Data Visualization", "Statistics"],
+    "Backend Developer": ["Python", "Docker", "REST API", "Git"],
+}
+
+PARSED = ParsedResume(skills=("py", "pandas", "postgres", "Docker", "github"),
+                      education=("BSc Statistics",), experience=("Analyst at Acme",))
+
+def _catalog() -> RoleCatalog:
+    return RoleCatalog(ROLES, SKILL_SYNONYMS)
+
+def test_score_matches_per_role_gap():
+    catalog = _catalog()
+    for role, required in ROLES.items():
+        result = score_resume(PARSED, catalog, role)
+        expected = compute_skill_gap(list(PARSED.skills), required, SKILL_SYNONYMS)
+        assert sorted(result["gap"]["matched"]) == sorted(expected["matched"])
+        assert sorted(result["gap"]["missing"]) == sorted(expected["missing"])
+        assert result["match_score"] == len(expected["matched"]) / len(required) * 100
+        assert result["required_skills"] == required
+
+def test_score_picks_best_role_by_default():
+    result = score_resume(PARSED, _catalog())
+    assert result["chosen_role"] == "Backend Developer"
+    assert result["predictions"][0] == ("Backend Developer", 75.0)
+    assert result["parsed"] == PARSED.as_dict()
+
+def test_manual_skill_edits_rescore_without_parsing():
+    catalog = _catalog()
+    before = score_resume(PARSED, catalog, "Data Analyst")["match_score"]
+
+    added = PARSED.add_skill("Excel")
+    assert score_resume(added, catalog, "Data Analyst")["match_score"] > before
+    assert PARSED.skills == ("py", "pandas", "postgres", "Docker", "github")  # unchanged
+
+    removed = added.remove_skill("excel").remove_skill("POSTGRES")
+    assert "Excel" not in removed.skills and "postgres" not in removed.skills
+    assert score_resume(removed, catalog, "Data Analyst")["match_score"] < before
+
+def test_analyze_resume_parses_once_and_scores(monkeypatch):
+    calls = []
+
+    def fake_parse(file_path):
+        calls.append(file_path)
+        return PARSED.as_dict()
+
+    monkeypatch.setattr(skill_matcher_db, "parse_resume_structured", fake_parse)
+    monkeypatch.setattr(skill_matcher_db, "load_role_catalog", _catalog)
+
+    result = skill_matcher_db.analyze_resume(b"%PDF-", chosen_role="Data Analyst")
+    assert calls == [b"%PDF-"]
+    assert result == score_resume(PARSED, _catalog(), "Data Analyst")
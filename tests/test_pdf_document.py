@@ -0,0 +1,75 @@
+# tests/test_pdf_document.py
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pdfplumber
+import pytest
+from src.parsing.pdf_document import PdfDocument, open_pdf_document
+from src.parsing.pdf_table_extractor import extract_skills_from_pdf_tables
+from src.parsing.advanced_pdf_parser import is_scanned_pdf
+from src.parsing.pdf_parser_improved import CrossPlatformPDFExtractor
+
+TABLES_PDF = project_root / "tests" / "tests" / "test_data" / "pdfs" / "tables.pdf"
+
+@pytest.fixture
+def open_calls(monkeypatch):
+    """Count how many times pdfplumber parses a file"""
+    calls = []
+    real_open = pdfplumber.open
+
+    def counting_open(*args, **kwargs):
+        calls.append(args[0])
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr(pdfplumber, "open", counting_open)
+    return calls
+
+def test_stages_share_one_pdfplumber_parse(open_calls):
+    """Text, tables and the scanned check all reuse the session's pages"""
+    with PdfDocument(TABLES_PDF) as document:
+        extractor = CrossPlatformPDFExtractor()
+        extractor._try_pdfplumber(document)
+        extract_skills_from_pdf_tables(document)
+        is_scanned_pdf(document)
+        assert document.page_texts
+
+    assert len(open_calls) == 1
+
+def test_engine_results_are_cached_on_the_session():
+    extractor = CrossPlatformPDFExtractor()
+    with PdfDocument(TABLES_PDF) as document:
+        text = extractor.extract_text(document)
+        assert text
+        assert document.engine in document.text_layers
+
+        document.text_layers[document.engine] = "cached text"
+        assert extractor.extract_text(document) == "cached text"
+
+def test_open_pdf_document_only_closes_what_it_opened():
+    with PdfDocument(TABLES_PDF) as document:
+        with open_pdf_document(document) as same:
+            assert same is document
+            same.page_texts
+        # The caller's session is still usable
+        assert document._pdf is not None
+
+    with open_pdf_document(str(TABLES_PDF)) as owned:
+        owned.page_texts
+    assert owned._pdf is None
+
+def test_closed_session_does_not_reopen_handles():
+    with PdfDocument(TABLES_PDF) as document:
+        texts = document.pdfium_page_texts
+    assert document.pdfium_page_texts == texts  # cached results stay readable
+    with pytest.raises(ValueError):
+        document.pdfium
+    with pytest.raises(ValueError):
+        document.pdf
+    assert document._pdfium is None and document._pdf is None
+
+def test_missing_file_raises():
+    with pytest.raises(FileNotFoundError):
+        PdfDocument(project_root / "does_not_exist.pdf")
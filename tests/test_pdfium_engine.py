@@ -0,0 +1,36 @@
+# tests/test_pdfium_engine.py
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.pdf_document import PdfDocument
+from src.parsing.pdf_parser_improved import CrossPlatformPDFExtractor
+
+TEST_DATA = project_root / "tests" / "tests" / "test_data" / "pdfs"
+SIMPLE_PDF = TEST_DATA / "simple.pdf"
+TABLES_PDF = TEST_DATA / "tables.pdf"
+
+def test_pypdfium2_is_first_in_the_chain():
+    extractor = CrossPlatformPDFExtractor()
+    with PdfDocument(SIMPLE_PDF) as document:
+        text = extractor.extract_text(document, mode="fallback")
+        assert document.engine == "pypdfium2"
+        # Slower engines never ran
+        assert set(document.text_layers) == {"pypdfium2"}
+    assert "Python, Machine Learning, SQL" in text
+
+def test_pdfium_text_matches_pdfplumber_per_page():
+    with PdfDocument(TABLES_PDF.read_bytes()) as document:
+        assert len(document.pdfium_page_texts) == document.page_count
+        for pdfium_text, plumber_text in zip(document.pdfium_page_texts, document.page_texts):
+            assert pdfium_text.split() == plumber_text.split()
+
+def test_render_pages_in_process():
+    with PdfDocument(SIMPLE_PDF.read_bytes()) as document:
+        [low] = document.render_pages([1], dpi=72)
+        [high] = document.render_pages([1], dpi=144)
+    # 72 dpi is one pixel per PDF point (A4 is 595 x 842 pt)
+    assert abs(low.size[0] - 595) <= 1 and abs(low.size[1] - 842) <= 1
+    assert abs(high.size[0] - 2 * low.size[0]) <= 2
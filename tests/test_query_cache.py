@@ -0,0 +1,118 @@
+# tests/test_query_cache.py
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database import QueryCache, SkillRepository
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client, self.table = client, table
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self.client.queries.append(self.table)
+        time.sleep(self.client.delay)
+        return SimpleNamespace(data=[dict(row) for row in self.client.rows[self.table]])
+
+class FakeClient:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.queries = []
+        self.rows = {
+            "job_roles": [{"role_name": "Data Analyst", "required_skills": '["SQL", "Excel"]', "category": "Data"}],
+            "skills_database": [{"skill_name": "sql", "synonyms": ["sql", "postgres"], "category": "Data"}],
+        }
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+def test_repeated_reads_hit_the_cache():
+    client = FakeClient()
+    repo = SkillRepository(client, cache=QueryCache(ttl=60))
+    assert repo.get_all_job_roles() == {"Data Analyst": ["SQL", "Excel"]}
+    assert repo.get_all_job_roles() == {"Data Analyst": ["SQL", "Excel"]}
+    assert repo.get_role_categories() == ["Data"]
+    assert repo.get_role_categories() == ["Data"]
+    assert client.queries == ["job_roles", "job_roles"]
+    stats = repo.cache_stats()
+    # job_roles:all is derived from the cached job_roles:rows entry: 3 loads, 2 queries
+    assert stats["hits"] == 2 and stats["misses"] == 3 and stats["refreshes"] == 3
+
+def test_concurrent_misses_share_one_query():
+    client = FakeClient(delay=0.2)
+    cache = QueryCache(ttl=60)
+    results = []
+
+    def read():
+        results.append(SkillRepository(client, cache=cache).get_all_skills())
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.queries == ["skills_database"]
+    assert len(results) == 8 and all(result is results[0] for result in results)
+    assert cache.stats()["coalesced"] == 7
+
+def test_ttl_expiry_and_invalidation():
+    client = FakeClient()
+    cache = QueryCache(ttl=0.05)
+    repo = SkillRepository(client, cache=cache)
+    repo.get_all_skills()
+    time.sleep(0.06)
+    repo.get_all_skills()
+    assert client.queries == ["skills_database"] * 2
+
+    cache.ttl = 60
+    repo.get_all_skills()
+    repo.add_custom_skill("rust", "Programming")  # insert invalidates "skills:"
+    repo.get_all_skills()
+    assert client.queries == ["skills_database"] * 4  # cached read, then insert + re-read
+
+def test_failures_are_not_cached():
+    cache = QueryCache(ttl=60)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("timeout")
+        return ["ok"]
+
+    try:
+        cache.get_or_load("k", flaky)
+    except RuntimeError:
+        pass
+    assert cache.get_or_load("k", flaky) == ["ok"]
+    assert cache.stats()["errors"] == 1
+
+def test_invalidate_during_load_discards_the_result():
+    cache = QueryCache(ttl=60)
+
+    def load():
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get_or_load("k", load) == "stale"
+    assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+
+def test_empty_catalog_reads_are_not_cached():
+    client = FakeClient()
+    rows = client.rows["job_roles"]
+    client.rows["job_roles"] = []  # what an unauthorized client sees under RLS
+    repo = SkillRepository(client, cache=QueryCache(ttl=60, cache_empty=False))
+    assert repo.get_all_job_roles() == {}
+
+    client.rows["job_roles"] = rows
+    assert repo.get_all_job_roles() == {"Data Analyst": ["SQL", "Excel"]}
+    assert repo.get_all_job_roles() == {"Data Analyst": ["SQL", "Excel"]}
+    assert client.queries == ["job_roles", "job_roles"]
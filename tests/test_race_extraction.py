@@ -0,0 +1,95 @@
+# tests/test_race_extraction.py
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.parsing.pdf_document import PdfDocument
+from src.parsing.pdf_parser_improved import CrossPlatformPDFExtractor, text_quality_ok
+
+SIMPLE_PDF = project_root / "tests" / "tests" / "test_data" / "pdfs" / "simple.pdf"
+
+HUNG_PDFTOTEXT = """\
+#!/bin/sh
+echo $$ > "{pid_file}"
+exec sleep 30
+"""
+
+def _wait_until_gone(pid: int, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as pdftotext")
+def test_hung_pdftotext_loses_and_is_killed(tmp_path, monkeypatch):
+    pid_file = tmp_path / "pdftotext.pid"
+    script = tmp_path / "pdftotext"
+    script.write_text(HUNG_PDFTOTEXT.format(pid_file=pid_file))
+    script.chmod(0o755)
+
+    extractor = CrossPlatformPDFExtractor()
+    extractor.pdftotext_path = str(script)
+    # Race the two engines under test only; in-process PDFium would win outright
+    monkeypatch.setattr(extractor, "_try_pypdfium2", lambda document, cancellation=None: None)
+
+    start = time.monotonic()
+    with PdfDocument(SIMPLE_PDF) as document:
+        text = extractor.extract_text(document, mode="race")
+        assert document.engine == "PyPDF2"
+    assert time.monotonic() - start < 10
+    assert text_quality_ok(text)
+
+    for _ in range(100):
+        if pid_file.exists() and pid_file.read_text().strip():
+            break
+        time.sleep(0.05)
+    assert _wait_until_gone(int(pid_file.read_text()))
+
+def test_race_falls_back_when_no_engine_is_good(monkeypatch):
+    extractor = CrossPlatformPDFExtractor()
+    extractor.pdftotext_path = None
+    monkeypatch.setattr(extractor, "_try_pypdfium2", lambda document, cancellation=None: None)
+    monkeypatch.setattr(extractor, "_try_pypdf2", lambda document, cancellation=None: "(cid:1)(cid:2)" * 20)
+
+    with PdfDocument(SIMPLE_PDF) as document:
+        text = extractor.extract_text(document, mode="race")
+        # The garbled PyPDF2 text is still non-empty, so the sequential chain keeps it
+        assert document.engine == "PyPDF2"
+    assert text.startswith("(cid:1)")
+
+def test_race_waits_for_cancelled_engines_before_closing(monkeypatch):
+    extractor = CrossPlatformPDFExtractor()
+    extractor.pdftotext_path = None
+    touched = []
+
+    def slow_pypdf2(document, cancellation=None):
+        while not cancellation.is_set():
+            time.sleep(0.01)
+        time.sleep(0.1)  # still running when the winner returns
+        try:
+            document.pdfium
+            touched.append("open")
+        except ValueError:
+            touched.append("closed")
+        return None
+
+    monkeypatch.setattr(extractor, "_try_pypdf2", slow_pypdf2)
+    text = extractor.extract_text(str(SIMPLE_PDF), mode="race")
+    assert text_quality_ok(text)
+    assert touched == ["open"]
+
+def test_text_quality_check():
+    assert text_quality_ok("Experienced data analyst skilled in SQL, Python and Tableau.")
+    assert not text_quality_ok("")
+    assert not text_quality_ok("   \n  ")
+    assert not text_quality_ok("(cid:12)(cid:7)(cid:44) " * 10)
+    assert not text_quality_ok("�" * 80)
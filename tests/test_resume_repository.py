@@ -0,0 +1,201 @@
+# tests/test_resume_repository.py
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database.resume_repository import RESUME_LIST_COLUMNS, PageCursor, ResumeRepository
+
+_KEYSET = re.compile(r'(\w+)\.lt\."([^"]*)",and\(\1\.eq\."([^"]*)",id\.lt\."([^"]*)"\)')
+
+class FakeQuery:
+    """Applies the subset of PostgREST filters the repository uses"""
+
+    def __init__(self, client, table):
+        self.client, self.table = client, table
+        self.rows = list(client.rows[table])
+        self.columns = None
+        self.count = None
+        self.head = False
+        self.orders = []
+        self.n = None
+        self.single = False
+
+    def select(self, columns, count=None, head=False):
+        self.columns, self.count, self.head = columns, count, head
+        return self
+
+    def eq(self, column, value):
+        self.rows = [row for row in self.rows if row[column] == value]
+        return self
+
+    def or_(self, filters):
+        column, timestamp, _, row_id = _KEYSET.fullmatch(filters).groups()
+        self.rows = [row for row in self.rows
+                     if row[column] < timestamp or (row[column] == timestamp and row["id"] < row_id)]
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, n):
+        self.n = n
+        return self
+
+    def maybe_single(self):
+        self.single = True
+        return self
+
+    def execute(self):
+        self.client.queries.append((self.table, self.columns))
+        # Stable sorts in reverse call order: the first order() is the primary key
+        for column, desc in reversed(self.orders):
+            self.rows.sort(key=lambda row: row[column], reverse=desc)
+        rows = self.rows[:self.n]
+        count = len(self.rows) if self.count == "exact" else None
+        if self.head:
+            rows = []
+        elif self.columns != "*":
+            wanted = [column.strip() for column in self.columns.split(",")]
+            rows = [{column: row[column] for column in wanted if column in row} for row in rows]
+        if self.single:
+            return SimpleNamespace(data=rows[0] if rows else None, count=count)
+        return SimpleNamespace(data=rows, count=count)
+
+class FakeClient:
+    def __init__(self, resumes=(), analyses=()):
+        self.queries = []
+        self.rows = {"resumes": list(resumes), "skill_gaps": list(analyses)}
+        self.rpc_results = {}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        def execute():
+            self.queries.append((f"rpc:{name}", params))
+            result = self.rpc_results[name]
+            if isinstance(result, Exception):
+                raise result
+            return SimpleNamespace(data=result)
+        return SimpleNamespace(execute=execute)
+
+def _resume(i, upload_date, user_id="u1"):
+    return {"id": f"r{i:02d}", "user_id": user_id, "filename": f"cv{i}.pdf", "file_type": "pdf",
+            "file_size": 1024, "upload_date": upload_date, "parsed_skills": '["python", "sql"]',
+            "parsed_education": "[]", "parsed_experience": "[]", "raw_text": "x" * 10000}
+
+def test_pages_walk_every_resume_once_including_timestamp_ties():
+    resumes = [_resume(i, f"2026-01-{1 + i // 3:02d}T00:00:00+00:00") for i in range(10)]
+    resumes.append(_resume(99, "2026-02-01T00:00:00+00:00", user_id="someone-else"))
+    repo = ResumeRepository(FakeClient(resumes))
+
+    seen, cursor = [], None
+    while True:
+        page = repo.get_user_resumes_page("u1", limit=4, after=cursor)
+        seen.extend(row["id"] for row in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    expected = [r["id"] for r in sorted(resumes[:10], key=lambda r: (r["upload_date"], r["id"]), reverse=True)]
+    assert seen == expected
+
+def test_list_rows_are_lean_and_decoded():
+    repo = ResumeRepository(FakeClient([_resume(1, "2026-01-01T00:00:00+00:00")]))
+    page = repo.get_user_resumes_page("u1", limit=20)
+    assert page.next_cursor is None
+    assert set(page.items[0]) == {c.strip() for c in RESUME_LIST_COLUMNS.split(",")}
+    assert page.items[0]["parsed_skills"] == ["python", "sql"]
+
+def test_last_full_page_has_a_cursor_only_when_more_rows_exist():
+    resumes = [_resume(i, f"2026-01-{i + 1:02d}T00:00:00+00:00") for i in range(4)]
+    repo = ResumeRepository(FakeClient(resumes))
+    assert repo.get_user_resumes_page("u1", limit=4).next_cursor is None
+    page = repo.get_user_resumes_page("u1", limit=3)
+    assert page.next_cursor == PageCursor("2026-01-02T00:00:00+00:00", "r01")
+
+def test_resume_detail_skips_raw_text_unless_asked():
+    repo = ResumeRepository(FakeClient([_resume(1, "2026-01-01T00:00:00+00:00")]))
+    assert "raw_text" not in repo.get_resume_by_id("r01", "u1")
+    assert len(repo.get_resume_by_id("r01", "u1", include_raw_text=True)["raw_text"]) == 10000
+
+def test_statistics_come_from_one_dashboard_rpc():
+    client = FakeClient()
+    client.rpc_results["get_user_dashboard"] = {"total_resumes": 3, "total_analyses": 4, "average_match_score": "62.50",
+                        "unique_skills": 7, "most_recent_upload": "2026-01-03T00:00:00+00:00",
+                        "score_series": [{"bucket": "2026-01-03", "analyses": 4, "average_match_score": 62.5}],
+                        "role_frequencies": [{"target_role": "Data Analyst", "analyses": 4, "average_match_score": 62.5}],
+                        "top_analyses": []}
+    repo = ResumeRepository(client)
+
+    assert repo.get_resume_statistics("u1") == {"total_resumes": 3, "total_analyses": 4, "average_match_score": 62.5,
+                                                "unique_skills": 7, "most_recent_upload": "2026-01-03T00:00:00+00:00"}
+    assert client.queries == [("rpc:get_user_dashboard", {"p_user_id": "u1", "p_days": 180, "p_top": 5})]
+    assert repo.get_dashboard("u1")["role_frequencies"][0]["target_role"] == "Data Analyst"
+
+def test_dashboard_defaults_when_the_rpc_fails():
+    client = FakeClient()
+    client.rpc_results["get_user_dashboard"] = RuntimeError("function get_user_dashboard does not exist")
+    dashboard = ResumeRepository(client).get_dashboard("u1")
+    assert dashboard["total_analyses"] == 0 and dashboard["score_series"] == []
+
+def test_resume_and_analyses_are_saved_in_one_rpc():
+    client = FakeClient()
+    client.rpc_results["save_resume_with_analysis"] = {"resume_id": "r1", "analysis_ids": ["g1"]}
+    saved = ResumeRepository(client).save_resume_with_analysis(
+        "u1", "cv.pdf", "pdf", "", {"skills": ["python"], "education": [], "experience": []}, 1024,
+        analyses=[{"target_role": "Data Analyst", "matched_skills": ["python"], "missing_skills": ["sql"],
+                   "match_score": 50.0}])
+
+    assert saved == {"resume_id": "r1", "analysis_ids": ["g1"]}
+    [(name, params)] = client.queries
+    assert name == "rpc:save_resume_with_analysis"
+    # Lists go over as jsonb arrays, not JSON-encoded strings
+    assert params["p_resume"]["user_id"] == "u1" and params["p_resume"]["parsed_skills"] == ["python"]
+    assert params["p_analyses"][0]["missing_skills"] == ["sql"] and "user_id" not in params["p_analyses"][0]
+
+def test_background_save_returns_the_generated_ids():
+    class Writer:
+        calls = []
+
+        def submit_call(self, client, function, params):
+            self.calls.append((function, params))
+
+    client = FakeClient()
+    writer = Writer()
+    saved = ResumeRepository(client, writer=writer).save_resume_with_analysis(
+        "u1", "cv.pdf", "pdf", "", {"skills": []}, 1024,
+        analyses=[{"target_role": "Data Analyst"}], background=True)
+
+    [(function, params)] = writer.calls
+    assert function == "save_resume_with_analysis" and client.queries == []
+    assert saved == {"resume_id": params["p_resume"]["id"], "analysis_ids": [params["p_analyses"][0]["id"]]}
+
+def test_lists_are_written_as_native_arrays():
+    class Insert:
+        rows = []
+
+        def __init__(self, row):
+            self.rows.append(row)
+
+        def execute(self):
+            return SimpleNamespace(data=[self.rows[-1]])
+
+    client = SimpleNamespace(table=lambda name: SimpleNamespace(insert=Insert))
+    repo = ResumeRepository(client)
+    repo.save_resume("u1", "cv.pdf", "pdf", "", {"skills": ["python"], "education": [], "experience": []}, 1024)
+    repo.save_skill_gap_analysis("u1", "r1", "Data Analyst", ["python"], ["sql"], 50.0)
+    assert Insert.rows[0]["parsed_skills"] == ["python"]
+    assert Insert.rows[1]["matched_skills"] == ["python"] and Insert.rows[1]["missing_skills"] == ["sql"]
+
+def test_legacy_string_rows_and_native_rows_read_the_same():
+    native = _resume(1, "2026-01-02T00:00:00+00:00")
+    native["parsed_skills"] = ["python", "sql"]
+    legacy = _resume(2, "2026-01-01T00:00:00+00:00")  # parsed_skills stored as a JSON string
+    page = ResumeRepository(FakeClient([native, legacy])).get_user_resumes_page("u1")
+    assert [row["parsed_skills"] for row in page.items] == [["python", "sql"], ["python", "sql"]]
@@ -0,0 +1,49 @@
+# tests/test_role_matrix.py
+import random
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.ml.role_matrix import RoleMatrix
+from src.parsing.ml.skill_matcher_db import SKILL_SYNONYMS, ParsedResume, RoleCatalog, compute_skill_gap, score_resume
+
+def legacy_predictions(skills, roles_map):
+    """The per-role loop RoleMatrix replaces"""
+    predictions = []
+    for role, required_skills in roles_map.items():
+        gap = compute_skill_gap(skills, required_skills, SKILL_SYNONYMS)
+        predictions.append((role, (len(gap["matched"]) / len(required_skills)) * 100 if required_skills else 0))
+    predictions.sort(key=lambda x: x[1], reverse=True)
+    return predictions
+
+def random_catalog(seed, n_roles=300):
+    rng = random.Random(seed)
+    vocabulary = [spelling for synonyms in SKILL_SYNONYMS.values() for spelling in synonyms] + ["Excel", "Rust", "ETL"]
+    roles = {f"Role {i}": rng.sample(vocabulary, rng.randint(0, 8)) for i in range(n_roles)}
+    # Duplicate spellings count in the denominator but match once, as before
+    roles["Role dup"] = ["Python", "py", "SQL"]
+    return roles, rng.sample(vocabulary, 6)
+
+def test_top_k_matches_legacy_loop():
+    for seed in range(5):
+        roles, skills = random_catalog(seed)
+        result = score_resume(ParsedResume(skills=tuple(skills)), RoleCatalog(roles, SKILL_SYNONYMS))
+        assert result["predictions"] == legacy_predictions(skills, roles)[:3]
+        assert result["chosen_role"] == result["predictions"][0][0]
+
+def test_duplicate_required_spellings_use_raw_denominator():
+    catalog = RoleCatalog({"Role dup": ["Python", "py", "SQL"]}, SKILL_SYNONYMS)
+    assert score_resume(ParsedResume(skills=("python",)), catalog)["predictions"] == [("Role dup", (1 / 3) * 100)]
+
+def test_ties_keep_catalog_order():
+    matrix = RoleMatrix(["a", "b", "c", "d"], [["x"], ["y"], ["x"], ["x"]], [1, 1, 1, 1])
+    assert matrix.top_k(["x"], 2) == [("a", 100.0), ("c", 100.0)]
+    assert matrix.top_k(["z"], 3) == [("a", 0.0), ("b", 0.0), ("c", 0.0)]
+    assert matrix.top_k(["x"], 10) == [("a", 100.0), ("c", 100.0), ("d", 100.0), ("b", 0.0)]
+
+def test_empty_roles_and_unknown_skills():
+    matrix = RoleMatrix(["empty", "one"], [[], ["x"]], [0, 1])
+    assert list(matrix.scores(["nope"])) == [0.0, 0.0]
+    assert list(matrix.scores(["x"])) == [0.0, 100.0]
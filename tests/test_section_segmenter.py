@@ -0,0 +1,55 @@
+# tests/test_section_segmenter.py
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.enhanced_parser import enhanced_extract_sections
+from src.parsing.section_segmenter import find_headers, section_texts, segment_sections
+
+CV = """John Doe
+Objective
+Data scientist with experience in ML. Experience in REST APIs and strong skills.
+TECHNICAL SKILLS
+Python, SQL, Tableau
+Work Experience
+Data Analyst at ACME (2020-2024)
+- Built dashboards
+Education: MSc Computer Science (2019)
+Projects
+Churn model
+Certifications
+AWS Certified Cloud Practitioner
+"""
+
+def test_sections_are_spans_up_to_the_next_header():
+    sections = section_texts(CV)
+    assert sections == {
+        "skills": "Python, SQL, Tableau",
+        "experience": "Data Analyst at ACME (2020-2024)\n- Built dashboards",
+        "education": "MSc Computer Science (2019)",
+        "certifications": "AWS Certified Cloud Practitioner",
+    }
+    assert segment_sections(CV)["skills"].title == "TECHNICAL SKILLS"
+
+def test_words_inside_sentences_are_not_headers():
+    titles = [header.title for header in find_headers(CV)]
+    assert titles == ["Objective", "TECHNICAL SKILLS", "Work Experience", "Education", "Projects", "Certifications"]
+
+def test_headers_glued_by_two_column_layouts():
+    text = "Email: jane@mail.comSkills/Core Competencies\n▪ Cyber Security\nEducation MSc in IT (2012)\n"
+    sections = section_texts(text)
+    assert sections["skills"] == "▪ Cyber Security"
+    assert sections["education"] == "MSc in IT (2012)"
+
+def test_header_line_beats_inline_mention():
+    text = "Summary\nEducation MSc mentioned early\nSkills\nPython\nEducation\nBSc Physics\n"
+    assert section_texts(text)["education"] == "BSc Physics"
+
+def test_enhanced_extract_sections_uses_segments():
+    sections = enhanced_extract_sections(CV)
+    assert {"python", "sql", "tableau"} <= {skill.lower() for skill in sections["skills"]}
+    assert sections["experience"][0] == "Data Analyst at ACME (2020"
+    assert sections["education"] == ["MSc Computer Science (2019)"]
+    assert sections["certifications"] == ["AWS Certified Cloud Practitioner"]
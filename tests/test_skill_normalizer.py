@@ -0,0 +1,61 @@
+# tests/test_skill_normalizer.py
+import re
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parsing.ml import skill_matcher_db
+from src.parsing.ml.skill_normalizer import SkillNormalizer
+
+def legacy_normalize(skill, synonyms_map):
+    """The linear scan SkillNormalizer replaces"""
+    if not skill:
+        return ""
+    skill_lower = skill.lower().strip()
+    skill_lower = re.sub(r'[^\w\s]', '', skill_lower)
+    skill_lower = re.sub(r'\s+', ' ', skill_lower)
+    for base_skill, synonyms in synonyms_map.items():
+        if skill_lower in synonyms or skill_lower == base_skill:
+            return base_skill
+    return skill_lower
+
+# "api" is listed under "rest api" before being a canonical of its own;
+# "nodejs" only matches through its synonym
+SYNONYMS = {
+    **skill_matcher_db.SKILL_SYNONYMS,
+    "api": ["api", "apis"],
+    "statistics": ["statistics"],
+    "stats": ["stats"],
+}
+
+SAMPLES = ["Python", " python3 ", "Node.js", "NodeJS", "REST  API", "api", "APIs", "C++", "K8s",
+           "Machine   Learning", "stats", "Amazon Web Services", "unknown skill!", "", "!!!", "Scikit Learn"]
+
+def test_matches_legacy_scan():
+    normalizer = SkillNormalizer(SYNONYMS)
+    for skill in SAMPLES:
+        assert normalizer(skill) == legacy_normalize(skill, SYNONYMS), skill
+
+def test_module_function_matches_legacy_scan():
+    for synonyms in (None, SYNONYMS):
+        expected_map = skill_matcher_db.SKILL_SYNONYMS if synonyms is None else synonyms
+        for skill in SAMPLES:
+            assert skill_matcher_db.normalize_skill_to_base(skill, synonyms) == legacy_normalize(skill, expected_map)
+
+def test_memo_is_bounded():
+    normalizer = SkillNormalizer(SYNONYMS, cache_size=4)
+    for i in range(50):
+        normalizer(f"skill {i}")
+    normalizer("python")
+    normalizer("python")
+    info = normalizer.cache_info()
+    assert info.currsize == 4 and info.hits == 1
+
+def test_rebuild_swaps_taxonomy():
+    normalizer = SkillNormalizer({"python": ["py"]})
+    assert normalizer("py") == "python"
+    normalizer.rebuild({"pyspark": ["py"]})
+    assert normalizer("py") == "pyspark"
+    assert normalizer.source == {"pyspark": ["py"]}
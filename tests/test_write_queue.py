@@ -0,0 +1,118 @@
+# tests/test_write_queue.py
+import logging
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database import ResumeRepository, WriteBehindQueue
+
+class FakeUpsert:
+    def __init__(self, client, table, rows, kwargs):
+        self.client, self.table, self.rows, self.kwargs = client, table, rows, kwargs
+
+    def execute(self):
+        self.client.gate.wait()
+        if self.client.failures:
+            self.client.failures -= 1
+            raise ConnectionError("connection reset")
+        self.client.writes.append((self.table, [row.get("id", row) for row in self.rows], self.kwargs))
+        return SimpleNamespace(data=[])
+
+class FakeClient:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.writes = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def table(self, name):
+        return SimpleNamespace(upsert=lambda rows, **kwargs: FakeUpsert(self, name, rows, kwargs))
+
+    def rpc(self, name, params):
+        return FakeUpsert(self, f"rpc:{name}", [params], {})
+
+def _queue(**kwargs):
+    return WriteBehindQueue(**{"max_delay": 0.05, "backoff": 0.0, "shutdown_timeout": 1,
+                               "dead_letter_path": None, **kwargs})
+
+def test_rows_are_batched_per_table_in_submission_order():
+    client = FakeClient()
+    client.gate.clear()  # hold the worker so everything lands in one batch
+    writer = _queue(max_delay=0.2)
+    writer.submit(client, "resumes", {"id": "r1"})
+    writer.submit(client, "skill_gaps", {"id": "g1"})
+    writer.submit(client, "skill_gaps", {"id": "g2"})
+    writer.submit(client, "resumes", {"id": "r2"})
+    client.gate.set()
+
+    assert writer.flush(timeout=5)
+    assert [(table, ids) for table, ids, _ in client.writes] == [
+        ("resumes", ["r1"]), ("skill_gaps", ["g1", "g2"]), ("resumes", ["r2"])]
+    # Idempotent on retry: an already inserted id is skipped, not duplicated
+    assert all(kwargs == {"on_conflict": "id", "ignore_duplicates": True} for _, _, kwargs in client.writes)
+    assert writer.stats()["written"] == 4 and writer.pending == 0
+
+def test_calls_run_alone_in_order_with_rows():
+    client = FakeClient()
+    client.gate.clear()
+    writer = _queue(max_delay=0.2)
+    writer.submit(client, "skill_gaps", {"id": "g1"})
+    writer.submit_call(client, "save_resume_with_analysis", {"id": "c1"})
+    writer.submit_call(client, "save_resume_with_analysis", {"id": "c2"})
+    writer.submit(client, "skill_gaps", {"id": "g2"})
+    client.gate.set()
+
+    assert writer.flush(timeout=5)
+    assert [(table, ids) for table, ids, _ in client.writes] == [
+        ("skill_gaps", ["g1"]), ("rpc:save_resume_with_analysis", ["c1"]),
+        ("rpc:save_resume_with_analysis", ["c2"]), ("skill_gaps", ["g2"])]
+
+def test_transient_failures_are_retried():
+    client = FakeClient(failures=2)
+    writer = _queue(max_attempts=3)
+    writer.submit(client, "resumes", {"id": "r1"})
+    assert writer.flush(timeout=5)
+    assert client.writes[0][1] == ["r1"]
+    stats = writer.stats()
+    assert stats["retries"] == 2 and stats["failed"] == 0
+
+def test_batch_failing_every_attempt_is_dead_lettered_and_can_be_requeued(tmp_path, caplog):
+    client = FakeClient(failures=10)
+    writer = _queue(max_attempts=3, dead_letter_path=tmp_path / "failed.jsonl")
+    with caplog.at_level(logging.ERROR, logger="src.database.write_queue"):
+        writer.submit(client, "resumes", {"id": "r1"})
+        writer.submit_call(client, "save_resume_with_analysis", {"p_resume": {"id": "r2"}, "p_analyses": []})
+        assert writer.flush(timeout=5)
+    assert client.writes == []
+    assert writer.stats()["failed"] == 2 and writer.stats()["dead_lettered"] == 2
+    gave_up = [record for record in caplog.records if record.event == "write_behind.gave_up"]
+    assert [record.fields["ids"] for record in gave_up] == ["r1", "r2"]
+
+    # The worker keeps going after a failed batch, and the dead letters can be written later
+    client.failures = 0
+    writer.submit(client, "resumes", {"id": "r3"})
+    assert writer.requeue_dead_letters(client) == 2
+    assert writer.flush(timeout=5)
+    assert [(table, ids) for table, ids, _ in client.writes] == [
+        ("resumes", ["r3", "r1"]), ("rpc:save_resume_with_analysis", [{"p_resume": {"id": "r2"}, "p_analyses": []}])]
+    assert not (tmp_path / "failed.jsonl").exists()
+
+def test_background_save_returns_the_row_before_it_is_written():
+    client = FakeClient()
+    client.gate.clear()
+    writer = _queue()
+    repo = ResumeRepository(client, writer=writer)
+
+    resume = repo.save_resume("u1", "cv.pdf", "pdf", "", {"skills": ["python"]}, 1024, background=True)
+    analysis = repo.save_skill_gap_analysis("u1", resume["id"], "Data Analyst", ["python"], ["sql"], 50.0,
+                                            background=True)
+    assert resume["id"] and resume["upload_date"] and analysis["resume_id"] == resume["id"]
+    assert not repo.flush_writes(timeout=0.1)  # still held
+
+    client.gate.set()
+    assert repo.flush_writes(timeout=5)
+    assert [table for table, _, _ in client.writes] == ["resumes", "skill_gaps"]